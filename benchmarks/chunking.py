@@ -0,0 +1,156 @@
+"""
+Chunking benchmark for the AI Onboarding System.
+
+Compares sentence splitters (the regex "fast" splitter and NLTK punkt) and
+chunking strategies on the same documents. It reports splitting throughput,
+chunking throughput, the spread of chunk sizes in tokens and the number of
+tokens that would be embedded. With --retrieval-chunks, the retrieval
+benchmark is also run for each strategy, to show its effect on recall@k and
+MRR.
+
+Documents come from --corpus (PDF/text files) or are generated with
+sample_document_generator.
+
+Usage:
+    python benchmarks/chunking.py --documents 500
+    python benchmarks/chunking.py --corpus ./policies --retrieval-chunks 5000 --output chunking_results.json
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+from types import SimpleNamespace
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import retrieval_quality
+from sample_document_generator import DOCUMENT_KINDS, build_vocabulary, document_sections, plan_document
+from src.chunking import Chunker, split_sentences_fast, split_sentences_punkt
+from src.config_service import thaw
+from src.constants import INGEST_EXTENSIONS
+from src.utils import ensure_nltk_resources, load_config
+from src.vector_db import _iter_pages
+
+# Chunkers compared; the first is the original fixed three-sentence chunking
+STRATEGIES = {
+    "sentences-3/punkt": {"strategy": "sentences", "sentences_per_chunk": 3, "splitter": "punkt"},
+    "sentences-3/fast": {"strategy": "sentences", "sentences_per_chunk": 3, "splitter": "fast"},
+    "tokens-200+32/fast": {"strategy": "tokens", "max_tokens": 200, "overlap_tokens": 32, "splitter": "fast"},
+    "tokens-128+16/fast": {"strategy": "tokens", "max_tokens": 128, "overlap_tokens": 16, "splitter": "fast"},
+    "tokens-200+32/punkt": {"strategy": "tokens", "max_tokens": 200, "overlap_tokens": 32, "splitter": "punkt"},
+}
+
+
+def load_documents(corpus: str, documents: int, seed: int) -> list:
+    """Documents as lists of (page number, text)."""
+    if corpus:
+        paths = sorted(os.path.join(root, name) for root, _, names in os.walk(corpus)
+                       for name in names if name.lower().endswith(INGEST_EXTENSIONS))
+        return [list(_iter_pages(path)) for path in paths[:documents]]
+
+    settings = {"seed": seed, "format": "txt", "pdf_share": 0.0, "hr_share": 0.5, "median_sentences": 60,
+                "length_sigma": 0.8, "min_sentences": 5, "max_sentences": 2000, "duplicate_rate": 0.0,
+                "vocabulary_size": 200}
+    vocabulary = build_vocabulary(settings['vocabulary_size'], seed)
+    pages = []
+    for index in range(documents):
+        plan = plan_document(index, settings)
+        sections = document_sections(plan['body'], plan['kind'], settings, vocabulary)
+        title = f"{DOCUMENT_KINDS[plan['kind']][1]} {index}"
+        pages.append([(1, title + "\n\n" + "\n\n".join(f"{name}\n{' '.join(text)}" for name, text in sections))])
+    return pages
+
+
+def time_splitter(split, texts: list) -> dict:
+    """Throughput of a sentence splitter over texts."""
+    started = time.perf_counter()
+    sentences = sum(len(split(text)) for text in texts)
+    elapsed = time.perf_counter() - started
+    megabytes = sum(len(text) for text in texts) / 1e6
+    return {"sentences": sentences, "mb_per_sec": megabytes / elapsed, "sentences_per_sec": sentences / elapsed}
+
+
+def time_chunker(chunker: Chunker, documents: list) -> dict:
+    """Throughput and chunk size distribution of a chunker."""
+    started = time.perf_counter()
+    tokens = [chunk[3] for pages in documents for chunk in chunker.iter_chunks(iter(pages))]
+    elapsed = time.perf_counter() - started
+    sizes = np.array(tokens)
+    return {
+        "chunks": len(tokens),
+        "chunks_per_sec": len(tokens) / elapsed,
+        "docs_per_sec": len(documents) / elapsed,
+        "tokens_embedded": int(sizes.sum()),
+        "tokens_min": int(sizes.min()),
+        "tokens_p50": float(np.percentile(sizes, 50)),
+        "tokens_p95": float(np.percentile(sizes, 95)),
+        "tokens_max": int(sizes.max())
+    }
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="Directory of PDF/text documents (default: generate documents)")
+    parser.add_argument("--documents", type=int, default=500, help="Documents to use")
+    parser.add_argument("--tokenizer-path", default="",
+                        help="tokenizer.json for exact token counts (default: chunking.tokenizer_path)")
+    parser.add_argument("--retrieval-chunks", type=int, default=0,
+                        help="Also run the retrieval benchmark at this corpus size for each strategy")
+    parser.add_argument("--questions", type=int, default=200, help="Labeled questions for the retrieval run")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    config = thaw(load_config())
+    tokenizer_path = args.tokenizer_path or config.get('chunking', {}).get('tokenizer_path', '')
+    documents = load_documents(args.corpus, args.documents, args.seed)
+    texts = [text for pages in documents for _, text in pages]
+
+    strategies = dict(STRATEGIES)
+    if not ensure_nltk_resources():
+        print("NLTK punkt is not available; skipping the punkt splitter")
+        strategies = {name: spec for name, spec in strategies.items() if spec['splitter'] != "punkt"}
+
+    results = {"documents": len(documents), "megabytes": sum(len(text) for text in texts) / 1e6,
+               "splitters": {"fast": time_splitter(split_sentences_fast, texts)}, "strategies": {}}
+    if any(spec['splitter'] == "punkt" for spec in strategies.values()):
+        results["splitters"]["punkt"] = time_splitter(split_sentences_punkt, texts)
+
+    print(f"{len(documents)} documents, {results['megabytes']:.1f} MB")
+    print(f"{'splitter':<10}{'MB/s':>10}{'sentences/s':>14}")
+    for name, row in results["splitters"].items():
+        print(f"{name:<10}{row['mb_per_sec']:>10.2f}{row['sentences_per_sec']:>14.0f}")
+
+    print(f"\n{'strategy':<22}{'chunks':>8}{'chunks/s':>10}{'tokens':>10}{'min':>6}{'p50':>7}{'p95':>7}{'max':>7}")
+    for name, spec in strategies.items():
+        row = time_chunker(Chunker(tokenizer_path=tokenizer_path, **spec), documents)
+        results["strategies"][name] = {"chunking": row}
+        print(f"{name:<22}{row['chunks']:>8}{row['chunks_per_sec']:>10.0f}{row['tokens_embedded']:>10}"
+              f"{row['tokens_min']:>6}{row['tokens_p50']:>7.0f}{row['tokens_p95']:>7.0f}{row['tokens_max']:>7}")
+
+    if args.retrieval_chunks:
+        ks = [1, 3, 5, 10]
+        options = SimpleNamespace(sentences_per_doc=60, questions=args.questions, distractors=2, seed=args.seed,
+                                  workers=None, keep=False)
+        print(f"\n{'strategy':<22}{'R@1':>8}{'R@3':>8}{'R@5':>8}{'R@10':>8}{'MRR':>8}{'ingest/s':>10}")
+        for name, spec in strategies.items():
+            run_config = thaw(config)
+            run_config['database'].setdefault('embedding_cache', {})['enabled'] = False
+            run_config['chunking'] = {**spec, "tokenizer_path": tokenizer_path}
+            row = retrieval_quality.run(args.retrieval_chunks, run_config, options, ks)
+            results["strategies"][name]["retrieval"] = row
+            print(f"{name:<22}" + "".join(f"{row['recall'][f'@{k}']:>8.3f}" for k in ks)
+                  + f"{row['mrr@10']:>8.3f}{row['ingest_chunks_per_sec']:>10.0f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
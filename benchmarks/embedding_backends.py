@@ -0,0 +1,133 @@
+"""
+Benchmark embedding backends for the AI Onboarding System.
+
+Measures embedding throughput per backend and batch size, and how closely each
+backend's retrieval agrees with the first (baseline) backend.
+
+Usage:
+    python benchmarks/embedding_backends.py --backends torch,onnx,onnx-int8 --batch-sizes 16,32,64
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.embeddings import build_embedding_function
+from src.utils import load_config
+
+POLICY_SENTENCES = [
+    "Employees receive 18 paid vacation days per year.",
+    "Five sick days are available, with a doctor's note required after 3 consecutive days.",
+    "Primary caregivers are entitled to 12 weeks of paid parental leave.",
+    "The hybrid model requires 3 days in the office and 2 days remote.",
+    "A home office stipend of $500 per year is provided.",
+    "Core hours are 10 AM to 3 PM local time.",
+    "All employees must complete AI ethics training.",
+    "Customer data must never be used for model training.",
+    "LLM projects require mandatory security clearance.",
+    "All ML models must include model cards with performance metrics.",
+    "Production models need approval from two senior engineers.",
+    "Static analysis runs with Bandit and Pylint on every change.",
+    "API keys are rotated every 90 days.",
+    "Training clusters run with VPC isolation.",
+    "Vulnerability scans are performed daily.",
+]
+
+QUERIES = [
+    "How many vacation days do I get?",
+    "What is the parental leave policy?",
+    "How often are API keys rotated?",
+    "Can I work from home?",
+    "Who needs to approve a production model?",
+    "Is there a stipend for my home office?",
+    "What training is mandatory for all employees?",
+    "How are training clusters isolated?",
+]
+
+
+def build_corpus(size: int, seed: int) -> list:
+    """Assemble a reproducible corpus of multi-sentence chunks from the policy sentences."""
+    rng = random.Random(seed)
+    return [" ".join(rng.sample(POLICY_SENTENCES, rng.randint(1, 4))) for _ in range(size)]
+
+
+def embed_matrix(embedder, texts: list) -> np.ndarray:
+    """Embed texts into an L2-normalized float32 matrix."""
+    matrix = np.asarray(embedder(texts), dtype=np.float32)
+    return matrix / np.clip(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12, None)
+
+
+def top_k(corpus: np.ndarray, queries: np.ndarray, k: int) -> list:
+    """Return the ids of the k most similar corpus rows for each query."""
+    scores = queries @ corpus.T
+    return [set(np.argsort(-row)[:k]) for row in scores]
+
+
+def main():
+    """Run the benchmark and print a summary table."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", default="torch,onnx,onnx-int8",
+                        help="Comma-separated backends; the first one is the agreement baseline")
+    parser.add_argument("--batch-sizes", default="16,32,64", help="Comma-separated batch sizes")
+    parser.add_argument("--threads", type=int, default=None, help="Override database.embedding_threads")
+    parser.add_argument("--corpus-size", type=int, default=2000, help="Number of texts to embed")
+    parser.add_argument("--top-k", type=int, default=5, help="k used for retrieval agreement")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for the corpus")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    db_config = dict(load_config()['database'])
+    if args.threads is not None:
+        db_config['embedding_threads'] = args.threads
+
+    corpus = build_corpus(args.corpus_size, args.seed)
+    backends = args.backends.split(",")
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    results = []
+    baseline = None
+    for backend in backends:
+        for batch_size in batch_sizes:
+            db_config['embedding_batch_size'] = batch_size
+            embedder = build_embedding_function(db_config, backend)
+            embedder(corpus[:batch_size])  # Warm up
+
+            started = time.perf_counter()
+            corpus_vectors = embed_matrix(embedder, corpus)
+            elapsed = time.perf_counter() - started
+            query_vectors = embed_matrix(embedder, QUERIES)
+
+            result = {
+                "backend": backend,
+                "batch_size": batch_size,
+                "threads": db_config.get('embedding_threads', 0),
+                "texts_per_sec": len(corpus) / elapsed,
+            }
+
+            if baseline is None:
+                baseline = (corpus_vectors, top_k(corpus_vectors, query_vectors, args.top_k))
+            base_vectors, base_hits = baseline
+            hits = top_k(corpus_vectors, query_vectors, args.top_k)
+            result["topk_agreement"] = float(np.mean([len(a & b) / args.top_k for a, b in zip(hits, base_hits)]))
+            if base_vectors.shape == corpus_vectors.shape:
+                result["mean_cosine_to_baseline"] = float(np.mean(np.sum(base_vectors * corpus_vectors, axis=1)))
+
+            results.append(result)
+            print(f"{backend:<10} batch={batch_size:<4} {result['texts_per_sec']:>9.1f} texts/s  "
+                  f"top-{args.top_k} agreement={result['topk_agreement']:.3f}  "
+                  f"cosine={result.get('mean_cosine_to_baseline', float('nan')):.4f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({"corpus_size": len(corpus), "top_k": args.top_k, "results": results}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
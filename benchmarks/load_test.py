@@ -0,0 +1,213 @@
+"""
+End-to-end load test for the AI Onboarding System.
+
+Replays scripted onboarding sessions (ask/checklist/schedule/...) at a target
+concurrency and reports p50/p95/p99 latency per command. By default the
+sessions run in-process on AsyncOnboardingAgent; with --server-url they are
+sent to a running `python main.py --serve` instead. Pair it with
+benchmarks/mock_llm_server.py to take the provider out of the measurement.
+
+Usage:
+    python benchmarks/mock_llm_server.py --port 8081 &
+    python benchmarks/load_test.py --base-url http://127.0.0.1:8081 --sessions 200 --concurrency 20
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import asyncio
+import argparse
+from collections import defaultdict
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.config_service import thaw
+from src.utils import load_config
+
+DEFAULT_SCRIPTS = [
+    ["help", "checklist", "ask How many vacation days do I get?", "schedule", "resources", "email"],
+    ["ask What is the parental leave policy?", "ask Can I work from home?", "checklist", "schedule"],
+    ["resources", "ask How often are API keys rotated?", "ask Who approves production models?", "email"],
+]
+
+ROLES = ["engineering", "ml engineer", "data scientist", "hr", "sales"]
+
+
+class AgentTarget:
+    """Runs sessions in-process on a shared AsyncOnboardingAgent."""
+
+    def __init__(self, config: dict, stream: bool):
+        from src.async_agent import AsyncOnboardingAgent
+        self.agent = AsyncOnboardingAgent(config=config)
+        self.on_token = (lambda token: None) if stream else None
+
+    async def start_session(self, name: str, role: str):
+        return self.agent.create_session(name, role)
+
+    async def run(self, session, command: str):
+        await self.agent.handle_command(session, command, self.on_token)
+
+    def stats(self) -> dict:
+        return {"llm_gateway": dict(self.agent.llm.stats)}
+
+    async def close(self):
+        await self.agent.close()
+
+
+class HttpTarget:
+    """Runs sessions against a running onboarding server."""
+
+    def __init__(self, server_url: str):
+        import aiohttp
+        self.server_url = server_url.rstrip("/")
+        self.http = aiohttp.ClientSession()
+
+    async def start_session(self, name: str, role: str):
+        async with self.http.post(f"{self.server_url}/sessions", json={"name": name, "role": role}) as response:
+            response.raise_for_status()
+            return (await response.json())["session_id"]
+
+    async def run(self, session_id: str, command: str):
+        base = f"{self.server_url}/sessions/{session_id}"
+        if command.startswith("ask "):
+            request = self.http.post(f"{base}/ask", json={"question": command[4:]})
+        else:
+            request = self.http.get(f"{base}/{command}")
+        async with request as response:
+            response.raise_for_status()
+            await response.read()
+
+    def stats(self) -> dict:
+        return {}
+
+    async def close(self):
+        await self.http.close()
+
+
+def load_scripts(path: str) -> list:
+    """Load session scripts: a JSON list of command lists."""
+    if not path:
+        return DEFAULT_SCRIPTS
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def summarize(latencies: dict, errors: dict) -> dict:
+    """Latency percentiles in milliseconds per command."""
+    summary = {}
+    for command in sorted(set(latencies) | set(errors)):
+        values = np.array(latencies.get(command, []), dtype=np.float64) * 1000.0
+        summary[command] = {
+            "count": int(values.size),
+            "errors": errors.get(command, 0),
+            "p50_ms": float(np.percentile(values, 50)) if values.size else None,
+            "p95_ms": float(np.percentile(values, 95)) if values.size else None,
+            "p99_ms": float(np.percentile(values, 99)) if values.size else None,
+            "max_ms": float(values.max()) if values.size else None
+        }
+    return summary
+
+
+async def run_load(args: argparse.Namespace) -> dict:
+    """Replay the sessions and collect per-command latencies."""
+    rng = random.Random(args.seed)
+    scripts = load_scripts(args.script)
+    plans = [(f"Hire {i}", rng.choice(ROLES), rng.choice(scripts)) for i in range(args.sessions)]
+
+    if args.server_url:
+        target = HttpTarget(args.server_url)
+    else:
+        config = thaw(load_config())
+        if args.base_url:
+            config['llm']['base_url'] = args.base_url
+        if args.requests_per_minute:
+            config['llm'].setdefault('gateway', {})['requests_per_minute'] = args.requests_per_minute
+            config['llm']['gateway']['burst'] = max(config['llm']['gateway'].get('burst', 5), args.concurrency)
+        if args.disable_caches:
+            for cache_config in config.get('cache', {}).values():
+                cache_config['enabled'] = False
+        target = AgentTarget(config, args.stream)
+
+    latencies = defaultdict(list)
+    errors = defaultdict(int)
+    queue = asyncio.Queue()
+    for plan in plans:
+        queue.put_nowait(plan)
+
+    async def virtual_user():
+        while not queue.empty():
+            name, role, script = queue.get_nowait()
+            try:
+                session = await target.start_session(name, role)
+            except Exception:
+                errors["session"] += 1
+                continue
+            for command in script:
+                label = command.split()[0].lower()
+                started = time.perf_counter()
+                try:
+                    await target.run(session, command)
+                    latencies[label].append(time.perf_counter() - started)
+                except Exception:
+                    errors[label] += 1
+                if args.think_ms:
+                    await asyncio.sleep(rng.uniform(0, 2 * args.think_ms) / 1000.0)
+
+    started = time.perf_counter()
+    try:
+        await asyncio.gather(*[virtual_user() for _ in range(args.concurrency)])
+    finally:
+        await target.close()
+    elapsed = time.perf_counter() - started
+
+    commands = sum(len(values) for values in latencies.values())
+    return {
+        "sessions": args.sessions,
+        "concurrency": args.concurrency,
+        "elapsed_seconds": elapsed,
+        "commands_per_sec": commands / elapsed if elapsed else 0.0,
+        "commands": summarize(latencies, errors),
+        **target.stats()
+    }
+
+
+def main():
+    """Run the load test and print a latency table."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=50, help="Number of sessions to replay")
+    parser.add_argument("--concurrency", type=int, default=10, help="Sessions running at the same time")
+    parser.add_argument("--script", help="JSON file with a list of command lists (default: built-in scripts)")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="Mean pause between commands in milliseconds")
+    parser.add_argument("--base-url", help="Override llm.base_url, e.g. the mock LLM server")
+    parser.add_argument("--requests-per-minute", type=float,
+                        help="Override llm.gateway.requests_per_minute (in-process only)")
+    parser.add_argument("--server-url", help="Drive a running onboarding server instead of an in-process agent")
+    parser.add_argument("--disable-caches", action="store_true", help="Turn off the answer caches (in-process only)")
+    parser.add_argument("--stream", action="store_true", help="Stream answers (in-process only)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for session assignment")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(run_load(args))
+
+    print(f"{args.sessions} sessions at concurrency {args.concurrency}: "
+          f"{results['elapsed_seconds']:.2f}s, {results['commands_per_sec']:.1f} commands/s")
+    print(f"{'command':<12}{'count':>8}{'errors':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for command, row in results["commands"].items():
+        cells = [f"{row[key]:>10.1f}" if row[key] is not None else f"{'-':>10}"
+                 for key in ("p50_ms", "p95_ms", "p99_ms", "max_ms")]
+        print(f"{command:<12}{row['count']:>8}{row['errors']:>8}" + "".join(cells))
+    if "llm_gateway" in results:
+        print(f"LLM gateway: {results['llm_gateway']}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
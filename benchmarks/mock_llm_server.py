@@ -0,0 +1,190 @@
+"""
+Local stand-in for the Groq/OpenAI chat completions API.
+
+Serves POST /openai/v1/chat/completions (the Groq SDK path) and
+/v1/chat/completions (the OpenAI path). Supports streaming (SSE) and
+non-streaming responses, configurable latency distributions, a token rate and
+error injection, so the agent can be benchmarked without a provider key or
+provider variance.
+
+Point the agent at it with "llm": {"base_url": "http://127.0.0.1:8081"} in
+config/config.json.
+
+Usage:
+    python benchmarks/mock_llm_server.py --port 8081 --latency lognormal --latency-ms 400 --error-rate 0.02
+"""
+
+import json
+import time
+import uuid
+import random
+import asyncio
+import argparse
+from aiohttp import web
+
+LATENCY_DISTRIBUTIONS = ("fixed", "uniform", "normal", "lognormal", "exponential")
+
+FILLER_WORDS = (
+    "New employees should review the onboarding policy documents and confirm their benefits enrollment "
+    "with HR during the first week while their manager schedules team introductions and training sessions"
+).split()
+
+
+class MockLLM:
+    """Generates fake chat completions with the configured timing and failure behaviour."""
+
+    def __init__(self, args: argparse.Namespace):
+        """
+        Args:
+            args: Parsed command-line options
+        """
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.stats = {"requests": 0, "streamed": 0, "errors": 0}
+
+    def first_token_delay(self) -> float:
+        """Sample the time to first token in seconds."""
+        mean = self.args.latency_ms / 1000.0
+        spread = self.args.latency_sigma
+        distribution = self.args.latency
+        if distribution == "fixed":
+            delay = mean
+        elif distribution == "uniform":
+            delay = self.rng.uniform(mean * (1 - spread), mean * (1 + spread))
+        elif distribution == "normal":
+            delay = self.rng.gauss(mean, mean * spread)
+        elif distribution == "lognormal":
+            # latency_ms is the median; sigma controls the tail
+            delay = mean * self.rng.lognormvariate(0.0, spread)
+        else:
+            delay = self.rng.expovariate(1.0 / mean)
+        return max(0.0, delay)
+
+    def answer_tokens(self, messages: list) -> list:
+        """Build a deterministic-length answer that echoes the question."""
+        question = next((m.get("content", "") for m in reversed(messages) if m.get("role") == "user"), "")
+        words = [f"Regarding '{question.strip()}':"] + [
+            self.rng.choice(FILLER_WORDS) for _ in range(max(1, self.args.response_tokens - 1))
+        ]
+        return [word + " " for word in words]
+
+    def injected_error(self):
+        """Return an error response if this request should fail, otherwise None."""
+        if self.rng.random() >= self.args.error_rate:
+            return None
+        self.stats["errors"] += 1
+        status = self.args.error_status
+        headers = {"Retry-After": str(self.args.retry_after)} if status == 429 else {}
+        return web.json_response({"error": {
+            "message": f"Injected error ({status})",
+            "type": "rate_limit_exceeded" if status == 429 else "server_error"
+        }}, status=status, headers=headers)
+
+    async def chat_completions(self, request: web.Request) -> web.StreamResponse:
+        """Handle a chat completions request."""
+        self.stats["requests"] += 1
+        body = await request.json()
+        error = self.injected_error()
+        if error is not None:
+            return error
+
+        model = body.get("model", "mock")
+        tokens = self.answer_tokens(body.get("messages", []))
+        token_delay = 1.0 / self.args.tokens_per_second if self.args.tokens_per_second > 0 else 0.0
+        completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+        created = int(time.time())
+        await asyncio.sleep(self.first_token_delay())
+
+        if not body.get("stream"):
+            await asyncio.sleep(token_delay * (len(tokens) - 1))
+            return web.json_response({
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(tokens)},
+                    "finish_reason": "stop"
+                }],
+                "usage": _usage(body.get("messages", []), tokens)
+            })
+
+        self.stats["streamed"] += 1
+        response = web.StreamResponse(headers={"Content-Type": "text/event-stream", "Cache-Control": "no-cache"})
+        await response.prepare(request)
+
+        def event(delta: dict, finish_reason=None) -> bytes:
+            chunk = {
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+            }
+            return f"data: {json.dumps(chunk)}\n\n".encode("utf-8")
+
+        await response.write(event({"role": "assistant", "content": ""}))
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(token_delay)
+            await response.write(event({"content": token}))
+        await response.write(event({}, "stop"))
+        await response.write(b"data: [DONE]\n\n")
+        await response.write_eof()
+        return response
+
+    async def health(self, request: web.Request) -> web.Response:
+        """Request counters."""
+        return web.json_response(self.stats)
+
+
+def _usage(messages: list, tokens: list) -> dict:
+    """Rough token counts in the provider's usage format."""
+    prompt_tokens = sum(len(m.get("content", "").split()) for m in messages)
+    return {"prompt_tokens": prompt_tokens, "completion_tokens": len(tokens),
+            "total_tokens": prompt_tokens + len(tokens)}
+
+
+def build_app(args: argparse.Namespace) -> web.Application:
+    """Create the mock server application."""
+    mock = MockLLM(args)
+    app = web.Application()
+    app.add_routes([
+        web.post("/openai/v1/chat/completions", mock.chat_completions),
+        web.post("/v1/chat/completions", mock.chat_completions),
+        web.get("/health", mock.health),
+    ])
+    return app
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    """Parse command-line options."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8081, help="Port to bind")
+    parser.add_argument("--latency", choices=LATENCY_DISTRIBUTIONS, default="lognormal",
+                        help="Distribution of the time to first token")
+    parser.add_argument("--latency-ms", type=float, default=300.0,
+                        help="Mean (median for lognormal) time to first token in milliseconds")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="Relative spread (uniform/normal) or log-space sigma (lognormal)")
+    parser.add_argument("--tokens-per-second", type=float, default=200.0,
+                        help="Streaming rate after the first token (0 sends everything at once)")
+    parser.add_argument("--response-tokens", type=int, default=60, help="Words per answer")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=429, choices=(429, 500, 503),
+                        help="HTTP status of injected failures")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed for reproducible runs")
+    return parser.parse_args(argv)
+
+
+def main():
+    """Run the mock server until interrupted."""
+    args = parse_args()
+    web.run_app(build_app(args), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
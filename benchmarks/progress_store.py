@@ -0,0 +1,124 @@
+"""
+Checklist progress store benchmark for the AI Onboarding System.
+
+Enrolls a synthetic population of hires spread over weekly cohorts, completes
+a random share of their tasks, and reports enrollment throughput plus p50/p99
+latency of the per-hire and aggregate queries.
+
+Usage:
+    python benchmarks/progress_store.py --hires 100000 --output progress_results.json
+"""
+
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import tempfile
+from datetime import date, timedelta
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.progress_store import STATUS_COMPLETED, ProgressStore, cohort_for
+from src.utils import load_settings
+
+ROLES = ["engineering", "ml engineer", "data scientist", "hr", "sales"]
+
+
+def timed(function, repeats: int) -> dict:
+    """Latency percentiles of a call in milliseconds."""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) * 1000.0)
+    values = np.array(samples)
+    return {"p50_ms": float(np.percentile(values, 50)), "p99_ms": float(np.percentile(values, 99)),
+            "max_ms": float(values.max())}
+
+
+def main():
+    """Populate a store and time its queries."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hires", type=int, default=100000, help="Number of hires to enroll")
+    parser.add_argument("--weeks", type=int, default=52, help="Cohorts (start weeks) to spread hires over")
+    parser.add_argument("--completion", type=float, default=0.6, help="Share of pending tasks to complete")
+    parser.add_argument("--batch-size", type=int, default=5000,
+                        help="Hires per enroll_many (and tasks per mark_complete_many) transaction")
+    parser.add_argument("--repeats", type=int, default=200, help="Timed calls per query")
+    parser.add_argument("--path", help="Database file (default: a temporary file)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    checklist = load_settings()['checklists']['default']
+    path = args.path or os.path.join(tempfile.mkdtemp(), "progress.sqlite")
+    store = ProgressStore(path)
+
+    first_day = date.today() - timedelta(weeks=args.weeks)
+    hires = [{
+        "hire_id": f"hire-{i:07d}",
+        "name": f"Hire {i}",
+        "role": rng.choice(ROLES),
+        "start_date": (first_day + timedelta(days=rng.randrange(args.weeks * 7))).isoformat()
+    } for i in range(args.hires)]
+
+    # Enrollment
+    started = time.perf_counter()
+    for offset in range(0, len(hires), args.batch_size):
+        store.enroll_many(hires[offset:offset + args.batch_size], checklist)
+    enroll_seconds = time.perf_counter() - started
+
+    # Progress updates
+    pending = [item['task'] for item in checklist if item.get('status') != STATUS_COMPLETED]
+    updates = [(hire['hire_id'], task) for hire in hires for task in pending if rng.random() < args.completion]
+    started = time.perf_counter()
+    for offset in range(0, len(updates), args.batch_size):
+        store.mark_complete_many(updates[offset:offset + args.batch_size])
+    update_seconds = time.perf_counter() - started
+
+    cohorts = sorted({cohort_for(hire['start_date']) for hire in hires})
+    sample_hires = [hire['hire_id'] for hire in rng.sample(hires, min(args.repeats, len(hires)))]
+    queries = {
+        "checklist": timed(lambda: store.checklist(rng.choice(sample_hires)), args.repeats),
+        "mark_complete": timed(lambda: store.mark_complete(rng.choice(sample_hires), rng.choice(pending)),
+                               args.repeats),
+        "completion_by_cohort": timed(store.completion_by_cohort, args.repeats),
+        "completion_one_cohort": timed(lambda: store.completion_by_cohort([rng.choice(cohorts)]), args.repeats),
+        "overdue_first_100": timed(lambda: store.overdue_tasks(limit=100), args.repeats),
+        "overdue_one_cohort": timed(lambda: store.overdue_tasks(cohort=rng.choice(cohorts)), args.repeats),
+        "count_overdue": timed(store.count_overdue, args.repeats),
+        "pending_hires": timed(lambda: store.pending_hires(rng.choice(pending)), args.repeats),
+    }
+    overdue = store.count_overdue()
+    store.close()
+
+    results = {
+        "hires": args.hires,
+        "tasks": args.hires * len(checklist),
+        "cohorts": len(cohorts),
+        "overdue_tasks": overdue,
+        "enroll_hires_per_sec": args.hires / enroll_seconds,
+        "mark_complete_per_sec": len(updates) / update_seconds if update_seconds else 0.0,
+        "database_mb": os.path.getsize(path) / 1e6,
+        "queries": queries
+    }
+
+    print(f"{args.hires} hires, {results['tasks']} tasks in {len(cohorts)} cohorts ({results['database_mb']:.1f} MB)")
+    print(f"Enrollment: {results['enroll_hires_per_sec']:.0f} hires/s, "
+          f"updates: {results['mark_complete_per_sec']:.0f} tasks/s, overdue: {overdue}")
+    print(f"{'query':<24}{'p50 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    for name, row in queries.items():
+        print(f"{name:<24}{row['p50_ms']:>10.3f}{row['p99_ms']:>10.3f}{row['max_ms']:>10.3f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,290 @@
+"""
+Retrieval quality and latency benchmark for the AI Onboarding System.
+
+Writes a synthetic policy corpus of a given size in chunks, ingests it into a
+fresh OnboardingVectorDB and runs a labeled question set against
+query_documents. Each question asks about one planted fact (a team-specific
+policy value). Hard negatives are planted too: the same kinds of facts about
+other teams. A retrieved chunk is relevant when it contains the fact sentence,
+so the labels stay valid whatever the chunking.
+
+Reports recall@k and MRR next to ingest throughput, query p50/p99 latency
+and index size, for each corpus size. Use --output to keep the results for
+comparison between commits.
+
+Usage:
+    python benchmarks/retrieval_quality.py --chunks 1000,10000,100000 --output retrieval_results.json
+    python benchmarks/retrieval_quality.py --chunks 1000 --backend numpy --no-hybrid
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import shutil
+import argparse
+import tempfile
+import subprocess
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.chunking import CHUNK_STRATEGIES, SENTENCE_SPLITTERS, Chunker
+from src.config_service import thaw
+from src.utils import load_config
+from src.vector_db import OnboardingVectorDB
+
+# (fact, question) templates; {team} makes each planted fact unique
+FACT_TEMPLATES = [
+    ("Members of the {team} team receive {n} days of paid vacation per year.",
+     "How many vacation days does the {team} team get?"),
+    ("The home office stipend for the {team} team is {n} dollars per year.",
+     "What is the home office stipend for the {team} team?"),
+    ("On-call engineers on the {team} team are paid {n} dollars per weekend shift.",
+     "How much is on-call pay on the {team} team?"),
+    ("New hires on the {team} team must finish security training within {n} days.",
+     "How soon must new hires on the {team} team finish security training?"),
+    ("Parental leave on the {team} team lasts {n} weeks.",
+     "How long is parental leave on the {team} team?"),
+    ("The {team} team approves expense reports within {n} business days.",
+     "How quickly does the {team} team approve expense reports?"),
+]
+
+# Filler vocabulary; filler never names a team
+FILLER_SUBJECTS = ["Employees", "Managers", "Contractors", "New hires", "Team leads", "Interns"]
+FILLER_VERBS = ["should review", "must acknowledge", "are encouraged to read", "need to update", "can request"]
+FILLER_OBJECTS = ["the travel policy", "the code of conduct", "their benefits elections", "the security handbook",
+                  "the remote work guidelines", "the equipment checklist", "their emergency contacts",
+                  "the data retention rules", "the expense guidelines", "the performance review timeline"]
+FILLER_TIMES = ["before their first review", "every quarter", "within the first month", "after each promotion",
+                "at the start of every year", "when their role changes"]
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "so", "ta", "vi", "dor", "nu", "pel", "qua", "zen", "bri", "osh", "ul", "fa"]
+
+
+def team_names(count: int, rng: random.Random) -> list:
+    """Unique capitalized team names built from syllables."""
+    names = set()
+    while len(names) < count:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4))).capitalize())
+    return sorted(names)
+
+
+def filler_sentence(rng: random.Random) -> str:
+    """A generic policy sentence."""
+    return (f"{rng.choice(FILLER_SUBJECTS)} {rng.choice(FILLER_VERBS)} {rng.choice(FILLER_OBJECTS)} "
+            f"{rng.choice(FILLER_TIMES)}.")
+
+
+def fact(team: str, template: int, rng: random.Random) -> tuple:
+    """A (fact sentence, question) pair for a team."""
+    fact_text, question = FACT_TEMPLATES[template]
+    return fact_text.format(team=team, n=rng.randint(2, 90)), question.format(team=team)
+
+
+def chunks_per_document(chunker: Chunker, sentences_per_doc: int, seed: int) -> int:
+    """Chunks the chunker makes from one generated document."""
+    rng = random.Random(seed)
+    text = " ".join(filler_sentence(rng) for _ in range(sentences_per_doc))
+    return sum(1 for _ in chunker.iter_chunks(iter([(1, text)])))
+
+
+def build_corpus(directory: str, chunks: int, chunker: Chunker, sentences_per_doc: int, questions: int,
+                 distractors_per_doc: int, seed: int) -> tuple:
+    """
+    Write a labeled corpus of roughly the requested number of chunks.
+
+    Args:
+        directory: Where to write the documents
+        chunks: Target number of chunks
+        chunker: Chunker used at ingestion, to size the corpus
+        sentences_per_doc: Sentences in each document
+        questions: Number of labeled questions (planted facts)
+        distractors_per_doc: Facts about unqueried teams in each document
+        seed: Random seed
+
+    Returns:
+        Tuple of (file paths, [{"question", "fact"}])
+    """
+    rng = random.Random(seed)
+    documents = max(1, math.ceil(chunks / chunks_per_document(chunker, sentences_per_doc, seed)))
+    teams = team_names(questions + documents * distractors_per_doc, rng)
+    queried, unqueried = teams[:questions], teams[questions:]
+
+    # Plant each labeled fact in a random document; every document also gets hard negatives
+    planted = {}
+    labeled = []
+    for team in queried:
+        fact_text, question = fact(team, rng.randrange(len(FACT_TEMPLATES)), rng)
+        planted.setdefault(rng.randrange(documents), []).append(fact_text)
+        labeled.append({"question": question, "fact": fact_text})
+
+    os.makedirs(directory, exist_ok=True)
+    paths, written = [], set()
+    for index in range(documents):
+        sentences = [filler_sentence(rng) for _ in range(sentences_per_doc)]
+        extra = planted.get(index, []) + [
+            fact(unqueried[index * distractors_per_doc + i], rng.randrange(len(FACT_TEMPLATES)), rng)[0]
+            for i in range(distractors_per_doc)
+        ]
+        # Inserted rather than overwriting filler, so a planted fact never replaces another
+        for sentence in extra:
+            sentences.insert(rng.randint(0, len(sentences)), sentence)
+        path = os.path.join(directory, f"hr_policy_{index:07d}.txt")
+        with open(path, 'w') as f:
+            f.write(" ".join(sentences) + "\n")
+        paths.append(path)
+        written.update(sentences)
+
+    missing = [item["fact"] for item in labeled if item["fact"] not in written]
+    if missing:
+        raise RuntimeError(f"{len(missing)} labeled facts are missing from the corpus: {missing[0]}")
+    return paths, labeled
+
+
+def directory_size(path: str) -> int:
+    """Total size in bytes of the files under a directory."""
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def git_commit() -> str:
+    """Current commit of the checkout, if any."""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def evaluate(db: OnboardingVectorDB, labeled: list, doc_type: str, ks: list) -> dict:
+    """Run the labeled questions and score the rankings."""
+    depth = max(ks)
+    db.query_documents(labeled[0]["question"], doc_type=doc_type, n_results=depth)  # Warm up
+
+    samples, ranks = [], []
+    for item in labeled:
+        started = time.perf_counter()
+        results = db.query_documents(item["question"], doc_type=doc_type, n_results=depth)
+        samples.append(time.perf_counter() - started)
+        documents = results['documents'][0] if results['documents'] else []
+        ranks.append(next((rank for rank, text in enumerate(documents, 1) if item["fact"] in text), None))
+
+    millis = np.array(samples) * 1000.0
+    return {
+        "recall": {f"@{k}": sum(1 for rank in ranks if rank is not None and rank <= k) / len(ranks) for k in ks},
+        f"mrr@{depth}": sum(1.0 / rank for rank in ranks if rank is not None) / len(ranks),
+        "query_p50_ms": float(np.percentile(millis, 50)),
+        "query_p99_ms": float(np.percentile(millis, 99)),
+        "queries_per_sec": len(samples) / float(np.sum(samples))
+    }
+
+
+def run(chunks: int, config: dict, args, ks: list) -> dict:
+    """Build, ingest and evaluate one corpus size in a scratch directory."""
+    scratch = tempfile.mkdtemp(prefix="retrieval-bench-")
+    try:
+        started = time.perf_counter()
+        chunker = Chunker.from_config(config)
+        paths, labeled = build_corpus(os.path.join(scratch, "docs"), chunks, chunker,
+                                      args.sentences_per_doc, args.questions, args.distractors, args.seed)
+        generate_seconds = time.perf_counter() - started
+
+        config['database']['path'] = os.path.join(scratch, "db")
+        config['database']['embedding_cache']['path'] = os.path.join(scratch, "db", "embedding_cache")
+        db = OnboardingVectorDB(config=config)
+        stats = db.ingest_many(paths, chunker=chunker, workers=args.workers, show_progress=False)
+        if stats["failed"]:
+            raise RuntimeError(f"{len(stats['failed'])} documents failed to ingest: {stats['failed'][0]}")
+
+        quality = evaluate(db, labeled, config['rag']['default_document_type'], ks)
+        return {
+            "target_chunks": chunks,
+            "documents": stats["documents"],
+            "chunks": stats["chunks"],
+            "questions": len(labeled),
+            "generate_seconds": generate_seconds,
+            "ingest_seconds": stats["elapsed"],
+            "ingest_docs_per_sec": stats["docs_per_sec"],
+            "ingest_chunks_per_sec": stats["chunks_per_sec"],
+            "index_disk_mb": directory_size(config['database']['path']) / 1e6,
+            "index_memory_mb": db.store.memory_bytes() / 1e6,
+            **quality
+        }
+    finally:
+        if not args.keep:
+            shutil.rmtree(scratch, ignore_errors=True)
+
+
+def main():
+    """Run the benchmark for every corpus size."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", default="1000,10000", help="Comma-separated corpus sizes in chunks")
+    parser.add_argument("--questions", type=int, default=200, help="Labeled questions per corpus")
+    parser.add_argument("--k", default="1,3,5,10", help="Comma-separated cut-offs for recall@k")
+    parser.add_argument("--strategy", choices=CHUNK_STRATEGIES, help="Override chunking.strategy")
+    parser.add_argument("--max-tokens", type=int, help="Override chunking.max_tokens")
+    parser.add_argument("--overlap-tokens", type=int, help="Override chunking.overlap_tokens")
+    parser.add_argument("--sentences-per-chunk", type=int, help="Override chunking.sentences_per_chunk")
+    parser.add_argument("--splitter", choices=SENTENCE_SPLITTERS, help="Override chunking.splitter")
+    parser.add_argument("--sentences-per-doc", type=int, default=60, help="Sentences in each document")
+    parser.add_argument("--distractors", type=int, default=2, help="Facts about unqueried teams per document")
+    parser.add_argument("--backend", choices=("chroma", "numpy"), help="Override database.backend")
+    parser.add_argument("--no-hybrid", action="store_true", help="Vector search only (rag.hybrid disabled)")
+    parser.add_argument("--embedding-cache", action="store_true",
+                        help="Keep database.embedding_cache enabled (off by default so every run embeds)")
+    parser.add_argument("--workers", type=int, help="Ingestion worker processes (default: database.ingest_workers)")
+    parser.add_argument("--keep", action="store_true", help="Keep the generated corpus and database")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    sizes = sorted(int(size) for size in args.chunks.split(","))
+    ks = sorted(int(k) for k in args.k.split(","))
+
+    config = thaw(load_config())
+    if args.backend:
+        config['database']['backend'] = args.backend
+    if args.no_hybrid:
+        config['rag'].setdefault('hybrid', {})['enabled'] = False
+    config['database'].setdefault('embedding_cache', {})['enabled'] = args.embedding_cache
+    chunking = config.setdefault('chunking', {})
+    for key in ("strategy", "max_tokens", "overlap_tokens", "sentences_per_chunk", "splitter"):
+        if getattr(args, key) is not None:
+            chunking[key] = getattr(args, key)
+
+    results = {
+        "commit": git_commit(),
+        "settings": {
+            "backend": config['database'].get('backend', 'chroma'),
+            "embedding_model": config['database']['embedding_model'],
+            "embedding_backend": config['database'].get('embedding_backend', 'torch'),
+            "hybrid": config['rag'].get('hybrid', {}).get('enabled', False),
+            "chunker": Chunker.from_config(config).signature,
+            "sentences_per_doc": args.sentences_per_doc,
+            "distractors_per_doc": args.distractors,
+            "seed": args.seed
+        },
+        "runs": []
+    }
+
+    depth = max(ks)
+    header = "".join(f"{'R@' + str(k):>8}" for k in ks)
+    print(f"{'chunks':>9}{'ingest/s':>11}{header}{'MRR':>8}{'p50 ms':>9}{'p99 ms':>9}{'disk MB':>9}{'mem MB':>9}")
+    for size in sizes:
+        row = run(size, config, args, ks)
+        results["runs"].append(row)
+        recalls = "".join(f"{row['recall'][f'@{k}']:>8.3f}" for k in ks)
+        print(f"{row['chunks']:>9}{row['ingest_chunks_per_sec']:>11.0f}{recalls}{row[f'mrr@{depth}']:>8.3f}"
+              f"{row['query_p50_ms']:>9.2f}{row['query_p99_ms']:>9.2f}{row['index_disk_mb']:>9.1f}"
+              f"{row['index_memory_mb']:>9.1f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""
+Cohort schedule solver benchmark for the AI Onboarding System.
+
+Builds a synthetic multi-day schedule with capacity-limited, repeated
+sessions and prerequisite chains, places a large cohort with CohortScheduler,
+and compares it with a linear scan over the offerings. Every placement is
+checked against capacities, prerequisites and clashes.
+
+Usage:
+    python benchmarks/schedule_solver.py --hires 10000 --days 365 --output schedule_results.json
+"""
+
+import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+import numpy as np
+
+# Add the project root to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scheduler import CohortScheduler
+
+ROLES = ["engineering", "ml engineer", "data scientist", "hr", "sales"]
+
+
+class LinearScanScheduler(CohortScheduler):
+    """Reference solver that scans every offering of an activity from the start."""
+
+    def _first_available(self, activity, earliest, booked):
+        for offering in self._by_activity[activity]:
+            if offering.full or offering.start < earliest:
+                continue
+            if not any(offering.start < other.end and other.start < offering.end for other in booked):
+                offering.booked += 1
+                return offering
+        return None
+
+
+def build_template(days: int, capacity: int) -> dict:
+    """A schedule with every training offered daily, chained by prerequisites."""
+    template = {"day1": [{"time": "9:00 AM", "activity": "Welcome Breakfast"}]}
+    for day in range(1, days + 1):
+        entries = template.setdefault(f"day{day}", [])
+        entries += [
+            {"time": "10:00 AM", "activity": "HR Orientation", "duration_minutes": 90, "capacity": capacity * 2},
+            {"time": "11:00 AM", "activity": "Systems Training", "capacity": capacity},
+            {"time": "1:00 PM", "activity": "Security Briefing", "capacity": capacity,
+             "requires": ["HR Orientation"]},
+            {"time": "2:30 PM", "activity": "Role-Specific Training", "capacity": capacity // 2,
+             "requires": ["Systems Training"]},
+            {"time": "2:30 PM", "activity": "ML Platform Deep Dive", "capacity": capacity // 4,
+             "requires": ["Systems Training"], "roles": ["ml engineer", "data scientist"]},
+            {"time": "4:00 PM", "activity": "Compliance Sign-off", "capacity": capacity,
+             "requires": ["Security Briefing", "Role-Specific Training"]},
+        ]
+    return template
+
+
+def run(scheduler_class, template: dict, roles: list) -> dict:
+    """Place every hire and collect timings and placements."""
+    scheduler = scheduler_class(template)
+    placements = []
+    samples = []
+    started = time.perf_counter()
+    for role in roles:
+        assign_started = time.perf_counter()
+        placements.append(scheduler.assign(role))
+        samples.append(time.perf_counter() - assign_started)
+    elapsed = time.perf_counter() - started
+    micros = np.array(samples) * 1e6
+    return {
+        "scheduler": scheduler,
+        "placements": placements,
+        "elapsed_seconds": elapsed,
+        "hires_per_sec": len(roles) / elapsed,
+        "p50_us": float(np.percentile(micros, 50)),
+        "p99_us": float(np.percentile(micros, 99))
+    }
+
+
+def validate(scheduler: CohortScheduler, placements: list) -> list:
+    """Return constraint violations (an empty list means the schedule is valid)."""
+    problems = []
+    for offering in scheduler.offerings:
+        if offering.capacity is not None and offering.booked > offering.capacity:
+            problems.append(f"{offering.activity} day {offering.day} overbooked")
+    for i, placement in enumerate(placements):
+        by_activity = {session.activity: session for session in placement.sessions}
+        for session in placement.sessions:
+            for required in session.requires:
+                if required in by_activity and by_activity[required].end > session.start:
+                    problems.append(f"hire {i}: {session.activity} before {required}")
+        ordered = placement.sessions
+        for a, b in zip(ordered, ordered[1:]):
+            if b.start < a.end:
+                problems.append(f"hire {i}: {a.activity} clashes with {b.activity}")
+    return problems
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hires", type=int, default=10000, help="Hires in the cohort")
+    parser.add_argument("--days", type=int, default=60, help="Days in the synthetic schedule")
+    parser.add_argument("--capacity", type=int,
+                        help="Seats per session, varying by activity (default: just enough for the cohort)")
+    parser.add_argument("--skip-baseline", action="store_true", help="Do not run the linear-scan reference")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed for roles")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    roles = [rng.choice(ROLES) for _ in range(args.hires)]
+    # Role-Specific Training gets half the seats, so this fits every hire with a little slack
+    capacity = args.capacity or int(math.ceil(2.2 * args.hires / args.days))
+    template = build_template(args.days, capacity)
+
+    solvers = [("union-find", CohortScheduler)]
+    if not args.skip_baseline:
+        solvers.append(("linear-scan", LinearScanScheduler))
+
+    results = {"hires": args.hires, "days": args.days, "capacity": capacity, "solvers": {}}
+    for name, scheduler_class in solvers:
+        result = run(scheduler_class, template, roles)
+        problems = validate(result["scheduler"], result["placements"])
+        waitlisted = sum(1 for placement in result["placements"] if placement.waitlisted)
+        results["solvers"][name] = {
+            "elapsed_seconds": result["elapsed_seconds"],
+            "hires_per_sec": result["hires_per_sec"],
+            "p50_us": result["p50_us"],
+            "p99_us": result["p99_us"],
+            "hires_waitlisted": waitlisted,
+            "violations": len(problems),
+            "activities": result["scheduler"].stats()
+        }
+        print(f"{name:<12} {result['hires_per_sec']:>10.0f} hires/s  p50 {result['p50_us']:.1f} us  "
+              f"p99 {result['p99_us']:.1f} us  waitlisted {waitlisted}  violations {len(problems)}")
+        for problem in problems[:5]:
+            print(f"  {problem}")
+
+    print(f"{'activity':<24}{'offerings':>10}{'booked':>10}{'capacity':>10}{'waitlisted':>12}")
+    for activity, row in results["solvers"]["union-find"]["activities"].items():
+        seats = row['capacity'] if row['capacity'] is not None else "-"
+        print(f"{activity:<24}{row['offerings']:>10}{row['booked']:>10}{seats:>10}{row['waitlisted']:>12}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+    sys.exit(1 if any(solver["violations"] for solver in results["solvers"].values()) else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Startup-time regression benchmark for the AI Onboarding System.
+
+Runs `python -X importtime` on main.py's imports in fresh interpreters and
+measures the time until the agent is ready to prompt for the hire's details.
+It lists the slowest imports and fails if a heavy subsystem
+(torch, chromadb, groq, ...) is imported at startup or if startup is slower
+than a saved baseline.
+
+Usage:
+    python benchmarks/startup_time.py --output startup_baseline.json
+    python benchmarks/startup_time.py --baseline startup_baseline.json --tolerance 0.25
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be imported on first "ask"
+HEAVY_MODULES = ("torch", "sentence_transformers", "chromadb", "onnxruntime", "groq", "httpx", "nltk", "PyPDF2")
+
+# Imports main.py and builds the agent up to the point where the REPL would prompt for input
+READY_SNIPPET = """
+import sys, time
+started = time.perf_counter()
+import main
+from src.agent import OnboardingAgent
+OnboardingAgent()
+print(time.perf_counter() - started)
+"""
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def run_once() -> dict:
+    """Start one interpreter and collect import timings."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", READY_SNIPPET],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, check=True
+    )
+
+    top_level_us = 0
+    direct = {}
+    imported = set()
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        _, cumulative_us, indent, module = match.groups()
+        imported.add(module.split(".")[0])
+        # Each nesting level adds two spaces; level 0 entries carry the total cost, level 1
+        # entries (e.g. what main.py imports) show where it comes from
+        depth = (len(indent) - 1) // 2
+        if depth == 0:
+            top_level_us += int(cumulative_us)
+        elif depth == 1:
+            direct[module] = direct.get(module, 0) + int(cumulative_us)
+
+    return {
+        "ready_ms": float(result.stdout.strip().splitlines()[-1]) * 1000.0,
+        "import_ms": top_level_us / 1000.0,
+        "direct_imports_ms": {module: us / 1000.0 for module, us in direct.items()},
+        "heavy_imported": sorted(module for module in HEAVY_MODULES if module in imported)
+    }
+
+
+def main():
+    """Run the benchmark and compare against a baseline."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters to start")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports to list")
+    parser.add_argument("--baseline", help="JSON written by a previous --output run to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown relative to the baseline")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    ready_ms = statistics.median(run["ready_ms"] for run in runs)
+    import_ms = statistics.median(run["import_ms"] for run in runs)
+    heavy = sorted(set().union(*(run["heavy_imported"] for run in runs)))
+
+    modules = {}
+    for run in runs:
+        for module, ms in run["direct_imports_ms"].items():
+            modules.setdefault(module, []).append(ms)
+    slowest = sorted(((statistics.median(values), module) for module, values in modules.items()), reverse=True)
+
+    print(f"Startup over {args.runs} runs (median): ready in {ready_ms:.1f} ms, imports {import_ms:.1f} ms")
+    print("Slowest imports:")
+    for ms, module in slowest[:args.top]:
+        print(f"  {module:<40}{ms:>10.1f} ms")
+
+    failures = []
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(heavy)}")
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+        limit = baseline["ready_ms"] * (1.0 + args.tolerance)
+        print(f"Baseline: ready in {baseline['ready_ms']:.1f} ms (limit {limit:.1f} ms)")
+        if ready_ms > limit:
+            failures.append(f"startup regressed: {ready_ms:.1f} ms > {limit:.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                "runs": args.runs,
+                "ready_ms": ready_ms,
+                "import_ms": import_ms,
+                "heavy_imported": heavy,
+                "slowest_imports_ms": {module: ms for ms, module in slowest[:args.top]}
+            }, f, indent=2)
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,7 @@ Entry point for the AI Onboarding System.
 
 import os
 import sys
+import argparse
 import traceback
 
 # Add the project root to the path
@@ -12,15 +13,48 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # Import necessary modules
 from src.agent import OnboardingAgent
-from src.utils import ensure_nltk_resources
 from src.constants import COLORS
 
 
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description="AI Onboarding System")
+    parser.add_argument("--serve", action="store_true",
+                        help="Serve many sessions over HTTP/WebSocket instead of the terminal REPL")
+    parser.add_argument("--embedding-service", action="store_true",
+                        help="Run the shared embedding service used by database.embedding_service")
+    parser.add_argument("--batch-packs", metavar="HIRES_FILE",
+                        help="Generate welcome emails, schedules and resource lists for a CSV/JSONL of hires")
+    parser.add_argument("--output", help="Batch output: directory (text) or JSONL file (json), '-' for stdout")
+    parser.add_argument("--format", choices=("text", "json"), default="text", help="Batch output format")
+    parser.add_argument("--sections", help="Comma-separated batch sections (default: email,schedule,resources)")
+    parser.add_argument("--workers", type=int, help="Batch worker processes (default: batch.workers)")
+    parser.add_argument("--host", help="Interface to bind in server mode (default: server.host)")
+    parser.add_argument("--port", type=int, help="Port to bind in server mode (default: server.port)")
+    return parser.parse_args()
+
+
 def main():
     """Main entry point for the application."""
+    args = parse_args()
     try:
-        # Ensure NLTK resources are downloaded
-        ensure_nltk_resources()
+        if args.embedding_service:
+            # Own the embedding model for every worker on this node
+            from src.embedding_service import run_embedding_service
+            run_embedding_service()
+            return
+
+        if args.batch_packs:
+            # Render packs for a whole cohort without starting the interactive agent
+            from src.batch_packs import run_batch
+            output = args.output or ("onboarding_packs" if args.format == "text" else "onboarding_packs.jsonl")
+            sys.exit(run_batch(args.batch_packs, output, args.format, args.sections, args.workers))
+
+        if args.serve:
+            # Serve all sessions from one process sharing the embedder and vector database
+            from src.server import run_server
+            run_server(args.host, args.port)
+            return
 
         # Initialize and start the onboarding agent
         agent = OnboardingAgent()
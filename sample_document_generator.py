@@ -1,6 +1,160 @@
 # sample_document_generator.py
-from fpdf import FPDF, XPos, YPos
+"""
+Sample and synthetic document generation for the AI Onboarding System.
+
+Without arguments, writes the two sample PDFs (HR policies and the technical
+handbook), ingests them and shows the passage retrieved for a sample question.
+
+With --documents, writes a synthetic corpus of HR policy manuals and
+technical handbooks for load-testing ingestion and retrieval:
+
+- sentences come from per-section templates filled from a controlled
+  vocabulary (--vocabulary-size team and system names);
+- document lengths follow a log-normal distribution (--median-sentences,
+  --length-sigma);
+- a share of documents repeat an earlier document's body under their own
+  title (--duplicate-rate);
+- documents are written as PDF, plain text or a mix (--format, --pdf-share).
+
+Each document depends only on the seed and its index, so a corpus is
+reproducible byte for byte whatever the number of worker processes.
+
+Usage:
+    python sample_document_generator.py
+    python sample_document_generator.py --documents 10000 --output-dir ./synthetic_corpus --workers 8
+    python sample_document_generator.py --documents 2000 --format txt --duplicate-rate 0.1 --ingest
+"""
+
 import os
+import sys
+import json
+import math
+import time
+import random
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Tuple
+
+from fpdf import FPDF, XPos, YPos
+
+COMPANY = "Aniket AI"
+
+# Fixed PDF creation date, so the same seed gives the same bytes (and content hashes)
+PDF_CREATION_DATE = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+# Documents per task sent to a worker, and per output subdirectory
+DOCUMENTS_PER_TASK = 200
+DOCUMENTS_PER_DIRECTORY = 1000
+
+CORPUS_FORMATS = ("pdf", "txt", "mixed")
+
+SYLLABLES = ["ka", "lo", "mi", "ren", "so", "ta", "vi", "dor", "nu", "pel", "qua", "zen", "bri", "osh", "ul", "fa",
+             "gar", "te", "xi", "mo"]
+
+VOCABULARY = {
+    "period": ["month", "quarter", "half-year", "year"],
+    "role": ["engineer", "data scientist", "product manager", "designer", "analyst", "recruiter", "team lead"],
+    "tool": ["MLflow", "Prometheus", "Grafana", "ChromaDB", "Bandit", "Pylint", "Terraform", "Kubernetes"],
+    "channel": ["the HR portal", "the service desk", "the people team", "your manager", "the benefits hotline"],
+}
+
+# Section title -> sentence templates, per document kind. Slots: {n}, {team}, {system} and the VOCABULARY keys.
+SECTIONS = {
+    "hr": {
+        "Leave Policy": [
+            "Employees receive {n} paid vacation days per {period}.",
+            "Sick leave of up to {n} days does not require a doctor's note.",
+            "Primary caregivers on the {team} team are entitled to {n} weeks of paid parental leave.",
+            "Unused vacation days carry over for {n} months.",
+            "Leave requests are submitted through {channel} at least {n} days in advance.",
+        ],
+        "Remote Work": [
+            "The {team} team works {n} days a week in the office.",
+            "A home office stipend of {n} dollars per {period} is available to every {role}.",
+            "Core hours are observed on every workday regardless of location.",
+            "Remote work from abroad is limited to {n} weeks per {period}.",
+            "Equipment for remote work is requested through {channel}.",
+        ],
+        "Benefits": [
+            "Health coverage starts on the first day of employment.",
+            "The learning budget for each {role} is {n} hundred dollars per {period}.",
+            "Retirement contributions are matched up to {n} percent of salary.",
+            "Wellness reimbursements are claimed through {channel}.",
+            "Benefit elections can be changed once per {period}.",
+        ],
+        "Code of Conduct": [
+            "Every {role} completes ethics training within {n} days of joining.",
+            "Customer data must never be used for model training.",
+            "Conflicts of interest are reported to {channel}.",
+            "Gifts worth more than {n} dollars must be declined.",
+            "Concerns can be raised anonymously through {channel}.",
+        ],
+        "Expenses and Travel": [
+            "Expense reports are filed within {n} days of purchase.",
+            "Travel for the {team} team is booked through {channel}.",
+            "Meals are reimbursed up to {n} dollars per day while travelling.",
+            "Flights longer than {n} hours may be booked in premium economy.",
+            "Receipts are required for every expense above {n} dollars.",
+        ],
+        "Performance Reviews": [
+            "Reviews for every {role} take place once per {period}.",
+            "Goals are agreed with your manager within {n} weeks of joining.",
+            "Promotion cases for the {team} team are reviewed each {period}.",
+            "Peer feedback is collected from at least {n} colleagues.",
+            "Compensation reviews follow each performance review.",
+        ],
+    },
+    "technical": {
+        "Development Standards": [
+            "All models built by the {team} team include a model card.",
+            "Experiments are tracked in {tool} with a version for every run.",
+            "Production models need approval from {n} senior engineers.",
+            "Static analysis with {tool} runs on every change.",
+            "Test coverage for {system} must stay above {n} percent.",
+        ],
+        "Code Review": [
+            "Every change to {system} is reviewed by at least {n} engineers.",
+            "Reviews are completed within {n} business days.",
+            "Changes touching customer data need a security reviewer.",
+            "The {team} team owns reviews for {system}.",
+            "Large changes are split into parts of under {n} hundred lines.",
+        ],
+        "Infrastructure": [
+            "{system} runs on {tool} in an isolated network.",
+            "Training clusters for the {team} team scale to {n} nodes.",
+            "Infrastructure changes are applied with {tool}.",
+            "Metrics from {system} are collected by {tool}.",
+            "Capacity for {system} is reviewed every {period}.",
+        ],
+        "Security Protocols": [
+            "API keys for {system} are rotated every {n} days.",
+            "Vulnerability scans of {system} run daily.",
+            "Access to {system} is reviewed every {period}.",
+            "Secrets are never stored in source control.",
+            "Security incidents are reported within {n} hours.",
+        ],
+        "Incident Response": [
+            "The {team} team is on call for {system}.",
+            "Severity one incidents are acknowledged within {n} minutes.",
+            "Postmortems are published within {n} days of an incident.",
+            "On-call rotations last {n} days.",
+            "Runbooks for {system} are kept next to its dashboards in {tool}.",
+        ],
+        "Data Handling": [
+            "Training data for {system} is retained for {n} months.",
+            "Personal data is anonymised before it reaches {system}.",
+            "Dataset access requests are approved by the {team} team.",
+            "Data exports larger than {n} gigabytes need approval.",
+            "Evaluation datasets are versioned in {tool}.",
+        ],
+    },
+}
+
+DOCUMENT_KINDS = {
+    "hr": ("hr_policy", "HR Policy Manual"),
+    "technical": ("technical_handbook", "Technical Handbook"),
+}
 
 
 def create_hr_policies():
@@ -87,22 +241,255 @@ def create_technical_handbook():
     print("Generated technical_handbook.pdf")
 
 
+def build_vocabulary(size: int, seed: int) -> Dict[str, List[str]]:
+    """
+    Team and system names shared by every document of a corpus.
+
+    Args:
+        size: Number of team names and of system names
+        seed: Corpus seed
+
+    Returns:
+        Dictionary with "team" and "system" name lists
+    """
+    rng = random.Random(f"{seed}:vocabulary")
+    names = set()
+    while len(names) < 2 * size:
+        names.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize())
+    names = sorted(names)
+    rng.shuffle(names)
+    return {"team": names[:size], "system": [f"{name} Platform" for name in names[size:]]}
+
+
+def plan_document(index: int, settings: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Decide a document's kind, file format and the document whose body it uses.
+
+    Args:
+        index: Document number
+        settings: Corpus settings from generate_corpus
+
+    Returns:
+        Dictionary with kind, format and body (the index of the original document)
+    """
+    rng = random.Random(f"{settings['seed']}:plan:{index}")
+    kind = "hr" if rng.random() < settings['hr_share'] else "technical"
+    file_format = settings['format']
+    if file_format == "mixed":
+        file_format = "pdf" if rng.random() < settings['pdf_share'] else "txt"
+
+    # Duplicates copy an original's body, and with it its kind
+    body = index
+    if index and rng.random() < settings['duplicate_rate']:
+        body = rng.randrange(index)
+        original = plan_document(body, settings)
+        body, kind = original['body'], original['kind']
+    return {"kind": kind, "format": file_format, "body": body}
+
+
+def document_sections(body: int, kind: str, settings: Dict[str, Any],
+                      vocabulary: Dict[str, List[str]]) -> List[Tuple[str, List[str]]]:
+    """
+    Generate the sections of a document body.
+
+    Args:
+        body: Index of the original document, which seeds its text
+        kind: "hr" or "technical"
+        settings: Corpus settings from generate_corpus
+        vocabulary: Names from build_vocabulary
+
+    Returns:
+        List of (section title, sentences)
+    """
+    rng = random.Random(f"{settings['seed']}:body:{body}")
+    sentences = rng.lognormvariate(math.log(settings['median_sentences']), settings['length_sigma'])
+    remaining = max(settings['min_sentences'], min(int(sentences), settings['max_sentences']))
+
+    templates = SECTIONS[kind]
+    sections = []
+    while remaining > 0:
+        title = rng.choice(list(templates))
+        count = min(remaining, rng.randint(3, 12))
+        sections.append((title, [
+            rng.choice(templates[title]).format(
+                n=rng.randint(2, 90),
+                team=rng.choice(vocabulary['team']),
+                system=rng.choice(vocabulary['system']),
+                **{slot: rng.choice(values) for slot, values in VOCABULARY.items()}
+            ) for _ in range(count)
+        ]))
+        remaining -= count
+    return sections
+
+
+def write_text_document(path: str, title: str, sections: List[Tuple[str, List[str]]]) -> None:
+    """Write a document as plain text, one paragraph per section."""
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"{title}\n\n")
+        for section, sentences in sections:
+            f.write(f"{section}\n{' '.join(sentences)}\n\n")
+
+
+def write_pdf_document(path: str, title: str, sections: List[Tuple[str, List[str]]]) -> None:
+    """Write a document as a PDF in the layout of the sample documents."""
+    pdf = FPDF()
+    pdf.set_creation_date(PDF_CREATION_DATE)
+    pdf.add_page()
+    pdf.set_font("helvetica", size=14, style='B')
+    pdf.cell(0, 10, text=title, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align='C')
+    pdf.ln(5)
+    for section, sentences in sections:
+        pdf.set_font(size=12, style='B')
+        pdf.cell(0, 10, text=f"{section}:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+        pdf.set_font(style='')
+        pdf.multi_cell(pdf.w - 2 * pdf.l_margin, 7, text=' '.join(sentences))
+        pdf.ln(3)
+    pdf.output(path)
+
+
+def _generate_range(start: int, stop: int, output_dir: str, settings: Dict[str, Any]) -> Dict[str, int]:
+    """Write documents start..stop-1; module-level so it can run in a worker process."""
+    vocabulary = build_vocabulary(settings['vocabulary_size'], settings['seed'])
+    stats = {"pdf": 0, "txt": 0, "duplicates": 0, "sentences": 0, "bytes": 0}
+    for index in range(start, stop):
+        plan = plan_document(index, settings)
+        sections = document_sections(plan['body'], plan['kind'], settings, vocabulary)
+        prefix, kind_title = DOCUMENT_KINDS[plan['kind']]
+
+        directory = os.path.join(output_dir, f"{index // DOCUMENTS_PER_DIRECTORY:04d}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{prefix}_{index:07d}.{plan['format']}")
+        title = f"{COMPANY} {kind_title} {index:07d}"
+        if plan['format'] == "pdf":
+            write_pdf_document(path, title, sections)
+        else:
+            write_text_document(path, title, sections)
+
+        stats[plan['format']] += 1
+        stats["duplicates"] += plan['body'] != index
+        stats["sentences"] += sum(len(sentences) for _, sentences in sections)
+        stats["bytes"] += os.path.getsize(path)
+    return stats
+
+
+def generate_corpus(output_dir: str, documents: int, file_format: str = "mixed", pdf_share: float = 0.5,
+                    hr_share: float = 0.5, median_sentences: int = 60, length_sigma: float = 0.6,
+                    min_sentences: int = 5, max_sentences: int = 2000, duplicate_rate: float = 0.05,
+                    vocabulary_size: int = 200, workers: int = None, seed: int = 7) -> Dict[str, Any]:
+    """
+    Write a reproducible synthetic corpus of policy manuals and handbooks.
+
+    Args:
+        output_dir: Directory for the documents (subdirectories of 1000 files each)
+        documents: Number of documents
+        file_format: "pdf", "txt" or "mixed"
+        pdf_share: Share of PDFs when the format is mixed
+        hr_share: Share of HR policy manuals; the rest are technical handbooks
+        median_sentences: Median document length in sentences
+        length_sigma: Log-normal sigma of the document length
+        min_sentences: Shortest document in sentences
+        max_sentences: Longest document in sentences
+        duplicate_rate: Share of documents repeating an earlier document's body
+        vocabulary_size: Number of distinct team names and of system names
+        workers: Worker processes (defaults to one per CPU)
+        seed: Random seed
+
+    Returns:
+        Dictionary with the settings, documents, pdf, txt, duplicates, sentences, bytes,
+        elapsed_seconds and docs_per_sec; also written to corpus.json in output_dir
+    """
+    if file_format not in CORPUS_FORMATS:
+        raise ValueError(f"Unknown format '{file_format}'. Available: {', '.join(CORPUS_FORMATS)}")
+    if not 0 <= duplicate_rate < 1:
+        raise ValueError("duplicate_rate must be in [0, 1)")
+
+    settings = {
+        "seed": seed, "format": file_format, "pdf_share": pdf_share, "hr_share": hr_share,
+        "median_sentences": median_sentences, "length_sigma": length_sigma, "min_sentences": min_sentences,
+        "max_sentences": max_sentences, "duplicate_rate": duplicate_rate, "vocabulary_size": vocabulary_size
+    }
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+
+    ranges = [(start, min(start + DOCUMENTS_PER_TASK, documents)) for start in range(0, documents, DOCUMENTS_PER_TASK)]
+    stats = {"documents": documents, "pdf": 0, "txt": 0, "duplicates": 0, "sentences": 0, "bytes": 0}
+    started = time.perf_counter()
+    if workers <= 1 or len(ranges) <= 1:
+        results = [_generate_range(start, stop, output_dir, settings) for start, stop in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_generate_range, start, stop, output_dir, settings) for start, stop in ranges]
+            results = [future.result() for future in futures]
+    for result in results:
+        for key, value in result.items():
+            stats[key] += value
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = elapsed
+    stats["docs_per_sec"] = documents / elapsed if elapsed else 0.0
+
+    # Record how the corpus was made next to it (JSON is not picked up by ingestion)
+    with open(os.path.join(output_dir, "corpus.json"), 'w') as f:
+        json.dump({"settings": settings, "stats": stats}, f, indent=2)
+    return {"settings": settings, **stats}
+
+
+def parse_args():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, help="Generate a synthetic corpus of this many documents")
+    parser.add_argument("--output-dir", default="synthetic_corpus", help="Directory for the synthetic corpus")
+    parser.add_argument("--format", choices=CORPUS_FORMATS, default="mixed", help="Document file format")
+    parser.add_argument("--pdf-share", type=float, default=0.5, help="Share of PDFs with --format mixed")
+    parser.add_argument("--hr-share", type=float, default=0.5, help="Share of HR policy manuals")
+    parser.add_argument("--median-sentences", type=int, default=60, help="Median document length in sentences")
+    parser.add_argument("--length-sigma", type=float, default=0.6, help="Log-normal sigma of document length")
+    parser.add_argument("--max-sentences", type=int, default=2000, help="Longest document in sentences")
+    parser.add_argument("--duplicate-rate", type=float, default=0.05,
+                        help="Share of documents repeating an earlier document's body")
+    parser.add_argument("--vocabulary-size", type=int, default=200, help="Distinct team and system names")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=7, help="Random seed")
+    parser.add_argument("--ingest", action="store_true", help="Ingest the synthetic corpus afterwards")
+    return parser.parse_args()
+
+
 if __name__ == "__main__":
+    # Add the project root to the path
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    args = parse_args()
+
+    if args.documents:
+        stats = generate_corpus(args.output_dir, args.documents, args.format, args.pdf_share, args.hr_share,
+                                args.median_sentences, args.length_sigma, max_sentences=args.max_sentences,
+                                duplicate_rate=args.duplicate_rate, vocabulary_size=args.vocabulary_size,
+                                workers=args.workers, seed=args.seed)
+        print(f"Generated {stats['documents']} documents ({stats['pdf']} PDF, {stats['txt']} text, "
+              f"{stats['duplicates']} duplicates, {stats['sentences']} sentences, {stats['bytes'] / 1e6:.1f} MB) "
+              f"in {stats['elapsed_seconds']:.1f}s ({stats['docs_per_sec']:.0f} docs/s)")
+        if args.ingest:
+            from src.vector_db import OnboardingVectorDB
+
+            print("\nIngesting synthetic corpus...")
+            OnboardingVectorDB().ingest_directory(args.output_dir)
+        sys.exit(0)
+
     # Create sample documents
     create_hr_policies()
     create_technical_handbook()
 
     # Initialize and ingest documents
-    from ai_onboarding import HRAssistant
+    from src.vector_db import OnboardingVectorDB
 
-    assistant = HRAssistant()
+    db = OnboardingVectorDB()
 
     print("\nIngesting sample documents...")
-    assistant.db.ingest_document("hr_policies.pdf")
-    assistant.db.ingest_document("technical_handbook.pdf")
+    db.ingest_document("hr_policies.pdf")
+    db.ingest_document("technical_handbook.pdf")
 
     # Demo query
     print("\nSample query results:")
     query = "How many vacation days do I get as a new employee?"
+    results = db.query_documents(query, doc_type="hr", n_results=1)
     print(f"Q: {query}")
-    print(f"A: {assistant.answer_query(query)}")
\ No newline at end of file
+    print(f"Top passage: {results['documents'][0][0] if results['documents'] and results['documents'][0] else '-'}")
@@ -3,20 +3,26 @@
 Main agent logic for the AI Onboarding System.
 """
 
-import os
-from functools import lru_cache
-from typing import Dict, List, Any
+import time
+import logging
+import threading
+from typing import Callable, Dict, List, Any
 from datetime import datetime
 from dotenv import load_dotenv
-from groq import Groq
 
-from src.constants import COLORS, COMMANDS
-from src.utils import format_section, load_config, load_settings, get_current_date, get_resources_for_role
-from src.vector_db import OnboardingVectorDB
+from src.config_service import get_config_service
+from src.constants import COLORS
+from src.metrics import get_metrics
+from src.progress_store import ProgressStore, default_hire_id
+from src.utils import StreamingSection, format_section, load_config, load_settings, get_current_date
+from src.views import (render_answer, render_checklist, render_help, render_resources, render_schedule,
+                       render_welcome_email)
 
 # Load environment variables
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 
 class OnboardingAgent:
     """Main agent for handling user interactions during the onboarding process."""
@@ -27,31 +33,129 @@ class OnboardingAgent:
         self.config = load_config()
         self.settings = load_settings()
 
-        # Initialize Groq client
-        self.groq = Groq(api_key=os.getenv("GROQ_API_KEY"))
+        # The LLM gateway, vector database and answer pipeline pull in torch, chromadb and groq.
+        # Only "ask" needs them, so they are created on first use (or by warm_up in the background)
+        self._llm = None
+        self._db = None
+        self._pipeline = None
+        self._init_lock = threading.Lock()
+        self._warmup_thread = None
+
+        # Initialize checklist progress store
+        self.progress = ProgressStore(self.config.get('progress', {}).get('path', './onboarding_db/progress.sqlite'))
 
-        # Initialize vector database
-        self.db = OnboardingVectorDB()
+        # Pick up edits to config.json and settings.yaml without a restart
+        get_config_service().subscribe(self._on_config_reload)
 
         # Initialize user context and interaction history
         self.interaction_history = []
         self.user_context = {}
 
+    @property
+    def llm(self):
+        """LLM gateway, created on first use."""
+        self._ensure_rag()
+        return self._llm
+
+    @property
+    def db(self):
+        """Vector database, created on first use."""
+        self._ensure_rag()
+        return self._db
+
+    @property
+    def pipeline(self):
+        """Answer pipeline, created on first use."""
+        self._ensure_rag()
+        return self._pipeline
+
+    def _on_config_reload(self, config: Dict[str, Any], settings: Dict[str, Any]):
+        """Apply reloaded configuration; model settings take effect on the next question."""
+        self.config = config
+        self.settings = settings
+        if self._pipeline is not None:
+            self._pipeline.config = config
+            self._llm.llm_config = config['llm']
+
+    def warm_up(self):
+        """Start initializing the question-answering subsystems on a background thread."""
+        if self._warmup_thread is None:
+            self._warmup_thread = threading.Thread(target=self._warm_up, name="warm-up", daemon=True)
+            self._warmup_thread.start()
+
+    def _warm_up(self):
+        """Background warm-up; failures are logged and retried by the first question."""
+        try:
+            self._ensure_rag()
+        except Exception as e:
+            logger.warning("Warm-up failed, the first question will retry: %s", e)
+
+    def _ensure_rag(self):
+        """Import and create the LLM gateway, vector database and answer pipeline once."""
+        if self._pipeline is not None:
+            return
+        with self._init_lock:
+            if self._pipeline is not None:
+                return
+            from src.llm_gateway import LLMGateway
+            from src.pipeline import AnswerPipeline
+            from src.vector_db import OnboardingVectorDB
+
+            # Initialize LLM gateway (pooled, rate-limited Groq client)
+            self._llm = LLMGateway(self.config['llm'])
+
+            # Initialize vector database
+            self._db = OnboardingVectorDB()
+
+            # Initialize answer pipeline (retrieval, prompt and answer caches)
+            self._pipeline = AnswerPipeline(self.config, self._db)
+
     def start_session(self):
         """Initialize onboarding session."""
         print(format_section("Welcome to Aniket AI Onboarding System", [], COLORS["title"]))
+        if self.config.get('startup', {}).get('background_warmup', True):
+            self.warm_up()
         self._collect_initial_info()
         self._show_help()
         self._main_interaction_loop()
+        self._dump_metrics()
+
+    def _dump_metrics(self):
+        """Write stage latency metrics to metrics.json_path, if set."""
+        metrics_config = self.config.get('metrics', {})
+        if metrics_config.get('enabled', False) and metrics_config.get('json_path'):
+            get_metrics().dump_json(metrics_config['json_path'])
+            print(f"{COLORS['border']}Latency metrics written to {metrics_config['json_path']}")
 
     def _collect_initial_info(self):
         """Collect user information."""
         print(format_section("Let's Get Started", [], COLORS["success"]))
         self.user_context['name'] = input(f"{COLORS['input']}Your full name: ").strip()
         self.user_context['role'] = input(f"{COLORS['input']}Your job role: ").strip()
-        self.user_context['start_date'] = get_current_date()
+        employee_id = input(f"{COLORS['input']}Your employee id or work email (optional): ").strip().lower()
+        self.user_context['start_date'] = self._prompt_start_date()
+
+        # Without an id, hires with the same name and start date would share one checklist
+        self.user_context['hire_id'] = employee_id or default_hire_id(self.user_context['name'],
+                                                                      self.user_context['start_date'])
+
+        # Returning hires keep their progress; new tasks in the template are added
+        self.progress.enroll(self.user_context['hire_id'], self.user_context['name'], self.user_context['role'],
+                             self.user_context['start_date'], self.settings['checklists']['default'])
         print(f"\n{COLORS['success']}Welcome, {self.user_context['name']}! Setting up your onboarding...\n")
 
+    @staticmethod
+    def _prompt_start_date() -> str:
+        """Ask for the hire's first day in YYYY-MM-DD format, defaulting to today."""
+        while True:
+            start_date = input(f"{COLORS['input']}Your start date (YYYY-MM-DD, blank for today): ").strip()
+            if not start_date:
+                return get_current_date()
+            try:
+                return datetime.strptime(start_date, "%Y-%m-%d").strftime("%Y-%m-%d")
+            except ValueError:
+                print(f"{COLORS['warning']}Please enter the date as YYYY-MM-DD.")
+
     def _main_interaction_loop(self):
         """Handle user commands."""
         while True:
@@ -64,6 +168,8 @@ class OnboardingAgent:
                     self._handle_question(user_input[4:].strip())
                 elif user_input == "checklist":
                     self._show_checklist()
+                elif user_input.startswith("done "):
+                    self._complete_task(user_input[5:].strip())
                 elif user_input == "resources":
                     self._show_resources()
                 elif user_input == "schedule":
@@ -84,140 +190,105 @@ class OnboardingAgent:
 
     def _show_checklist(self):
         """Display onboarding progress."""
-        # Load checklist from settings
-        checklist_template = self.settings['checklists']['default']
-
-        # Format checklist items with colors
-        formatted_checklist = []
-        completed_count = 0
-        total_count = len(checklist_template)
+        print(render_checklist(self.progress.checklist(self.user_context['hire_id'])))
 
-        for item in checklist_template:
-            if item['status'] == 'completed':
-                formatted_checklist.append(f"{COLORS['success']}✓ {item['task']}")
-                completed_count += 1
-            else:
-                formatted_checklist.append(f"{COLORS['warning']}◻ {item['task']}")
+    def _complete_task(self, number: str):
+        """
+        Mark a checklist task complete.
 
-        # Add progress information
-        progress = f"{COLORS['header']}Progress: {COLORS['success']}{completed_count}/{total_count} tasks completed"
+        Args:
+            number: The task's number as shown by "checklist"
+        """
+        checklist = self.progress.checklist(self.user_context['hire_id'])
+        if not number.isdigit() or not 1 <= int(number) <= len(checklist):
+            print(format_section("Error", [f"Choose a task number between 1 and {len(checklist)}."], COLORS["warning"]))
+            return
 
-        print(format_section("Onboarding Checklist", formatted_checklist + [progress]))
+        task = checklist[int(number) - 1]['task']
+        if not self.progress.mark_complete(self.user_context['hire_id'], task):
+            print(format_section("Checklist", [f"'{task}' is already complete."], COLORS["border"]))
+            return
+        self._show_checklist()
 
     def _show_schedule(self):
         """Display training schedule."""
-        # Get schedule from settings
-        schedule_template = self.settings['schedules']['default']
-
-        # Format schedule with start date
-        schedule = []
-
-        # Day 1
-        schedule.append(f"{COLORS['header']}Day 1 ({self.user_context['start_date']}):")
-        for activity in schedule_template['day1']:
-            schedule.append(f"{COLORS['success']}  {activity['time']} - {activity['activity']}")
-        schedule.append("")
-
-        # Day 2
-        schedule.append(f"{COLORS['header']}Day 2:")
-        for activity in schedule_template['day2']:
-            schedule.append(f"{COLORS['border']} {activity['time']} - {activity['activity']}")
-        schedule.append("")
-
-        # Day 3
-        schedule.append(f"{COLORS['header']}Day 3:")
-        for activity in schedule_template['day3']:
-            schedule.append(f"{COLORS['warning']} {activity['time']} - {activity['activity']}")
-
-        # Add calendar link
-        schedule.append(
-            f"{COLORS['border']}Full calendar: {COLORS['text']}https://calendar.{self.settings['company']['domain']}")
-
-        print(format_section("Onboarding Schedule", schedule))
+        print(render_schedule(self.settings, self.user_context))
 
     def _show_resources(self):
         """Show learning resources."""
-        role = self.user_context.get('role', 'general').lower()
-        resources = get_resources_for_role(role)
-
-        # Format resources for display
-        formatted_resources = []
-        for i, resource in enumerate(resources, 1):
-            formatted_resources.append(f"{COLORS['success']}{i}. {resource['name']}: {COLORS['text']}{resource['url']}")
-
-        print(format_section("Learning Resources", formatted_resources))
+        print(render_resources(self.user_context))
 
     def _generate_welcome_email(self):
         """Generate welcome email."""
-        company_name = self.settings['company']['name']
-
-        email_content = [
-            f"{COLORS['header']}Subject: Welcome to {company_name}, {self.user_context['name']}!",
-            "",
-            f"{COLORS['text']}Dear {self.user_context['name']},",
-            "",
-            f"{COLORS['success']}We're excited to have you join us as a {self.user_context['role']}!",
-            "",
-            f"{COLORS['border']}Your onboarding schedule:",
-            f"{COLORS['text']}- First day: {self.user_context['start_date']}",
-            f"{COLORS['text']}- Team meeting: {self.user_context['start_date']} 10:00 AM",
-            f"{COLORS['text']}- Equipment setup: IT Department (Floor 3)",
-            "",
-            f"{COLORS['header']}Best regards,",
-            f"{COLORS['success']}{company_name} HR Team"
-        ]
-
-        print(format_section("Welcome Email", email_content, COLORS["success"]))
+        print(render_welcome_email(self.settings, self.user_context))
 
     def _show_help(self):
         """Show help menu."""
-        help_content = []
-
-        # Format commands
-        for cmd, description in COMMANDS.items():
-            if cmd in ["exit"]:
-                color = COLORS["warning"]
-            else:
-                color = COLORS["success"] if len(help_content) % 2 == 0 else COLORS["border"]
-
-            help_content.append(f"{color}{cmd.ljust(15)}: {description}")
-
-        print(format_section("Available Commands", help_content))
+        print(render_help())
 
-    @lru_cache(maxsize=100)
     def _handle_question(self, question: str):
         """
         Answer questions using RAG.
 
+        With llm.stream enabled, tokens are rendered as they arrive and the box
+        is closed when the stream ends. Time-to-first-token, total time and
+        prompt token counts are recorded in the interaction history.
+
         Args:
             question: User's question
         """
-        # Query vector database
-        rag_config = self.config['rag']
-        results = self.db.query_documents(
-            query_text=question,
-            doc_type=rag_config['default_document_type'],
-            n_results=rag_config['query_results']
-        )
-
-        # Prepare context for LLM
-        context = "\n".join(results['documents'][0]) if results['documents'] else ""
-
-        # Query LLM
-        llm_config = self.config['llm']
-        response = self.groq.chat.completions.create(
-            model=llm_config['model'],
-            messages=[{
-                "role": "system",
-                "content": f"""Answer as HR assistant for {self.user_context['name']}.
-                Context: {context}
-                Be concise and professional."""
-            }, {
-                "role": "user",
-                "content": question
-            }],
-            temperature=llm_config['temperature']
-        )
-
-        answer = response.choices[0].message.content
-        print(format_section("Answer", [answer], COLORS["success"]))
\ No newline at end of file
+        started = time.perf_counter()
+        first_token = []
+        renderer = StreamingSection("Answer", COLORS["success"], self.config['llm'].get('stream_width', 80))
+
+        def on_token(token: str):
+            if not first_token:
+                first_token.append(time.perf_counter())
+            renderer.write(token)
+
+        # Setup failures (model download, API key, database backend) surface here since
+        # initialization is lazy; report them and keep the session going
+        try:
+            from src.pipeline import PROMPT_USAGE_FIELDS
+            result = self._answer_question(question, on_token if self.config['llm'].get('stream', False) else None)
+        except Exception as e:
+            if first_token:
+                renderer.finish()
+            print(format_section("Error", [f"Could not answer the question: {e}"], COLORS["warning"]))
+            return
+        total_seconds = time.perf_counter() - started
+
+        if first_token:
+            renderer.finish()
+        else:
+            print(render_answer(result['answer']))
+        self.pipeline.observe(result['source'], total_seconds, (first_token[0] - started) if first_token else None)
+
+        self.interaction_history.append({
+            "question": question,
+            "answer": result['answer'],
+            "source": result['source'],
+            "ttft_seconds": (first_token[0] - started) if first_token else total_seconds,
+            "total_seconds": total_seconds,
+            **{key: result.get(key, 0) for key in PROMPT_USAGE_FIELDS}
+        })
+
+    def _answer_question(self, question: str, on_token: Callable[[str], None] = None) -> Dict[str, Any]:
+        """
+        Retrieve context and generate an answer, reusing cached answers when possible.
+
+        Args:
+            question: User's question
+            on_token: Callback receiving streamed answer text; enables streaming (optional)
+
+        Returns:
+            Dictionary with the answer and its source (llm, answer_cache or semantic_cache)
+        """
+        request = self.pipeline.prepare(question)
+        if "answer" in request:
+            return request
+
+        # Query LLM through the shared gateway
+        started = time.perf_counter()
+        answer = self.llm.complete_blocking(request['messages'], on_token)
+        return self.pipeline.record(request, answer, time.perf_counter() - started)
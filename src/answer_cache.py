@@ -0,0 +1,119 @@
+"""
+Answer cache for the AI Onboarding System.
+
+Generated answers are stored in SQLite so they are shared across sessions and
+processes. Entries expire after a TTL and are dropped when the corpus changes.
+"""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from typing import Any, Dict, List, Optional
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase, collapse whitespace and drop trailing punctuation."""
+    return re.sub(r"[\s?!.]+$", "", " ".join(question.lower().split()))
+
+
+class AnswerCache:
+    """Persistent TTL cache of generated answers."""
+
+    def __init__(self, path: str, ttl_seconds: float):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            ttl_seconds: How long an answer stays valid
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript("""
+            PRAGMA journal_mode = WAL;
+            CREATE TABLE IF NOT EXISTS answers (
+                key TEXT PRIMARY KEY,
+                answer TEXT NOT NULL,
+                corpus_version TEXT NOT NULL,
+                expires_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_answers_expires_at ON answers (expires_at);
+        """)
+
+    @staticmethod
+    def make_key(question: str, doc_type: Optional[str], chunk_ids: List[str], llm_config: Dict[str, Any],
+                 context_signature: str = None) -> str:
+        """
+        Build the cache key for a question.
+
+        Args:
+            question: User's question
+            doc_type: Document type filter used for retrieval
+            chunk_ids: Ids of the retrieved chunks, in prompt order
+            llm_config: The llm section of config.json
+            context_signature: How the chunks are packed into the prompt (ContextBuilder.signature)
+
+        Returns:
+            Hex key
+        """
+        payload = json.dumps([
+            normalize_question(question),
+            doc_type,
+            list(chunk_ids),
+            llm_config.get('model'),
+            llm_config.get('temperature'),
+            context_signature
+        ])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, corpus_version: str) -> Optional[str]:
+        """
+        Return a cached answer if it is fresh and was generated for the current corpus.
+
+        Args:
+            key: Cache key from make_key
+            corpus_version: Current corpus version
+
+        Returns:
+            The cached answer, or None on a miss
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT answer FROM answers WHERE key = ? AND corpus_version = ? AND expires_at > ?",
+                (key, corpus_version, time.time())
+            ).fetchone()
+        return row[0] if row else None
+
+    def put(self, key: str, answer: str, corpus_version: str) -> None:
+        """Store a generated answer."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO answers (key, answer, corpus_version, expires_at) VALUES (?, ?, ?, ?)",
+                (key, answer, corpus_version, time.time() + self.ttl_seconds)
+            )
+            self._conn.commit()
+
+    def invalidate(self, corpus_version: str) -> int:
+        """
+        Drop expired answers and answers generated for another corpus version.
+
+        Args:
+            corpus_version: Current corpus version
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            removed = self._conn.execute(
+                "DELETE FROM answers WHERE corpus_version != ? OR expires_at <= ?",
+                (corpus_version, time.time())
+            ).rowcount
+            self._conn.commit()
+        return removed
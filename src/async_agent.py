@@ -0,0 +1,240 @@
+"""
+Asynchronous agent for the AI Onboarding System.
+
+Command handlers are coroutines, so many onboarding sessions can share one
+event loop, one embedder and one vector store. Retrieval is CPU/IO bound
+library code and runs on a bounded thread pool; the LLM is called through
+the shared LLM gateway.
+"""
+
+import time
+import uuid
+import asyncio
+import inspect
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+
+from src.config_service import get_config_service
+from src.constants import COLORS
+from src.llm_gateway import LLMGateway, TokenCallback
+from src.pipeline import PROMPT_USAGE_FIELDS, AnswerPipeline
+from src.progress_store import ProgressStore, default_hire_id
+from src.utils import format_section, load_config, load_settings, get_current_date
+from src.vector_db import OnboardingVectorDB
+from src.views import (render_answer, render_checklist, render_help, render_resources, render_schedule,
+                       render_welcome_email)
+
+# Load environment variables
+load_dotenv()
+
+
+@dataclass
+class OnboardingSession:
+    """Per-hire state; everything else is shared by the agent."""
+
+    name: str
+    role: str
+    start_date: str
+    hire_id: str = ""
+    session_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    interaction_history: List[Dict[str, Any]] = field(default_factory=list)
+    enrolled: bool = field(default=False, repr=False)
+
+    def __post_init__(self):
+        if not self.hire_id:
+            self.hire_id = default_hire_id(self.name, self.start_date)
+
+    @property
+    def user_context(self) -> Dict[str, Any]:
+        """The hire's details in the shape expected by the views."""
+        return {"name": self.name, "role": self.role, "start_date": self.start_date, "hire_id": self.hire_id}
+
+
+class AsyncOnboardingAgent:
+    """Onboarding agent whose command handlers are coroutines."""
+
+    def __init__(self, db: OnboardingVectorDB = None, max_retrieval_workers: int = None,
+                 config: Dict[str, Any] = None):
+        """
+        Initialize shared resources.
+
+        Args:
+            db: Vector database to share; a new one is opened if omitted
+            max_retrieval_workers: Size of the retrieval thread pool (defaults to rag.retrieval_workers)
+            config: Configuration to use instead of config.json (optional)
+        """
+        # Load configuration
+        self.config = config if config is not None else load_config()
+        self.settings = load_settings()
+
+        # Initialize LLM gateway (pooled, rate-limited Groq client shared by all sessions)
+        self.llm = LLMGateway(self.config['llm'])
+
+        # Initialize vector database and answer pipeline
+        self.db = db if db is not None else OnboardingVectorDB(config)
+        self.pipeline = AnswerPipeline(self.config, self.db)
+
+        # Initialize checklist progress store
+        self.progress = ProgressStore(self.config.get('progress', {}).get('path', './onboarding_db/progress.sqlite'))
+
+        # Pick up edits to config.json and settings.yaml without a restart (unless config was given explicitly)
+        get_config_service().subscribe(self._on_config_reload)
+        self._config_overridden = config is not None
+
+        # Retrieval runs off the event loop on a bounded pool
+        workers = max_retrieval_workers or self.config['rag'].get('retrieval_workers', 4)
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="retrieval")
+
+    def _on_config_reload(self, config: Dict[str, Any], settings: Dict[str, Any]):
+        """Apply reloaded configuration; model settings take effect on the next question."""
+        self.settings = settings
+        if not self._config_overridden:
+            self.config = config
+            self.pipeline.config = config
+            self.llm.llm_config = config['llm']
+
+    def create_session(self, name: str, role: str, start_date: str = None, hire_id: str = None) -> OnboardingSession:
+        """
+        Start an onboarding session for a new hire.
+
+        Args:
+            name: The hire's full name
+            role: The hire's job role
+            start_date: First day (defaults to today)
+            hire_id: Employee id or email the hire's checklist progress is stored under (defaults to the
+                normalized name and start date)
+
+        Returns:
+            The new session
+        """
+        return OnboardingSession(name=name, role=role, start_date=start_date or get_current_date(),
+                                 hire_id=hire_id or "")
+
+    async def handle_command(self, session: OnboardingSession, user_input: str,
+                             on_token: Optional[TokenCallback] = None) -> str:
+        """
+        Run one REPL command for a session.
+
+        Args:
+            session: The hire's session
+            user_input: Command line as typed by the user
+            on_token: Receives streamed answer text for "ask" (optional)
+
+        Returns:
+            The formatted output section
+        """
+        command = user_input.strip()
+        if command.lower().startswith("ask "):
+            result = await self.ask(session, command[4:].strip(), on_token)
+            return render_answer(result['answer'])
+
+        command = command.lower()
+        if command == "checklist":
+            return render_checklist(await self.checklist(session))
+        if command.startswith("done "):
+            return await self._run(self._complete_task, session, command[5:].strip())
+        if command == "resources":
+            return render_resources(session.user_context)
+        if command == "schedule":
+            return render_schedule(self.settings, session.user_context)
+        if command == "email":
+            return render_welcome_email(self.settings, session.user_context)
+        if command == "help":
+            return render_help()
+        return format_section("Error", ["Unknown command. Type 'help' for options."], COLORS["warning"])
+
+    async def checklist(self, session: OnboardingSession) -> List[Dict[str, Any]]:
+        """
+        The session's checklist items, enrolling the hire on first use.
+
+        Args:
+            session: The hire's session
+
+        Returns:
+            Dicts with task, status, due_date and completed_at in template order
+        """
+        return await self._run(self._checklist, session)
+
+    async def _run(self, function, *args):
+        """Run blocking work (SQLite) on the retrieval pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _checklist(self, session: OnboardingSession) -> List[Dict[str, Any]]:
+        """The session's checklist, enrolling the hire on first use."""
+        if not session.enrolled:
+            # Returning hires keep their progress; new tasks in the template are added
+            self.progress.enroll(session.hire_id, session.name, session.role, session.start_date,
+                                 self.settings['checklists']['default'])
+            session.enrolled = True
+        return self.progress.checklist(session.hire_id)
+
+    def _complete_task(self, session: OnboardingSession, number: str) -> str:
+        """Mark the numbered checklist task complete and render the result."""
+        checklist = self._checklist(session)
+        if not number.isdigit() or not 1 <= int(number) <= len(checklist):
+            return format_section("Error", [f"Choose a task number between 1 and {len(checklist)}."], COLORS["warning"])
+
+        task = checklist[int(number) - 1]['task']
+        if not self.progress.mark_complete(session.hire_id, task):
+            return format_section("Checklist", [f"'{task}' is already complete."], COLORS["border"])
+        return render_checklist(self.progress.checklist(session.hire_id))
+
+    async def ask(self, session: OnboardingSession, question: str,
+                  on_token: Optional[TokenCallback] = None) -> Dict[str, Any]:
+        """
+        Answer a question using RAG without blocking the event loop.
+
+        Args:
+            session: The hire's session; the exchange is appended to its history
+            question: User's question
+            on_token: Callback (plain function or coroutine) receiving streamed answer text;
+                enables streaming (optional)
+
+        Returns:
+            Dictionary with the answer and its source (llm, answer_cache or semantic_cache)
+        """
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        request = await loop.run_in_executor(self._executor, self.pipeline.prepare, question)
+
+        first_token = None
+        if "answer" in request:
+            result = request
+        else:
+            # Query LLM through the shared gateway
+            llm_started = time.perf_counter()
+
+            async def relay(token: str):
+                nonlocal first_token
+                if first_token is None:
+                    first_token = time.perf_counter()
+                delivered = on_token(token)
+                if inspect.isawaitable(delivered):
+                    await delivered
+
+            answer = await self.llm.complete(request['messages'], relay if on_token is not None else None)
+
+            # Cache writes touch SQLite, so they stay off the loop as well
+            result = await loop.run_in_executor(
+                self._executor, self.pipeline.record, request, answer, time.perf_counter() - llm_started
+            )
+
+        total_seconds = time.perf_counter() - started
+        self.pipeline.observe(result['source'], total_seconds, (first_token - started) if first_token else None)
+        session.interaction_history.append({
+            "question": question,
+            "answer": result['answer'],
+            "source": result['source'],
+            "ttft_seconds": (first_token - started) if first_token else total_seconds,
+            "total_seconds": total_seconds,
+            **{key: result.get(key, 0) for key in PROMPT_USAGE_FIELDS}
+        })
+        return result
+
+    async def close(self):
+        """Release the LLM client, the retrieval pool and the progress store."""
+        await self.llm.close()
+        self._executor.shutdown(wait=True)
+        self.progress.close()
@@ -0,0 +1,291 @@
+"""
+Batch onboarding pack generation for the AI Onboarding System.
+
+Renders the welcome email, schedule and resource list for every hire in a
+CSV or JSONL file, the same sections the agent shows interactively. Input is
+streamed in chunks, and chunks are rendered on a process pool with a bounded
+number in flight. Packs are written in input order, so memory stays flat no
+matter how many hires the file contains.
+"""
+
+import os
+import re
+import sys
+import csv
+import json
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, Iterator, List, Tuple
+
+from src.constants import COLORS
+from src.scheduler import CohortScheduler
+from src.utils import format_section, get_current_date, load_config, load_settings, strip_colors
+from src.views import render_resources, render_schedule, render_welcome_email
+
+PACK_SECTIONS = ("email", "schedule", "resources")
+HIRE_FIELDS = ("name", "role", "start_date", "hire_id")
+MAX_REPORTED_ERRORS = 10
+OUTPUT_FORMATS = ("text", "json")
+
+
+def read_hires(path: str) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Stream hires from a CSV (with a header row) or JSONL file.
+
+    Args:
+        path: Input file; "-" reads JSONL from stdin
+
+    Yields:
+        Tuples of (line number, row); rows that are not valid JSON objects are yielded as errors
+    """
+    if path == "-":
+        yield from _read_jsonl(sys.stdin)
+        return
+
+    with open(path, 'r', newline='', encoding='utf-8') as f:
+        if path.lower().endswith(".csv"):
+            reader = csv.DictReader(f)
+            reader.fieldnames = [name.strip().lower() for name in reader.fieldnames or []]
+            for row in reader:
+                yield reader.line_num, row
+        else:
+            yield from _read_jsonl(f)
+
+
+def _read_jsonl(lines) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Parse one JSON object per line, skipping blank lines."""
+    for line_number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            row = {"error": f"Invalid JSON: {e}"}
+        if not isinstance(row, dict):
+            row = {"error": "Expected a JSON object"}
+        yield line_number, _check_fields(row)
+
+
+def _check_fields(row: Dict[str, Any]) -> Dict[str, Any]:
+    """Read numeric hire fields (such as a numeric hire_id) as text; reject other non-string values."""
+    for field in HIRE_FIELDS:
+        value = row.get(field)
+        if isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))):
+            return {"error": f"'{field}' must be a string"}
+        if isinstance(value, (int, float)):
+            row = {**row, field: str(value)}
+    return row
+
+
+def render_pack(line_number: int, row: Dict[str, Any], sections: Tuple[str, ...]) -> Dict[str, Any]:
+    """
+    Render the requested sections for one hire.
+
+    Args:
+        line_number: Position of the hire in the input, for error reports
+        row: The hire's name, role and optionally start_date and hire_id
+        sections: Sections to render, from PACK_SECTIONS
+
+    Returns:
+        Dictionary with the hire's details and the rendered sections, or with an error
+    """
+    if "error" in row:
+        return {"line": line_number, "error": row["error"]}
+
+    name = (row.get('name') or "").strip()
+    role = (row.get('role') or "").strip()
+    if not name or not role:
+        return {"line": line_number, "error": "Both 'name' and 'role' are required"}
+
+    start_date = (row.get('start_date') or "").strip() or get_current_date()
+    try:
+        date.fromisoformat(start_date)
+    except ValueError:
+        return {"line": line_number, "error": f"Invalid start_date '{start_date}' (expected YYYY-MM-DD)"}
+
+    settings = load_settings()
+    user_context = {"name": name, "role": role, "start_date": start_date}
+    placement = row.get('_placement')
+    renderers = {
+        "email": lambda: render_welcome_email(settings, user_context),
+        "schedule": lambda: render_schedule(settings, user_context, placement and placement.sessions,
+                                            placement and placement.waitlisted),
+        "resources": lambda: render_resources(user_context),
+    }
+    pack = {
+        "line": line_number,
+        "hire_id": (row.get('hire_id') or "").strip() or None,
+        **user_context,
+        "sections": {section: strip_colors(renderers[section]()) for section in sections}
+    }
+    if placement is not None:
+        pack["sessions"] = [session.to_dict(start_date) for session in placement.sessions]
+        pack["waitlisted"] = placement.waitlisted
+    return pack
+
+
+def _with_placements(hires: Iterator[Tuple[int, Dict[str, Any]]],
+                     template: Dict[str, Any]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Seat each hire in the schedule of their cohort (hires sharing a start date), in input order.
+
+    Placement is sequential because every hire changes the remaining capacity, so
+    it runs here while the input streams; the workers only render.
+    """
+    schedulers = {}
+    for line_number, row in hires:
+        role = (row.get('role') or "").strip()
+        start_date = (row.get('start_date') or "").strip() or get_current_date()
+        if "error" not in row and role and (row.get('name') or "").strip():
+            if start_date not in schedulers:
+                schedulers[start_date] = CohortScheduler(template)
+            row = {**row, "_placement": schedulers[start_date].assign(role)}
+        yield line_number, row
+
+
+def _render_chunk(chunk: List[Tuple[int, Dict[str, Any]]], sections: Tuple[str, ...]) -> List[Dict[str, Any]]:
+    """Render a chunk of hires; module-level so it can run in a worker process."""
+    return [render_pack(line_number, row, sections) for line_number, row in chunk]
+
+
+def _iter_rendered(hires: Iterator[Tuple[int, Dict[str, Any]]], sections: Tuple[str, ...],
+                   workers: int, chunk_size: int) -> Iterator[Dict[str, Any]]:
+    """
+    Render hires in input order, keeping at most 2 * workers chunks in flight.
+
+    Args:
+        hires: Stream of (line number, row)
+        sections: Sections to render
+        workers: Number of worker processes (1 renders in this process)
+        chunk_size: Hires per task sent to a worker
+
+    Yields:
+        Rendered packs
+    """
+    chunks = iter(lambda: list(islice(hires, chunk_size)), [])
+    if workers <= 1:
+        for chunk in chunks:
+            yield from _render_chunk(chunk, sections)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        in_flight = deque()
+        for chunk in chunks:
+            in_flight.append(pool.submit(_render_chunk, chunk, sections))
+            if len(in_flight) >= workers * 2:
+                yield from in_flight.popleft().result()
+        while in_flight:
+            yield from in_flight.popleft().result()
+
+
+def _text_file_name(pack: Dict[str, Any]) -> str:
+    """File name for a hire's pack; the line number keeps names unique."""
+    slug = re.sub(r"[^a-z0-9]+", "-", (pack['hire_id'] or pack['name']).lower()).strip("-")
+    return f"{pack['line']:06d}-{slug or 'hire'}.txt"
+
+
+def generate_packs(input_path: str, output_path: str, output_format: str = "text",
+                   sections: Tuple[str, ...] = PACK_SECTIONS, workers: int = None,
+                   chunk_size: int = None) -> Dict[str, Any]:
+    """
+    Generate onboarding packs for every hire in a file.
+
+    Args:
+        input_path: CSV or JSONL file of hires ("-" for JSONL on stdin)
+        output_path: Directory for text output (one file per hire), or the JSONL
+            file for json output ("-" for stdout)
+        output_format: "text" or "json"
+        sections: Sections to render, from PACK_SECTIONS
+        workers: Worker processes (defaults to batch.workers, 0 meaning one per CPU)
+        chunk_size: Hires per worker task (defaults to batch.chunk_size)
+
+    Returns:
+        Dictionary with hires, packs, errors, the first few errors (error_samples), hires
+        waitlisted for at least one session, elapsed_seconds and hires_per_sec
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format '{output_format}'. Available: {', '.join(OUTPUT_FORMATS)}")
+    unknown = [section for section in sections if section not in PACK_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown sections {unknown}. Available: {', '.join(PACK_SECTIONS)}")
+
+    batch_config = load_config().get('batch', {})
+    workers = workers if workers is not None else batch_config.get('workers', 0)
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or batch_config.get('chunk_size', 200)
+
+    if output_format == "text":
+        os.makedirs(output_path, exist_ok=True)
+        out = None
+    else:
+        out = sys.stdout if output_path == "-" else open(output_path, 'w', encoding='utf-8')
+
+    hires = read_hires(input_path)
+    if "schedule" in sections:
+        hires = _with_placements(hires, load_settings()['schedules']['default'])
+
+    stats = {"hires": 0, "packs": 0, "errors": 0, "error_samples": [], "waitlisted": 0}
+    started = time.perf_counter()
+    try:
+        for pack in _iter_rendered(hires, tuple(sections), workers, chunk_size):
+            stats["hires"] += 1
+            if "error" in pack:
+                stats["errors"] += 1
+                if len(stats["error_samples"]) < MAX_REPORTED_ERRORS:
+                    stats["error_samples"].append(pack)
+                continue
+
+            if pack.get("waitlisted"):
+                stats["waitlisted"] += 1
+            if out is not None:
+                out.write(json.dumps(pack, ensure_ascii=False) + "\n")
+            else:
+                with open(os.path.join(output_path, _text_file_name(pack)), 'w', encoding='utf-8') as f:
+                    f.write("\n\n".join(pack["sections"][section] for section in sections) + "\n")
+            stats["packs"] += 1
+    finally:
+        if out is not None and out is not sys.stdout:
+            out.close()
+
+    elapsed = time.perf_counter() - started
+    stats["elapsed_seconds"] = elapsed
+    stats["hires_per_sec"] = stats["hires"] / elapsed if elapsed else 0.0
+    return stats
+
+
+def run_batch(input_path: str, output_path: str, output_format: str = "text", sections: str = None,
+              workers: int = None) -> int:
+    """
+    Generate packs from the command line and print a summary.
+
+    Args:
+        input_path: CSV or JSONL file of hires
+        output_path: Output directory (text) or JSONL file (json)
+        output_format: "text" or "json"
+        sections: Comma-separated sections (defaults to all)
+        workers: Worker processes (defaults to batch.workers)
+
+    Returns:
+        Process exit code: 0, or 1 if any hire failed
+    """
+    selected = tuple(s.strip() for s in sections.split(",")) if sections else PACK_SECTIONS
+    stats = generate_packs(input_path, output_path, output_format, selected, workers)
+
+    # Keep stdout clean when the packs themselves go there
+    report = sys.stderr if output_path == "-" else sys.stdout
+    summary = [
+        f"{COLORS['success']}Packs written: {stats['packs']}/{stats['hires']}",
+        f"{COLORS['text']}Throughput: {stats['hires_per_sec']:.0f} hires/s ({stats['elapsed_seconds']:.2f}s)",
+        f"{COLORS['text']}Output: {output_path}",
+    ]
+    if stats["waitlisted"]:
+        summary.append(f"{COLORS['warning']}Hires waitlisted for at least one session: {stats['waitlisted']}")
+    for error in stats["error_samples"]:
+        summary.append(f"{COLORS['warning']}Line {error['line']}: {error['error']}")
+    if stats["errors"] > len(stats["error_samples"]):
+        summary.append(f"{COLORS['warning']}... and {stats['errors'] - len(stats['error_samples'])} more errors")
+    print(format_section("Onboarding Packs", summary, COLORS["border"]), file=report)
+    return 1 if stats["errors"] else 0
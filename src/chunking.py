@@ -0,0 +1,279 @@
+"""
+Document chunking for the AI Onboarding System.
+
+Pages are split into sentences and the sentences are grouped into chunks.
+The "tokens" strategy packs whole sentences up to chunking.max_tokens, repeats
+up to chunking.overlap_tokens of trailing sentences at the start of the next
+chunk and cuts sentences longer than the budget into word windows. The
+"sentences" strategy keeps the original fixed number of sentences per chunk.
+
+Sentences are split by a regex splitter ("fast") or by NLTK punkt ("punkt"),
+which is slower but kept for text the regex splits poorly. Tokens are counted
+with a Hugging Face tokenizer.json when chunking.tokenizer_path is set, and
+otherwise estimated as words plus punctuation marks.
+"""
+
+import re
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.constants import DEFAULT_CHUNK_SIZE
+
+CHUNK_STRATEGIES = ("tokens", "sentences")
+SENTENCE_SPLITTERS = ("fast", "punkt")
+
+DEFAULT_MAX_TOKENS = 200
+DEFAULT_OVERLAP_TOKENS = 32
+
+# Sentence end: terminal punctuation (plus closing quotes/brackets) followed by whitespace and a
+# capital, digit or opening quote; or a blank line
+_SENTENCE_BOUNDARY = re.compile(r"[.!?]+[\"')\]]*\s+(?=[\"'(\[]?[A-Z0-9])|\n[ \t]*\n\s*")
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+# Words whose trailing period does not end a sentence
+ABBREVIATIONS = frozenset({
+    "mr.", "mrs.", "ms.", "dr.", "prof.", "sr.", "jr.", "st.", "vs.", "etc.", "e.g.", "i.e.", "no.", "approx.",
+    "dept.", "inc.", "ltd.", "co.", "corp.", "jan.", "feb.", "mar.", "apr.", "jun.", "jul.", "aug.", "sep.",
+    "sept.", "oct.", "nov.", "dec.", "fig.", "min.", "max.", "est.", "u.s.", "a.m.", "p.m."
+})
+
+
+def split_sentences_fast(text: str) -> List[str]:
+    """
+    Split text into sentences with a regex, skipping common abbreviations and initials.
+
+    Args:
+        text: Text to split
+
+    Returns:
+        Sentences with surrounding whitespace removed
+    """
+    sentences, start = [], 0
+    for match in _SENTENCE_BOUNDARY.finditer(text):
+        end = match.start()
+        if text[end] == ".":
+            # Abbreviations are short, so only the last few characters need looking at
+            words = text[max(start, end - 12):end + 1].split()
+            word = words[-1].lower() if words else ""
+            if word in ABBREVIATIONS or (len(word) == 2 and word[0].isalpha()):
+                continue
+        sentence = text[start:match.end()].strip()
+        if sentence:
+            sentences.append(sentence)
+        start = match.end()
+    tail = text[start:].strip()
+    if tail:
+        sentences.append(tail)
+    return sentences
+
+
+def split_sentences_punkt(text: str) -> List[str]:
+    """Split text into sentences with NLTK punkt."""
+    from nltk.tokenize import sent_tokenize
+    return sent_tokenize(text)
+
+
+class Chunker:
+    """Groups a document's sentences into chunks under a token budget (or a fixed sentence count)."""
+
+    def __init__(self, strategy: str = "tokens", max_tokens: int = DEFAULT_MAX_TOKENS,
+                 overlap_tokens: int = DEFAULT_OVERLAP_TOKENS, sentences_per_chunk: int = DEFAULT_CHUNK_SIZE,
+                 splitter: str = "fast", tokenizer_path: str = ""):
+        """
+        Args:
+            strategy: "tokens" or "sentences"
+            max_tokens: Token budget per chunk ("tokens" strategy)
+            overlap_tokens: Tokens of trailing sentences repeated in the next chunk ("tokens" strategy)
+            sentences_per_chunk: Sentences per chunk ("sentences" strategy)
+            splitter: "fast" or "punkt"
+            tokenizer_path: tokenizer.json used to count tokens; empty to estimate them
+        """
+        if strategy not in CHUNK_STRATEGIES:
+            raise ValueError(f"Unknown chunking strategy '{strategy}'. Choose one of: {', '.join(CHUNK_STRATEGIES)}")
+        if splitter not in SENTENCE_SPLITTERS:
+            raise ValueError(f"Unknown sentence splitter '{splitter}'. Choose one of: {', '.join(SENTENCE_SPLITTERS)}")
+        if strategy == "tokens" and not 0 <= overlap_tokens < max_tokens:
+            raise ValueError("chunking.overlap_tokens must be at least 0 and below chunking.max_tokens")
+
+        self.strategy = strategy
+        self.max_tokens = max_tokens
+        self.overlap_tokens = overlap_tokens
+        self.sentences_per_chunk = sentences_per_chunk
+        self.splitter = splitter
+        self.tokenizer_path = tokenizer_path
+        self._tokenizer = None
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "Chunker":
+        """Build the chunker described by the chunking section of config.json."""
+        chunking = config.get('chunking', {})
+        return cls(
+            strategy=chunking.get('strategy', 'tokens'),
+            max_tokens=chunking.get('max_tokens', DEFAULT_MAX_TOKENS),
+            overlap_tokens=chunking.get('overlap_tokens', DEFAULT_OVERLAP_TOKENS),
+            sentences_per_chunk=chunking.get('sentences_per_chunk', DEFAULT_CHUNK_SIZE),
+            splitter=chunking.get('splitter', 'fast'),
+            tokenizer_path=chunking.get('tokenizer_path', '')
+        )
+
+    def __getstate__(self):
+        # Chunkers are sent to ingestion worker processes; each loads its own tokenizer
+        state = dict(self.__dict__)
+        state['_tokenizer'] = None
+        return state
+
+    @property
+    def signature(self) -> str:
+        """Identifies the chunking parameters; chunks made with another signature are re-made on ingestion."""
+        if self.strategy == "sentences":
+            return f"sentences:{self.sentences_per_chunk}:{self.splitter}"
+        counter = self.tokenizer_path or "estimate"
+        return f"tokens:{self.max_tokens}:{self.overlap_tokens}:{self.splitter}:{counter}"
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """Chunking parameters stored with every chunk."""
+        if self.strategy == "sentences":
+            return {"chunk_strategy": "sentences", "chunk_sentences": self.sentences_per_chunk,
+                    "sentence_splitter": self.splitter}
+        return {"chunk_strategy": "tokens", "chunk_max_tokens": self.max_tokens,
+                "chunk_overlap_tokens": self.overlap_tokens, "sentence_splitter": self.splitter}
+
+    def split_sentences(self, text: str) -> List[str]:
+        """Split text with the configured splitter."""
+        if self.splitter == "punkt":
+            return split_sentences_punkt(text)
+        return split_sentences_fast(text)
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Token counts of several texts."""
+        if not self.tokenizer_path:
+            return [len(_TOKEN_PATTERN.findall(text)) for text in texts]
+        if self._tokenizer is None:
+            from tokenizers import Tokenizer
+            self._tokenizer = Tokenizer.from_file(self.tokenizer_path)
+            self._tokenizer.no_truncation()
+            self._tokenizer.no_padding()
+        return [len(encoding.ids) for encoding in self._tokenizer.encode_batch(texts, add_special_tokens=False)]
+
+    def iter_chunks(self, pages: Iterator[Tuple[int, str]],
+                    timings: Optional[Dict[str, float]] = None) -> Iterator[Tuple[str, int, int, int]]:
+        """
+        Chunk a document streamed page by page.
+
+        Args:
+            pages: (page number, page text) pairs
+            timings: When given, sentence splitting and token counting seconds are added to
+                timings["tokenization"] (optional)
+
+        Yields:
+            Tuples of (chunk text, first page, last page, tokens)
+        """
+        sentences = self._iter_sentences(pages, timings)
+        if self.strategy == "sentences":
+            yield from self._group_by_count(sentences)
+        else:
+            yield from self._pack_by_tokens(sentences)
+
+    def _iter_sentences(self, pages: Iterator[Tuple[int, str]],
+                        timings: Optional[Dict[str, float]]) -> Iterator[Tuple[str, int, int, int]]:
+        """
+        Split pages into (sentence, first page, last page, tokens).
+
+        The last sentence of each page is carried over, since it may continue on the next page.
+        A carry longer than max_tokens is emitted as a sentence of its own instead, so pages
+        without sentence boundaries (tables, forms, slides) do not pile up into one ever
+        longer text that is split again on every page.
+        """
+        carry_text, carry_page, page_number = "", None, None
+        for page_number, page_text in pages:
+            started = time.perf_counter()
+            text = f"{carry_text} {page_text}" if carry_text else page_text
+            first_page = carry_page or page_number
+            sentences = self.split_sentences(text)
+            counts = self.count_tokens(sentences[:-1])
+            # A token is at least one character, so short texts need no counting
+            last_tokens = None
+            if sentences and len(sentences[-1]) > self.max_tokens:
+                last_tokens = self.count_tokens(sentences[-1:])[0]
+            if timings is not None:
+                timings["tokenization"] = timings.get("tokenization", 0.0) + time.perf_counter() - started
+            if not sentences:
+                continue
+
+            *complete, last = sentences
+            for i, (sentence, tokens) in enumerate(zip(complete, counts)):
+                yield sentence, first_page if i == 0 else page_number, page_number, tokens
+            last_start = page_number if complete else first_page
+            if last_tokens is not None and last_tokens > self.max_tokens:
+                yield last, last_start, page_number, last_tokens
+                carry_text, carry_page = "", None
+            else:
+                carry_text, carry_page = last, last_start
+
+        if carry_text:
+            yield carry_text, carry_page, page_number, self.count_tokens([carry_text])[0]
+
+    def _group_by_count(self, sentences: Iterator[Tuple[str, int, int, int]]) -> Iterator[Tuple[str, int, int, int]]:
+        """Fixed number of sentences per chunk."""
+        group = []
+        for sentence in sentences:
+            group.append(sentence)
+            if len(group) == self.sentences_per_chunk:
+                yield _join(group)
+                group = []
+        if group:
+            yield _join(group)
+
+    def _pack_by_tokens(self, sentences: Iterator[Tuple[str, int, int, int]]) -> Iterator[Tuple[str, int, int, int]]:
+        """Greedily pack whole sentences under the token budget, with overlap between chunks."""
+        window: List[Tuple[str, int, int, int]] = []
+        window_tokens, fresh = 0, 0  # fresh: sentences in the window not yet emitted in a chunk
+        for sentence in self._bounded(sentences):
+            tokens = sentence[3]
+            if window and window_tokens + tokens > self.max_tokens:
+                if fresh:
+                    yield _join(window)
+                window, window_tokens = self._overlap(window)
+                # The overlap gives way when the next sentence would not fit beside it
+                while window and window_tokens + tokens > self.max_tokens:
+                    window_tokens -= window.pop(0)[3]
+                fresh = 0
+            window.append(sentence)
+            window_tokens += tokens
+            fresh += 1
+        if fresh:
+            yield _join(window)
+
+    def _overlap(self, window: List[Tuple[str, int, int, int]]) -> Tuple[List[Tuple[str, int, int, int]], int]:
+        """Trailing sentences of a chunk that fit in the overlap budget."""
+        tail, tokens = [], 0
+        for sentence in reversed(window):
+            if tokens + sentence[3] > self.overlap_tokens:
+                break
+            tail.insert(0, sentence)
+            tokens += sentence[3]
+        return tail, tokens
+
+    def _bounded(self, sentences: Iterator[Tuple[str, int, int, int]]) -> Iterator[Tuple[str, int, int, int]]:
+        """Cut sentences over the token budget into word windows that fit it."""
+        for sentence in sentences:
+            text, first_page, last_page, tokens = sentence
+            if tokens <= self.max_tokens:
+                yield sentence
+                continue
+            words = text.split()
+            piece, piece_tokens = [], 0
+            for word, word_tokens in zip(words, self.count_tokens(words)):
+                if piece and piece_tokens + word_tokens > self.max_tokens:
+                    yield " ".join(piece), first_page, last_page, piece_tokens
+                    piece, piece_tokens = [], 0
+                piece.append(word)
+                piece_tokens += word_tokens
+            if piece:
+                yield " ".join(piece), first_page, last_page, piece_tokens
+
+
+def _join(group: List[Tuple[str, int, int, int]]) -> Tuple[str, int, int, int]:
+    """Chunk text, first page, last page and tokens of a group of sentences."""
+    return ' '.join(sentence for sentence, _, _, _ in group), group[0][1], group[-1][2], sum(s[3] for s in group)
@@ -0,0 +1,220 @@
+"""
+Configuration service for the AI Onboarding System.
+
+config.json and settings.yaml are parsed once per change instead of on every
+call. Readers get immutable snapshots, which can be shared freely between
+sessions and threads. A file is re-parsed only when its mtime or size changes,
+and subscribers are notified so edits apply without a restart.
+"""
+
+import os
+import json
+import time
+import yaml
+import weakref
+import threading
+from typing import Any, Callable, List, Optional, Tuple
+
+CONFIG_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config')
+
+
+class FrozenDict(dict):
+    """Read-only dict; still a dict, so it serializes to JSON and passes isinstance checks."""
+
+    def _readonly(self, *args, **kwargs):
+        raise TypeError("Configuration snapshots are read-only; use thaw() for a mutable copy")
+
+    __setitem__ = __delitem__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __reduce__(self):
+        """Pickle and deepcopy without going through __setitem__."""
+        return FrozenDict, (dict(self),)
+
+
+def freeze(value: Any) -> Any:
+    """Recursively convert dicts to FrozenDict and lists to tuples."""
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Recursively convert a snapshot back into plain, mutable dicts and lists."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(item) for item in value]
+    return value
+
+
+class _WatchedFile:
+    """A parsed file and the stat signature it was parsed from."""
+
+    def __init__(self, path: str, parse: Callable[[Any], Any]):
+        self.path = path
+        self.parse = parse
+        self.signature = None
+        self.snapshot = None
+
+    def stat_signature(self) -> Optional[Tuple[int, int]]:
+        """(mtime_ns, size) of the file, or None if it is missing."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def refresh(self) -> bool:
+        """Re-parse the file if it changed; returns whether the snapshot was replaced."""
+        signature = self.stat_signature()
+        if signature == self.signature and self.snapshot is not None:
+            return False
+
+        with open(self.path, 'r') as f:
+            snapshot = freeze(self.parse(f))
+        self.signature = signature
+        self.snapshot = snapshot
+        return True
+
+
+class ConfigService:
+    """Cached, hot-reloadable view of config.json and settings.yaml."""
+
+    def __init__(self, config_path: str = None, settings_path: str = None, check_interval: float = 1.0):
+        """
+        Parse both files.
+
+        Args:
+            config_path: Path of config.json (defaults to config/config.json)
+            settings_path: Path of settings.yaml (defaults to config/settings.yaml)
+            check_interval: Minimum seconds between mtime checks on access
+        """
+        self._config = _WatchedFile(config_path or os.path.join(CONFIG_DIR, 'config.json'), json.load)
+        self._settings = _WatchedFile(settings_path or os.path.join(CONFIG_DIR, 'settings.yaml'), yaml.safe_load)
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._subscribers: List[Callable[[], Optional[Callable]]] = []
+        self._last_check = 0.0
+        self._watcher = None
+        self._stop_watching = threading.Event()
+
+        self._config.refresh()
+        self._settings.refresh()
+        self._last_check = time.monotonic()
+
+    @property
+    def config(self) -> FrozenDict:
+        """Current config.json snapshot."""
+        self._maybe_reload()
+        return self._config.snapshot
+
+    @property
+    def settings(self) -> FrozenDict:
+        """Current settings.yaml snapshot."""
+        self._maybe_reload()
+        return self._settings.snapshot
+
+    def subscribe(self, callback: Callable[[FrozenDict, FrozenDict], None]) -> None:
+        """
+        Call back with (config, settings) whenever either file is reloaded.
+
+        Bound methods are held weakly, so subscribing does not keep an agent or
+        database alive.
+
+        Args:
+            callback: Function receiving the new snapshots
+        """
+        if hasattr(callback, "__self__"):
+            reference = weakref.WeakMethod(callback)
+        else:
+            reference = lambda: callback
+        with self._lock:
+            self._subscribers.append(reference)
+
+    def reload_if_changed(self) -> bool:
+        """
+        Re-parse whichever files changed on disk and notify subscribers.
+
+        A file that fails to parse (e.g. saved mid-edit) keeps its previous
+        snapshot and is retried on its next change. A subscriber that raises is
+        reported and skipped; the others are still notified.
+
+        Returns:
+            Whether anything was reloaded
+        """
+        with self._lock:
+            self._last_check = time.monotonic()
+            changed = False
+            for watched in (self._config, self._settings):
+                try:
+                    changed |= watched.refresh()
+                except (OSError, ValueError, yaml.YAMLError) as e:
+                    watched.signature = watched.stat_signature()
+                    _warn(f"Keeping previous {os.path.basename(watched.path)}: {e}")
+            if not changed:
+                return False
+
+            config, settings = self._config.snapshot, self._settings.snapshot
+            callbacks = []
+            for reference in list(self._subscribers):
+                callback = reference()
+                if callback is None:
+                    self._subscribers.remove(reference)
+                else:
+                    callbacks.append(callback)
+
+        # A subscriber that rejects the new config must not fail the caller that happened to
+        # trigger the reload, or keep the remaining subscribers from seeing it
+        for callback in callbacks:
+            try:
+                callback(config, settings)
+            except Exception as e:
+                _warn(f"Config reload handler {getattr(callback, '__qualname__', callback)} failed: {e}")
+        return True
+
+    def start_watching(self, interval: float = None) -> None:
+        """Poll for changes on a background thread, so reloads happen even when nobody reads."""
+        if self._watcher is not None:
+            return
+        interval = interval or self.check_interval
+        stop = self._stop_watching = threading.Event()
+
+        def watch():
+            while not stop.wait(interval):
+                self.reload_if_changed()
+
+        self._watcher = threading.Thread(target=watch, name="config-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watching(self) -> None:
+        """Stop the background poller."""
+        self._stop_watching.set()
+        self._watcher = None
+
+    def _maybe_reload(self) -> None:
+        """Check mtimes at most once per check_interval."""
+        if time.monotonic() - self._last_check >= self.check_interval:
+            self.reload_if_changed()
+
+
+def _warn(message: str) -> None:
+    """Print a warning about a config reload."""
+    from src.constants import COLORS
+    print(f"{COLORS['warning']}{message}")
+
+
+_service = None
+_service_lock = threading.Lock()
+
+
+def get_config_service() -> ConfigService:
+    """Process-wide configuration service."""
+    global _service
+    if _service is None:
+        with _service_lock:
+            if _service is None:
+                _service = ConfigService()
+    return _service
@@ -24,6 +24,7 @@ COLORS = {
 COMMANDS = {
     "ask": "Get policy answers",
     "checklist": "View progress",
+    "done": "Mark a checklist task complete (done <number>)",
     "resources": "Learning materials",
     "schedule": "Training timeline",
     "email": "Generate welcome email",
@@ -32,4 +33,7 @@ COMMANDS = {
 }
 
 # Chunk size for document processing
-DEFAULT_CHUNK_SIZE = 3
\ No newline at end of file
+DEFAULT_CHUNK_SIZE = 3
+
+# File extensions picked up by bulk directory ingestion
+INGEST_EXTENSIONS = (".pdf", ".txt", ".md")
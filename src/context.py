@@ -0,0 +1,94 @@
+"""
+Prompt context packing for the AI Onboarding System.
+
+Retrieved chunks overlap (neighbouring chunks repeat their boundary
+sentences) and vary in length, so joining them as they are wastes prompt
+tokens. The context builder takes chunks in their retrieved order, drops
+sentences already in the context and adds whole sentences while they fit
+under rag.context.max_tokens.
+"""
+
+from typing import Any, Dict, List
+
+from src.chunking import Chunker
+
+DEFAULT_CONTEXT_TOKENS = 1024
+
+
+class ContextBuilder:
+    """Packs retrieved chunks into the LLM prompt context under a token budget."""
+
+    def __init__(self, max_tokens: int = DEFAULT_CONTEXT_TOKENS, chunker: Chunker = None):
+        """
+        Args:
+            max_tokens: Token budget of the context
+            chunker: Splits chunks into sentences and counts tokens the way ingestion did
+                (default: Chunker())
+        """
+        if max_tokens <= 0:
+            raise ValueError("rag.context.max_tokens must be positive")
+        self.max_tokens = max_tokens
+        self.chunker = chunker or Chunker()
+
+    @classmethod
+    def from_config(cls, config: Dict[str, Any]) -> "ContextBuilder":
+        """Build the context builder described by rag.context and chunking in config.json."""
+        context = config['rag'].get('context', {})
+        return cls(context.get('max_tokens', DEFAULT_CONTEXT_TOKENS), Chunker.from_config(config))
+
+    @property
+    def signature(self) -> str:
+        """Identifies the packing parameters; the same chunks packed under the same signature give the same context."""
+        counter = self.chunker.tokenizer_path or "estimate"
+        return f"{self.max_tokens}:{self.chunker.splitter}:{counter}"
+
+    def count_tokens(self, texts: List[str]) -> List[int]:
+        """Token counts of several texts."""
+        return self.chunker.count_tokens(texts)
+
+    def build(self, results: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Pack query_documents results into a context.
+
+        Args:
+            results: Query results for a single query, best first
+
+        Returns:
+            Dictionary with the context "text", the "ids" of the chunks it uses, its "tokens",
+            the "retrieved_tokens" of all retrieved chunks and the number of "duplicate_sentences"
+            and "dropped_sentences" (over budget) left out
+        """
+        documents = results['documents'][0] if results.get('documents') else []
+        ids = results['ids'][0] if results.get('ids') else [None] * len(documents)
+
+        parts, used_ids, seen = [], [], set()
+        tokens = retrieved_tokens = duplicates = dropped = 0
+        for index in range(len(documents)):
+            sentences = self.chunker.split_sentences(documents[index])
+            counts = self.count_tokens(sentences)
+            retrieved_tokens += sum(counts)
+
+            kept = []
+            for sentence, count in zip(sentences, counts):
+                key = " ".join(sentence.lower().split())
+                if key in seen:
+                    duplicates += 1
+                elif tokens + count > self.max_tokens:
+                    # A shorter sentence further on may still fit
+                    dropped += 1
+                else:
+                    seen.add(key)
+                    kept.append(sentence)
+                    tokens += count
+            if kept:
+                parts.append(" ".join(kept))
+                used_ids.append(ids[index])
+
+        return {
+            "text": "\n".join(parts),
+            "ids": used_ids,
+            "tokens": tokens,
+            "retrieved_tokens": retrieved_tokens,
+            "duplicate_sentences": duplicates,
+            "dropped_sentences": dropped
+        }
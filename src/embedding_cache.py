@@ -0,0 +1,277 @@
+"""
+Persistent embedding cache for the AI Onboarding System.
+
+Vectors live in a fixed-capacity memory-mapped float32 array on disk, while a small
+SQLite index maps (model name, normalized text hash) keys to array slots and keeps
+the last-use time needed for LRU eviction.
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from contextlib import contextmanager
+import numpy as np
+from chromadb.api.types import EmbeddingFunction
+from typing import Dict, List, Sequence
+
+# SQLite caps the number of bound parameters per statement
+_SQL_BATCH = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize unicode and collapse whitespace so trivially different texts share a key."""
+    return " ".join(unicodedata.normalize("NFKC", text).split())
+
+
+def cache_key(namespace: str, text: str) -> str:
+    """
+    Build the cache key for a text embedded by a given model.
+
+    Args:
+        namespace: Model identifier the embedding belongs to
+        text: Raw text
+
+    Returns:
+        Hex key
+    """
+    return hashlib.sha256(f"{namespace}\x00{normalize_text(text)}".encode("utf-8")).hexdigest()[:32]
+
+
+class EmbeddingCache:
+    """
+    On-disk embedding store with a size cap and LRU eviction.
+
+    Several processes may share one cache directory. Writers hold an exclusive SQLite
+    transaction while they choose slots and write vectors, and readers hold a read
+    transaction while they copy vectors out, so no one sees a slot that is being reused.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        """
+        Open (or create) the cache directory.
+
+        Args:
+            path: Directory holding the vector array and its index
+            max_entries: Maximum number of cached embeddings
+        """
+        os.makedirs(path, exist_ok=True)
+        self.max_entries = max_entries
+        self._vectors_path = os.path.join(path, "vectors.f32")
+        self._lock = threading.Lock()
+
+        # Autocommit mode; transactions are opened explicitly with the lock level they need
+        self._conn = sqlite3.connect(os.path.join(path, "index.sqlite"), timeout=30,
+                                     isolation_level=None, check_same_thread=False)
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                slot INTEGER NOT NULL UNIQUE,
+                last_used REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_entries_last_used ON entries (last_used);
+            CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value INTEGER NOT NULL);
+        """)
+
+        self.dim = None
+        self._generation = None
+        self._vectors = None
+        with self._lock, self._transaction("EXCLUSIVE"):
+            meta = self._meta()
+            # A different capacity or a missing vector file invalidates the index; start over
+            if meta.get("dim") and (meta.get("capacity") != max_entries
+                                    or not self._vector_file_matches(meta["dim"])):
+                self._reset(meta["dim"])
+            else:
+                self._sync(meta)
+
+    def __len__(self) -> int:
+        """Number of cached embeddings."""
+        return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        """
+        Look up cached embeddings and refresh their recency.
+
+        Args:
+            keys: Cache keys to look up
+
+        Returns:
+            Mapping of found keys to their embeddings
+        """
+        if not keys:
+            return {}
+
+        with self._lock:
+            with self._transaction():
+                self._sync(self._meta())
+                if self._vectors is None:
+                    return {}
+                rows = []
+                unique_keys = list(dict.fromkeys(keys))
+                for i in range(0, len(unique_keys), _SQL_BATCH):
+                    batch = unique_keys[i:i + _SQL_BATCH]
+                    placeholders = ",".join("?" * len(batch))
+                    rows.extend(self._conn.execute(
+                        f"SELECT key, slot FROM entries WHERE key IN ({placeholders})", batch
+                    ))
+                if not rows:
+                    return {}
+                # Copied while the read transaction keeps writers from reusing these slots
+                vectors = np.array(self._vectors[[slot for _, slot in rows]])
+
+            now = time.time()
+            with self._transaction("IMMEDIATE"):
+                self._conn.executemany("UPDATE entries SET last_used = ? WHERE key = ?",
+                                       [(now, key) for key, _ in rows])
+            return {key: vectors[i] for i, (key, _) in enumerate(rows)}
+
+    def put_many(self, keys: Sequence[str], vectors: np.ndarray) -> None:
+        """
+        Store embeddings, evicting the least recently used entries when full.
+
+        Args:
+            keys: Cache keys, one per row of vectors
+            vectors: 2-D array of embeddings
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if not len(keys):
+            return
+
+        with self._lock, self._transaction("EXCLUSIVE"):
+            meta = self._meta()
+            if meta.get("dim") != vectors.shape[1]:
+                self._reset(int(vectors.shape[1]))
+            else:
+                self._sync(meta)
+
+            # Skip keys that are already present and keep at most max_entries new ones
+            existing = set()
+            for i in range(0, len(keys), _SQL_BATCH):
+                batch = list(keys[i:i + _SQL_BATCH])
+                placeholders = ",".join("?" * len(batch))
+                existing.update(key for (key,) in self._conn.execute(
+                    f"SELECT key FROM entries WHERE key IN ({placeholders})", batch
+                ))
+            new_rows = {}
+            for key, vector in zip(keys, vectors):
+                if key not in existing:
+                    new_rows[key] = vector
+            new_rows = dict(list(new_rows.items())[-self.max_entries:])
+            if not new_rows:
+                return
+
+            # Fill free slots first, then reuse the slots of the least recently used entries
+            count = len(self)
+            slots = list(range(count, min(count + len(new_rows), self.max_entries)))
+            evict = len(new_rows) - len(slots)
+            if evict > 0:
+                victims = self._conn.execute(
+                    "SELECT key, slot FROM entries ORDER BY last_used LIMIT ?", (evict,)
+                ).fetchall()
+                self._conn.executemany("DELETE FROM entries WHERE key = ?", [(key,) for key, _ in victims])
+                slots.extend(slot for _, slot in victims)
+
+            # The index is written first, so a failed insert rolls back without touching the vector file
+            now = time.time()
+            self._conn.executemany("INSERT INTO entries (key, slot, last_used) VALUES (?, ?, ?)",
+                                   [(key, slot, now) for key, slot in zip(new_rows, slots)])
+            self._vectors[slots] = np.stack(list(new_rows.values()))
+            self._vectors.flush()
+
+    @contextmanager
+    def _transaction(self, mode: str = "DEFERRED"):
+        """Run a block in a SQLite transaction (DEFERRED for reads, IMMEDIATE or EXCLUSIVE for writes)."""
+        self._conn.execute(f"BEGIN {mode}")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def _meta(self) -> Dict[str, int]:
+        """Dimension, capacity and generation stored in the index."""
+        return dict(self._conn.execute("SELECT name, value FROM meta"))
+
+    def _sync(self, meta: Dict[str, int]) -> None:
+        """Remap the vector file if another process has reset the cache since it was mapped."""
+        if meta.get("dim") != self.dim or meta.get("generation", 0) != self._generation:
+            self.dim = meta.get("dim")
+            self._generation = meta.get("generation", 0)
+            self._vectors = None
+            if self.dim:
+                self._open_vectors()
+
+    def _vector_file_matches(self, dim: int) -> bool:
+        """Check that the vector file exists with the size implied by dim and capacity."""
+        expected_size = self.max_entries * dim * np.dtype(np.float32).itemsize
+        return os.path.exists(self._vectors_path) and os.path.getsize(self._vectors_path) == expected_size
+
+    def _open_vectors(self) -> None:
+        """Map the vector file, creating it at full capacity if needed."""
+        mode = 'r+' if self._vector_file_matches(self.dim) else 'w+'
+        self._vectors = np.memmap(self._vectors_path, dtype=np.float32, mode=mode,
+                                  shape=(self.max_entries, self.dim))
+
+    def _reset(self, dim: int) -> None:
+        """Drop every entry and recreate the vector file for dim and the current capacity (in a write transaction)."""
+        self.dim = dim
+        self._generation = self._meta().get("generation", 0) + 1
+        self._vectors = None
+        if os.path.exists(self._vectors_path):
+            os.remove(self._vectors_path)
+        self._conn.execute("DELETE FROM entries")
+        self._conn.executemany("INSERT OR REPLACE INTO meta (name, value) VALUES (?, ?)",
+                               [("dim", self.dim), ("capacity", self.max_entries), ("generation", self._generation)])
+        self._open_vectors()
+
+
+class CachedEmbeddingFunction(EmbeddingFunction):
+    """Embedding function that serves repeated texts from an EmbeddingCache."""
+
+    def __init__(self, embedder: EmbeddingFunction, cache: EmbeddingCache, namespace: str):
+        """
+        Wrap an embedding function with a cache.
+
+        Args:
+            embedder: Embedding function used on cache misses
+            cache: Shared embedding cache
+            namespace: Model identifier used in cache keys
+        """
+        self.embedder = embedder
+        self.cache = cache
+        self.namespace = namespace
+        self.hits = 0
+        self.misses = 0
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        """
+        Embed texts, calling the underlying model only for texts not seen before.
+
+        Args:
+            input: Texts to embed
+
+        Returns:
+            One embedding per input text
+        """
+        texts = list(input)
+        keys = [cache_key(self.namespace, text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        # Deduplicate misses so repeated texts in one call are embedded once
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found:
+                missing.setdefault(key, text)
+
+        if missing:
+            vectors = np.asarray(self.embedder(list(missing.values())), dtype=np.float32)
+            self.cache.put_many(list(missing), vectors)
+            found.update(zip(missing, vectors))
+
+        self.misses += len(missing)
+        self.hits += len(texts) - len(missing)
+        return [found[key] for key in keys]
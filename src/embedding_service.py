@@ -0,0 +1,352 @@
+"""
+Shared embedding service for the AI Onboarding System.
+
+With N agent workers on a node, each worker loading its own copy of the
+embedding model costs hundreds of MB per worker. The service is a single
+process that owns the model and serves embed requests over a Unix domain
+socket. Requests from all workers are micro-batched into shared forward
+passes, and vectors are returned through a shared-memory buffer owned by
+each client rather than serialized over the socket.
+
+Protocol: frames are a 4-byte big-endian length followed by UTF-8 JSON.
+On connect the service sends {"dim", "namespace"}. Each request is
+{"texts": [...], "shm": <segment name>}. The service writes float32 rows into
+the named segment and replies {"rows": n}, or {"error": message}.
+"""
+
+import os
+import json
+import errno
+import socket
+import struct
+import asyncio
+import threading
+import weakref
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+from chromadb.api.types import EmbeddingFunction
+from typing import Any, Dict, List, Optional
+
+from src.embeddings import build_embedding_function, embedding_namespace
+
+FRAME_HEADER = struct.Struct("!I")
+
+
+def _encode_frame(payload: Dict[str, Any]) -> bytes:
+    """Serialize a message with its length prefix."""
+    body = json.dumps(payload).encode("utf-8")
+    return FRAME_HEADER.pack(len(body)) + body
+
+
+async def _read_frame(reader: asyncio.StreamReader) -> Optional[Dict[str, Any]]:
+    """Read one message, or None when the peer closed the connection."""
+    try:
+        header = await reader.readexactly(FRAME_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    return json.loads(await reader.readexactly(length))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    """Blocking read of exactly size bytes."""
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Embedding service closed the connection")
+        data.extend(chunk)
+    return bytes(data)
+
+
+def _recv_frame(sock: socket.socket) -> Dict[str, Any]:
+    """Blocking read of one message."""
+    (length,) = FRAME_HEADER.unpack(_recv_exactly(sock, FRAME_HEADER.size))
+    return json.loads(_recv_exactly(sock, length))
+
+
+def _attach_shared_memory(name: str) -> SharedMemory:
+    """Attach to a segment created by a client without taking ownership of it."""
+    try:
+        return SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 every attach is tracked and the segment would be unlinked when the service exits
+        shm = SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return shm
+
+
+def _release_shared_memory(shm: SharedMemory) -> None:
+    """Close and unlink a client-owned segment."""
+    shm.close()
+    try:
+        shm.unlink()
+    except FileNotFoundError:
+        pass
+
+
+class EmbeddingService:
+    """Process-wide embedding server with dynamic micro-batching."""
+
+    def __init__(self, db_config: Dict[str, Any], socket_path: str = None):
+        """
+        Load the embedding model.
+
+        Args:
+            db_config: The database section of config.json
+            socket_path: Unix socket to listen on (defaults to database.embedding_service.socket_path)
+        """
+        service_config = db_config.get('embedding_service', {})
+        self.socket_path = socket_path or service_config['socket_path']
+        self.max_batch_size = service_config.get('max_batch_size', 64)
+        self.max_wait = service_config.get('max_wait_ms', 5) / 1000.0
+
+        # Initialize embedding function for the configured backend
+        self.embedder = build_embedding_function(db_config)
+        self.namespace = embedding_namespace(db_config)
+        self.dim = len(self.embedder(["dimension probe"])[0])
+
+        self.stats = {"connections": 0, "requests": 0, "texts": 0, "batches": 0}
+        self._queue = None
+
+    async def serve_forever(self) -> None:
+        """Listen on the socket until cancelled."""
+        self._queue = asyncio.Queue()
+        # A single inference thread; concurrency comes from batching, not parallel forward passes
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-service")
+
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+        server = await asyncio.start_unix_server(self._handle_connection, path=self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+
+        batcher = asyncio.create_task(self._batch_loop(executor))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            batcher.cancel()
+            executor.shutdown(wait=False)
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    async def _batch_loop(self, executor: ThreadPoolExecutor) -> None:
+        """Group queued requests into batches and run them through the model."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            size = len(batch[0][0])
+
+            # Wait briefly for requests from other workers to share the forward pass
+            deadline = loop.time() + self.max_wait
+            while size < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                batch.append(item)
+                size += len(item[0])
+
+            texts = [text for request_texts, _ in batch for text in request_texts]
+            try:
+                vectors = await loop.run_in_executor(executor, self._embed, texts)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.stats["batches"] += 1
+            offset = 0
+            for request_texts, future in batch:
+                if not future.done():
+                    future.set_result(vectors[offset:offset + len(request_texts)])
+                offset += len(request_texts)
+
+    def _embed(self, texts: List[str]) -> np.ndarray:
+        """Run the model on one batch."""
+        return np.asarray(self.embedder(texts), dtype=np.float32)
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve one client connection (one worker thread) until it disconnects."""
+        self.stats["connections"] += 1
+        loop = asyncio.get_running_loop()
+        shm = None
+        try:
+            writer.write(_encode_frame({"dim": self.dim, "namespace": self.namespace}))
+            await writer.drain()
+
+            while True:
+                request = await _read_frame(reader)
+                if request is None:
+                    break
+
+                texts = request['texts']
+                self.stats["requests"] += 1
+                self.stats["texts"] += len(texts)
+                try:
+                    if shm is None or shm.name.lstrip("/") != request['shm'].lstrip("/"):
+                        if shm is not None:
+                            shm.close()
+                        shm = _attach_shared_memory(request['shm'])
+                    if shm.size < len(texts) * self.dim * 4:
+                        raise ValueError(f"Shared memory segment too small for {len(texts)} embeddings")
+
+                    future = loop.create_future()
+                    await self._queue.put((texts, future))
+                    self._write_vectors(shm, await future)
+                    reply = {"rows": len(texts)}
+                except Exception as e:
+                    reply = {"error": str(e)}
+
+                writer.write(_encode_frame(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            if shm is not None:
+                shm.close()
+            writer.close()
+
+    @staticmethod
+    def _write_vectors(shm: SharedMemory, vectors: np.ndarray) -> None:
+        """Copy result rows into the client's segment."""
+        view = np.ndarray(vectors.shape, dtype=np.float32, buffer=shm.buf)
+        view[:] = vectors
+        # The view must be released before the segment can be closed
+        del view
+
+
+class RemoteEmbeddingFunction(EmbeddingFunction):
+    """Drop-in embedding function backed by the shared embedding service."""
+
+    def __init__(self, socket_path: str, expected_namespace: str = None, timeout: float = 30.0):
+        """
+        Configure the client; the connection is opened on first use.
+
+        Args:
+            socket_path: Unix socket of the embedding service
+            expected_namespace: Model identifier the service must report, guarding
+                against mixing vectors from different models (optional)
+            timeout: Seconds to wait for a reply
+        """
+        self.socket_path = socket_path
+        self.expected_namespace = expected_namespace
+        self.timeout = timeout
+        self.dim = None
+
+        # One connection and result buffer per client; calls from several threads are serialized
+        self._lock = threading.Lock()
+        self._sock = None
+        self._shm = None
+        self._shm_finalizer = None
+        self._capacity = 0
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        """Embed texts through the service."""
+        texts = list(input)
+        if not texts:
+            return []
+        with self._lock:
+            try:
+                return self._request(texts)
+            except ConnectionError:
+                # The service may have restarted; reconnect once
+                self._disconnect()
+                return self._request(texts)
+
+    def close(self) -> None:
+        """Close the connection and free the result buffer."""
+        with self._lock:
+            self._disconnect()
+            if self._shm_finalizer is not None:
+                self._shm_finalizer()
+                self._shm, self._shm_finalizer, self._capacity = None, None, 0
+
+    def _connect(self) -> None:
+        """Open the socket and read the service's greeting."""
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError as e:
+            sock.close()
+            if e.errno in (errno.ENOENT, errno.ECONNREFUSED):
+                raise ConnectionError(
+                    f"Embedding service is not running at {self.socket_path}. "
+                    f"Start it with: python main.py --embedding-service"
+                ) from e
+            raise
+
+        greeting = _recv_frame(sock)
+        if self.expected_namespace and greeting['namespace'] != self.expected_namespace:
+            sock.close()
+            raise ValueError(
+                f"Embedding service serves {greeting['namespace']}, but {self.expected_namespace} is configured"
+            )
+        if greeting['dim'] != self.dim:
+            # A different dimension invalidates the buffer size
+            self.dim = greeting['dim']
+            self._capacity = 0
+        self._sock = sock
+
+    def _disconnect(self) -> None:
+        """Drop the connection."""
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _ensure_capacity(self, rows: int) -> None:
+        """Grow the shared result buffer to hold at least rows embeddings."""
+        if rows <= self._capacity:
+            return
+        if self._shm_finalizer is not None:
+            self._shm_finalizer()
+        capacity = max(rows, 2 * self._capacity, 64)
+        self._shm = SharedMemory(create=True, size=capacity * self.dim * 4)
+        self._shm_finalizer = weakref.finalize(self, _release_shared_memory, self._shm)
+        self._capacity = capacity
+
+    def _request(self, texts: List[str]) -> List[np.ndarray]:
+        """Send one request and read the vectors from shared memory."""
+        if self._sock is None:
+            self._connect()
+        self._ensure_capacity(len(texts))
+
+        try:
+            self._sock.sendall(_encode_frame({"texts": texts, "shm": self._shm.name}))
+            reply = _recv_frame(self._sock)
+        except socket.timeout:
+            # A late reply would be read as the answer to the next request
+            self._disconnect()
+            raise
+        if "error" in reply:
+            raise RuntimeError(f"Embedding service error: {reply['error']}")
+
+        vectors = np.ndarray((reply['rows'], self.dim), dtype=np.float32, buffer=self._shm.buf).copy()
+        return list(vectors)
+
+
+def run_embedding_service(socket_path: str = None) -> None:
+    """
+    Run the embedding service until interrupted.
+
+    Args:
+        socket_path: Unix socket to listen on (defaults to database.embedding_service.socket_path)
+    """
+    from src.constants import COLORS
+    from src.utils import load_config
+
+    db_config = load_config()['database']
+    service = EmbeddingService(db_config, socket_path)
+    print(f"{COLORS['success']}Embedding service ({service.namespace}, dim {service.dim}) "
+          f"listening on {service.socket_path}")
+    try:
+        asyncio.run(service.serve_forever())
+    except KeyboardInterrupt:
+        pass
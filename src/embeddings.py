@@ -0,0 +1,185 @@
+"""
+Embedding backends for the AI Onboarding System.
+
+The backend is selected with database.embedding_backend:
+
+- "torch": sentence-transformers on PyTorch in fp32 (the original embedder)
+- "onnx": the same model exported to ONNX and run with ONNX Runtime
+- "onnx-int8": the ONNX model with dynamic int8 weight quantization
+"""
+
+import os
+import numpy as np
+from chromadb.api.types import EmbeddingFunction
+from typing import Dict, Any, List
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "onnx-int8")
+
+# Model that can be fetched automatically in ONNX form through ChromaDB's bundled download
+_CHROMA_ONNX_MODEL = "all-MiniLM-L6-v2"
+
+
+class TorchEmbeddingFunction(EmbeddingFunction):
+    """sentence-transformers embedder with configurable batch size and thread count."""
+
+    def __init__(self, model_name: str, batch_size: int = 32, num_threads: int = 0):
+        """
+        Load the model on CPU.
+
+        Args:
+            model_name: sentence-transformers model name
+            batch_size: Texts per forward pass
+            num_threads: Intra-op threads for PyTorch (0 keeps the runtime default)
+        """
+        import torch
+        from sentence_transformers import SentenceTransformer
+
+        if num_threads:
+            torch.set_num_threads(num_threads)
+
+        self.model = SentenceTransformer(model_name, device="cpu")
+        self.batch_size = batch_size
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        """Embed texts into L2-normalized float32 vectors."""
+        embeddings = self.model.encode(list(input), batch_size=self.batch_size, convert_to_numpy=True,
+                                       normalize_embeddings=True, show_progress_bar=False)
+        return list(embeddings.astype(np.float32))
+
+
+class OnnxEmbeddingFunction(EmbeddingFunction):
+    """ONNX Runtime embedder with mean pooling, optionally int8-quantized."""
+
+    def __init__(self, model_dir: str, batch_size: int = 32, num_threads: int = 0,
+                 quantized: bool = False, max_length: int = 256):
+        """
+        Create an inference session for an exported sentence-transformers model.
+
+        Args:
+            model_dir: Directory containing model.onnx and tokenizer.json
+            batch_size: Texts per inference call
+            num_threads: Intra-op threads for ONNX Runtime (0 keeps the runtime default)
+            quantized: Whether to run the dynamically int8-quantized model
+            max_length: Maximum tokens per text; longer texts are truncated
+        """
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, "model.onnx")
+        if quantized:
+            model_path = quantize_onnx_model(model_path)
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.inter_op_num_threads = 1
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, "tokenizer.json"))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        self.tokenizer.enable_padding()
+        self.batch_size = batch_size
+
+    def __call__(self, input: List[str]) -> List[np.ndarray]:
+        """Embed texts into L2-normalized float32 vectors."""
+        texts = list(input)
+        embeddings = []
+
+        for i in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer.encode_batch(texts[i:i + self.batch_size])
+            input_ids = np.array([e.ids for e in encoded], dtype=np.int64)
+            attention_mask = np.array([e.attention_mask for e in encoded], dtype=np.int64)
+
+            feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+            if "token_type_ids" in self.input_names:
+                feeds["token_type_ids"] = np.zeros_like(input_ids)
+            last_hidden_state = self.session.run(None, feeds)[0]
+
+            # Mean pooling over non-padding tokens
+            mask = attention_mask[..., None].astype(np.float32)
+            pooled = (last_hidden_state * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            embeddings.append(pooled.astype(np.float32))
+
+        return list(np.concatenate(embeddings)) if embeddings else []
+
+
+def quantize_onnx_model(model_path: str) -> str:
+    """
+    Produce (once) a dynamically int8-quantized copy of an ONNX model.
+
+    Args:
+        model_path: Path of the fp32 model
+
+    Returns:
+        Path of the quantized model, stored next to the original
+    """
+    quantized_path = os.path.join(os.path.dirname(model_path), "model_int8.onnx")
+    if not os.path.exists(quantized_path):
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+        quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+
+def resolve_onnx_model_dir(db_config: Dict[str, Any]) -> str:
+    """
+    Locate the exported ONNX model for the configured embedding model.
+
+    Uses database.onnx_model_dir when set. Otherwise all-MiniLM-L6-v2 is fetched
+    through ChromaDB's bundled ONNX download.
+
+    Args:
+        db_config: The database section of config.json
+
+    Returns:
+        Directory containing model.onnx and tokenizer.json
+    """
+    model_dir = db_config.get('onnx_model_dir')
+    if model_dir:
+        if not os.path.exists(os.path.join(model_dir, "model.onnx")):
+            raise FileNotFoundError(
+                f"No model.onnx in {model_dir}. Export one with: "
+                f"optimum-cli export onnx --model sentence-transformers/{db_config['embedding_model']} {model_dir}"
+            )
+        return model_dir
+
+    if db_config['embedding_model'] != _CHROMA_ONNX_MODEL:
+        raise ValueError(
+            f"database.onnx_model_dir must be set to use an ONNX backend with {db_config['embedding_model']}"
+        )
+
+    from chromadb.utils.embedding_functions import ONNXMiniLM_L6_V2
+    ONNXMiniLM_L6_V2()._download_model_if_not_exists()
+    return os.path.join(ONNXMiniLM_L6_V2.DOWNLOAD_PATH, ONNXMiniLM_L6_V2.EXTRACTED_FOLDER_NAME)
+
+
+def embedding_namespace(db_config: Dict[str, Any], backend: str = None) -> str:
+    """Identify the vectors a backend produces, e.g. for cache keys."""
+    return f"{db_config['embedding_model']}@{backend or db_config.get('embedding_backend', 'torch')}"
+
+
+def build_embedding_function(db_config: Dict[str, Any], backend: str = None) -> EmbeddingFunction:
+    """
+    Create the embedding function selected in the database configuration.
+
+    Args:
+        db_config: The database section of config.json
+        backend: Override for database.embedding_backend (optional)
+
+    Returns:
+        Embedding function for the chosen backend
+    """
+    backend = backend or db_config.get('embedding_backend', 'torch')
+    batch_size = db_config.get('embedding_batch_size', 32)
+    num_threads = db_config.get('embedding_threads', 0)
+
+    if backend == "torch":
+        return TorchEmbeddingFunction(db_config['embedding_model'], batch_size, num_threads)
+    elif backend in ("onnx", "onnx-int8"):
+        return OnnxEmbeddingFunction(resolve_onnx_model_dir(db_config), batch_size, num_threads,
+                                     quantized=backend == "onnx-int8")
+    else:
+        raise ValueError(f"Unknown embedding backend '{backend}'. Choose one of: {', '.join(EMBEDDING_BACKENDS)}")
@@ -0,0 +1,203 @@
+"""
+Lexical retrieval for the AI Onboarding System.
+
+A BM25-scored inverted index kept in step with the vector store, plus
+reciprocal-rank fusion to merge lexical and vector rankings.
+"""
+
+import os
+import re
+import json
+import math
+import heapq
+import threading
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Sequence, Tuple
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset("""
+a an and are as at be but by can do does for from has have how i if in is it its
+me my of on or our so that the their them there these they this to was we what
+when where which who why will with you your
+""".split())
+
+
+def bm25_index_path(db_config: Dict[str, Any]) -> str:
+    """
+    Location of the BM25 index for the configured collection and vector store backend.
+
+    Args:
+        db_config: The database section of config.json
+
+    Returns:
+        Path of the index file under database.path
+    """
+    backend = db_config.get('backend', 'chroma')
+    return os.path.join(db_config['path'], f"{db_config['collection']}.{backend}.bm25.json")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into index terms.
+
+    Terms are lowercase alphanumeric words without stopwords, plus adjacent-word
+    bigrams so exact phrases like "parental leave" score above scattered matches.
+
+    Args:
+        text: Text to tokenize
+
+    Returns:
+        List of terms (with repetitions)
+    """
+    words = [word for word in TOKEN_PATTERN.findall(text.lower()) if word not in STOPWORDS]
+    return words + [f"{first} {second}" for first, second in zip(words, words[1:])]
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[str]], k: int = 60) -> List[Tuple[str, float]]:
+    """
+    Merge several ranked id lists with reciprocal-rank fusion.
+
+    Args:
+        rankings: Ranked id lists, best first
+        k: Damping constant; larger values flatten the contribution of top ranks
+
+    Returns:
+        (id, fused score) pairs sorted by descending score
+    """
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, 1):
+            scores[doc_id] += 1.0 / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """Inverted index with BM25 scoring, persisted as JSON."""
+
+    def __init__(self, path: str, k1: float = 1.2, b: float = 0.75):
+        """
+        Load the index from disk if present.
+
+        Args:
+            path: Location of the index file
+            k1: Term-frequency saturation parameter
+            b: Document-length normalization parameter
+        """
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self._lock = threading.RLock()
+        self._dirty = False
+
+        # Forward index (doc -> term counts) makes removal possible without the original text
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self.total_length = 0
+
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                for doc_id, (length, doc_type, terms) in json.load(f)["documents"].items():
+                    self._insert(doc_id, length, doc_type, terms)
+
+    @property
+    def exists(self) -> bool:
+        """Whether the index has been written to disk before."""
+        return os.path.exists(self.path)
+
+    def __len__(self) -> int:
+        """Number of indexed documents."""
+        return len(self.documents)
+
+    def add(self, ids: Iterable[str], documents: Iterable[str], metadatas: Iterable[Dict[str, Any]]) -> None:
+        """
+        Index chunks, replacing any existing entry with the same id.
+
+        Args:
+            ids: Chunk ids
+            documents: Chunk texts
+            metadatas: Chunk metadata (the "type" field is kept for filtering)
+        """
+        with self._lock:
+            for doc_id, text, metadata in zip(ids, documents, metadatas):
+                if doc_id in self.documents:
+                    self._discard(doc_id)
+                terms = tokenize(text)
+                length = sum(1 for term in terms if " " not in term)
+                self._insert(doc_id, length, metadata.get("type"), dict(Counter(terms)))
+            self._dirty = True
+
+    def remove(self, ids: Iterable[str]) -> None:
+        """Drop chunks from the index; unknown ids are ignored."""
+        with self._lock:
+            for doc_id in ids:
+                if doc_id in self.documents:
+                    self._discard(doc_id)
+                    self._dirty = True
+
+    def search(self, query: str, n_results: int, doc_type: str = None) -> List[Tuple[str, float]]:
+        """
+        Rank indexed chunks against a query with BM25.
+
+        Args:
+            query: Query text
+            n_results: Maximum number of hits
+            doc_type: Only return chunks of this type (optional)
+
+        Returns:
+            (id, score) pairs sorted by descending score
+        """
+        with self._lock:
+            if not self.documents:
+                return []
+
+            count = len(self.documents)
+            average_length = self.total_length / count or 1.0
+            scores = defaultdict(float)
+
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    document = self.documents[doc_id]
+                    if doc_type and document["type"] != doc_type:
+                        continue
+                    norm = self.k1 * (1.0 - self.b + self.b * document["length"] / average_length)
+                    scores[doc_id] += idf * tf * (self.k1 + 1.0) / (tf + norm)
+
+            return heapq.nlargest(n_results, scores.items(), key=lambda item: item[1])
+
+    def save(self) -> None:
+        """Atomically write the index to disk if it changed."""
+        with self._lock:
+            if not self._dirty and self.exists:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'w') as f:
+                json.dump({"documents": {
+                    doc_id: [document["length"], document["type"], document["terms"]]
+                    for doc_id, document in self.documents.items()
+                }}, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+
+    def _insert(self, doc_id: str, length: int, doc_type: str, terms: Dict[str, int]) -> None:
+        """Add a document's term counts to the forward and inverted indexes."""
+        self.documents[doc_id] = {"length": length, "type": doc_type, "terms": terms}
+        self.total_length += length
+        for term, tf in terms.items():
+            self.postings[term][doc_id] = tf
+
+    def _discard(self, doc_id: str) -> None:
+        """Remove a document from the forward and inverted indexes."""
+        document = self.documents.pop(doc_id)
+        self.total_length -= document["length"]
+        for term in document["terms"]:
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
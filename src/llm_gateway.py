@@ -0,0 +1,289 @@
+"""
+LLM gateway for the AI Onboarding System.
+
+Every chat completion goes through one LLMGateway per process. It owns the
+pooled async Groq client, paces requests with a token bucket, retries
+transient failures with jittered exponential backoff and coalesces
+identical in-flight prompts into a single upstream call.
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import hashlib
+import inspect
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+import groq
+import httpx
+from groq import AsyncGroq, DefaultAsyncHttpxClient
+
+TokenCallback = Callable[[str], Union[None, Awaitable[None]]]
+
+# Failures worth another attempt; anything else (bad request, auth) is raised at once
+RETRYABLE_ERRORS = (groq.RateLimitError, groq.APIConnectionError, groq.InternalServerError)
+
+
+class TokenBucket:
+    """Async token bucket: `rate` requests per second with bursts up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        """
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of stored tokens
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """
+        Take one token, waiting for the bucket to refill if it is empty.
+
+        Returns:
+            Seconds spent waiting
+        """
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return now - started
+                await asyncio.sleep((1.0 - self._tokens) / self.rate)
+
+
+class _InFlight:
+    """
+    An upstream call that identical requests can attach to.
+
+    The call runs as its own task, owned by the gateway rather than by any caller, so one caller
+    cancelling does not cancel it for the others. Each streaming caller reads tokens from its own
+    queue, so a slow or failing callback only affects that caller.
+    """
+
+    def __init__(self, key: Optional[str], streaming: bool):
+        self.key = key
+        self.streaming = streaming
+        self.task: Optional[asyncio.Task] = None
+        self.tokens: List[str] = []
+        self.queues: List[asyncio.Queue] = []
+        self.waiters = 0
+
+    def publish(self, token: str) -> None:
+        """Record a streamed token and hand it to every attached caller."""
+        self.tokens.append(token)
+        for queue in self.queues:
+            queue.put_nowait(token)
+
+
+# Queued after the last token of a stream
+_END_OF_STREAM = object()
+
+
+def backoff_delay(attempt: int, base: float, cap: float) -> float:
+    """Full-jitter exponential backoff for the given retry attempt (0-based)."""
+    return random.uniform(0.0, min(cap, base * (2 ** attempt)))
+
+
+class LLMGateway:
+    """Shared, rate-limited and coalescing front end to the chat completions API."""
+
+    def __init__(self, llm_config: Dict[str, Any]):
+        """
+        Create the pooled client.
+
+        Args:
+            llm_config: The llm section of config.json
+        """
+        self.llm_config = llm_config
+        gateway_config = llm_config.get('gateway', {})
+        max_connections = gateway_config.get('max_connections', 20)
+
+        # A base_url points the gateway at any Groq/OpenAI-compatible endpoint, such as the local mock server
+        base_url = llm_config.get('base_url') or None
+        api_key = os.getenv("GROQ_API_KEY") or ("local" if base_url else None)
+
+        # One connection pool for all sessions; retries are handled here rather than by the SDK
+        self.client = AsyncGroq(
+            api_key=api_key,
+            base_url=base_url,
+            max_retries=0,
+            timeout=gateway_config.get('timeout_seconds', 60),
+            http_client=DefaultAsyncHttpxClient(limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections
+            ))
+        )
+        self.bucket = TokenBucket(
+            gateway_config.get('requests_per_minute', 30) / 60.0,
+            gateway_config.get('burst', 5)
+        )
+        self.max_retries = gateway_config.get('max_retries', 4)
+        self.backoff_base = gateway_config.get('backoff_base_seconds', 0.5)
+        self.backoff_max = gateway_config.get('backoff_max_seconds', 20.0)
+        self.coalesce = gateway_config.get('coalesce', True)
+
+        self._in_flight: Dict[str, _InFlight] = {}
+        self._loop = None
+        self._loop_lock = threading.Lock()
+
+        self.stats = {"requests": 0, "upstream_calls": 0, "coalesced": 0, "retries": 0,
+                      "rate_limited_seconds": 0.0}
+
+    async def complete(self, messages: List[Dict[str, str]], on_token: Optional[TokenCallback] = None) -> str:
+        """
+        Generate a chat completion.
+
+        Args:
+            messages: Chat messages
+            on_token: Callback (plain function or coroutine) receiving streamed text;
+                enables streaming (optional)
+
+        Returns:
+            The full answer text
+        """
+        self.stats["requests"] += 1
+        key = self._request_key(messages) if self.coalesce else None
+        pending = self._in_flight.get(key) if key is not None else None
+        if pending is None:
+            pending = self._start(key, messages, on_token is not None)
+        else:
+            self.stats["coalesced"] += 1
+        return await self._follow(pending, on_token)
+
+    def complete_blocking(self, messages: List[Dict[str, str]], on_token: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Blocking variant of complete() for synchronous callers.
+
+        The gateway runs its own event loop on a background thread, and on_token
+        is called from that thread. Use either this method or complete() from a
+        single event loop with a given gateway, not both.
+        """
+        future = asyncio.run_coroutine_threadsafe(self.complete(messages, on_token), self._background_loop())
+        return future.result()
+
+    async def close(self):
+        """Close the pooled client."""
+        await self.client.close()
+
+    def _background_loop(self) -> asyncio.AbstractEventLoop:
+        """Start (once) the event loop thread used by complete_blocking."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(target=self._loop.run_forever, name="llm-gateway", daemon=True).start()
+            return self._loop
+
+    def _request_key(self, messages: List[Dict[str, str]]) -> str:
+        """Identify requests that would produce the same completion."""
+        payload = json.dumps([messages, self.llm_config['model'], self.llm_config['temperature']], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _start(self, key: Optional[str], messages: List[Dict[str, str]], streaming: bool) -> _InFlight:
+        """Start an upstream call, shared with identical requests when key is given."""
+        pending = _InFlight(key, streaming)
+        pending.task = asyncio.get_running_loop().create_task(self._call_upstream(messages, pending))
+        pending.task.add_done_callback(lambda task: self._finish(pending))
+        if key is not None:
+            self._in_flight[key] = pending
+        return pending
+
+    def _finish(self, pending: _InFlight) -> None:
+        """Detach a completed upstream call and end its callers' token streams."""
+        if pending.key is not None and self._in_flight.get(pending.key) is pending:
+            del self._in_flight[pending.key]
+        if not pending.task.cancelled():
+            # Callers observe any failure; mark it retrieved so it is not reported as unhandled
+            pending.task.exception()
+        for queue in pending.queues:
+            queue.put_nowait(_END_OF_STREAM)
+
+    async def _follow(self, pending: _InFlight, on_token: Optional[TokenCallback]) -> str:
+        """Wait for an upstream call, relaying its tokens to on_token."""
+        pending.waiters += 1
+        try:
+            if on_token is None or not pending.streaming:
+                answer = await asyncio.shield(pending.task)
+                if on_token is not None:
+                    await _deliver(on_token, answer)
+                return answer
+
+            # Replay what was streamed so far, then receive the rest live
+            queue = asyncio.Queue()
+            for token in pending.tokens:
+                queue.put_nowait(token)
+            pending.queues.append(queue)
+            try:
+                while True:
+                    token = await queue.get()
+                    if token is _END_OF_STREAM:
+                        return pending.task.result()
+                    await _deliver(on_token, token)
+            finally:
+                pending.queues.remove(queue)
+        finally:
+            pending.waiters -= 1
+            if pending.waiters == 0 and not pending.task.done():
+                # Nobody is waiting for the answer any more
+                if pending.key is not None and self._in_flight.get(pending.key) is pending:
+                    del self._in_flight[pending.key]
+                pending.task.cancel()
+
+    async def _call_upstream(self, messages: List[Dict[str, str]], pending: _InFlight) -> str:
+        """Call the provider with rate limiting and retries, publishing streamed tokens to pending."""
+        streaming, tokens = pending.streaming, pending.tokens
+        attempt = 0
+        while True:
+            self.stats["rate_limited_seconds"] += await self.bucket.acquire()
+            self.stats["upstream_calls"] += 1
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.llm_config['model'],
+                    messages=messages,
+                    temperature=self.llm_config['temperature'],
+                    stream=streaming
+                )
+                if not streaming:
+                    return response.choices[0].message.content
+
+                async for chunk in response:
+                    token = chunk.choices[0].delta.content if chunk.choices else None
+                    if token:
+                        pending.publish(token)
+                return "".join(tokens)
+
+            except RETRYABLE_ERRORS as e:
+                # Text already shown to the user cannot be taken back, so a broken stream is not retried
+                if tokens or attempt >= self.max_retries:
+                    raise
+                delay = max(backoff_delay(attempt, self.backoff_base, self.backoff_max), _retry_after(e))
+                attempt += 1
+                self.stats["retries"] += 1
+                await asyncio.sleep(delay)
+
+
+async def _deliver(callback: TokenCallback, token: str) -> None:
+    """Call a sync or async token callback."""
+    result = callback(token)
+    if inspect.isawaitable(result):
+        await result
+
+
+def _retry_after(error: Exception) -> float:
+    """Seconds requested by a Retry-After header, or 0."""
+    response = getattr(error, "response", None)
+    if response is None:
+        return 0.0
+    try:
+        return float(response.headers.get("retry-after", 0))
+    except ValueError:
+        return 0.0
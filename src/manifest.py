@@ -0,0 +1,142 @@
+"""
+Ingestion manifest for the AI Onboarding System.
+
+Tracks, per source file, the content hash, mtime and size seen at ingestion time
+together with the ids of the chunks that were written for it and the signature
+of the chunker that made them.
+"""
+
+import os
+import json
+import uuid
+import hashlib
+from typing import Dict, Any, List, Optional
+
+MANIFEST_SUFFIX = "ingest_manifest.json"
+
+
+def file_sha256(file_path: str, block_size: int = 1 << 20) -> str:
+    """
+    Compute the SHA-256 digest of a file without loading it into memory.
+
+    Args:
+        file_path: Path to the file
+        block_size: Number of bytes read per iteration
+
+    Returns:
+        Hex digest of the file content
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id(source: str, text: str) -> str:
+    """
+    Derive a stable chunk id from its source and content.
+
+    Args:
+        source: Normalized source path of the chunk
+        text: Chunk text
+
+    Returns:
+        Hex id that only changes when the chunk content (or its source) changes
+    """
+    return hashlib.sha256(f"{source}\x00{text}".encode("utf-8")).hexdigest()[:32]
+
+
+def manifest_path(db_config: Dict[str, Any]) -> str:
+    """
+    Location of the manifest for the configured collection and vector store backend.
+
+    Args:
+        db_config: The database section of config.json
+
+    Returns:
+        Path of the manifest JSON file under database.path
+    """
+    backend = db_config.get('backend', 'chroma')
+    return os.path.join(db_config['path'], f"{db_config['collection']}.{backend}.{MANIFEST_SUFFIX}")
+
+
+def source_key(file_path: str) -> str:
+    """Normalize a file path into the key used by the manifest."""
+    return os.path.abspath(file_path)
+
+
+class IngestManifest:
+    """Persistent record of ingested sources and their chunk ids."""
+
+    def __init__(self, path: str):
+        """
+        Load the manifest from disk, starting empty if it does not exist.
+
+        Args:
+            path: Location of the manifest JSON file
+        """
+        self.path = path
+        self.sources: Dict[str, Dict[str, Any]] = {}
+        # Opaque token that changes whenever the set of ingested chunks changes
+        self.version = "empty"
+
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.sources = data.get("sources", {})
+            self.version = data.get("version", self.version)
+
+    def get(self, source: str) -> Optional[Dict[str, Any]]:
+        """Return the manifest entry for a source, if any."""
+        return self.sources.get(source)
+
+    def is_unchanged(self, source: str, mtime: float, size: int, chunker: str = None) -> bool:
+        """
+        Cheap change check based on file metadata only.
+
+        Args:
+            source: Manifest key of the file
+            mtime: Current modification time
+            size: Current size in bytes
+            chunker: Signature of the current chunker; when given, it must match as well (optional)
+
+        Returns:
+            True if the file's mtime and size (and chunker) match the recorded values
+        """
+        entry = self.sources.get(source)
+        return (entry is not None and entry["mtime"] == mtime and entry["size"] == size
+                and (chunker is None or entry.get("chunker") == chunker))
+
+    def record(self, source: str, sha256: str, mtime: float, size: int, chunk_ids: List[str],
+               chunker: str = None) -> None:
+        """Store (or replace) the entry for a source."""
+        previous = self.sources.get(source)
+        if previous is None or previous["chunk_ids"] != list(chunk_ids):
+            self._bump_version()
+        self.sources[source] = {
+            "sha256": sha256,
+            "mtime": mtime,
+            "size": size,
+            "chunk_ids": list(chunk_ids),
+            "chunker": chunker
+        }
+
+    def remove(self, source: str) -> Optional[Dict[str, Any]]:
+        """Drop a source from the manifest and return its former entry."""
+        entry = self.sources.pop(source, None)
+        if entry is not None:
+            self._bump_version()
+        return entry
+
+    def save(self) -> None:
+        """Atomically write the manifest back to disk."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump({"version": self.version, "sources": self.sources}, f)
+        os.replace(tmp_path, self.path)
+
+    def _bump_version(self) -> None:
+        """Mark the corpus as changed."""
+        self.version = uuid.uuid4().hex
@@ -0,0 +1,231 @@
+"""
+Latency instrumentation for the AI Onboarding System.
+
+Timers (histograms) and counters around the stages of answering a question
+and ingesting a document. They are exported in the Prometheus text format or
+as JSON. When metrics.enabled is false, timer() returns a shared no-op context
+manager and observe()/inc() return immediately, so instrumented code pays
+for little more than an attribute check.
+"""
+
+import json
+import time
+import threading
+from typing import Any, Dict, Iterator, Tuple
+
+# Upper bounds (seconds) of the latency histogram buckets
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+METRIC_HELP = {
+    "onboarding_ask_seconds": "End-to-end time to answer a question, by answer source",
+    "onboarding_ask_stage_seconds": "Time spent in each stage of answering a question",
+    "onboarding_ask_first_token_seconds": "Time from question to the first streamed answer token",
+    "onboarding_answers_total": "Questions answered, by answer source",
+    "onboarding_prompt_tokens_total": "Tokens in prompts sent to the LLM",
+    "onboarding_context_tokens_total": "Context tokens retrieved for LLM prompts and packed into them",
+    "onboarding_ingest_stage_seconds": "Time spent in each stage of ingesting a document",
+    "onboarding_ingested_chunks_total": "Chunks written to the vector store",
+}
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+class _Histogram:
+    """Cumulative-bucket latency histogram."""
+
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> Iterator[Tuple[float, int]]:
+        """(upper bound, observations <= bound) pairs, ending with +Inf."""
+        running = 0
+        for bound, count in zip(self.buckets, self.counts):
+            running += count
+            yield bound, running
+        yield float("inf"), self.count
+
+
+class _NullTimer:
+    """Context manager that does nothing; shared by every timer while metrics are disabled."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    """Context manager that records its duration into a histogram."""
+
+    __slots__ = ("metrics", "name", "labels", "started")
+
+    def __init__(self, metrics: "Metrics", name: str, labels: Dict[str, str]):
+        self.metrics = metrics
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.metrics.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class Metrics:
+    """Registry of latency histograms and counters."""
+
+    def __init__(self, enabled: bool = False, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        Args:
+            enabled: Whether measurements are recorded
+            buckets: Histogram bucket upper bounds in seconds
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self._lock = threading.Lock()
+        self._histograms: Dict[str, Dict[Labels, _Histogram]] = {}
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+
+    def timer(self, name: str, **labels: str):
+        """
+        Time a block into a histogram.
+
+        Args:
+            name: Metric name
+            **labels: Label values, e.g. stage="retrieval"
+
+        Returns:
+            Context manager
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def observe(self, name: str, seconds: float, **labels: str) -> None:
+        """Record a duration measured elsewhere."""
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self.buckets)
+            histogram.observe(seconds)
+
+    def inc(self, name: str, value: float = 1, **labels: str) -> None:
+        """Increase a counter."""
+        if not self.enabled:
+            return
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def reset(self) -> None:
+        """Drop all recorded measurements."""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Current measurements as plain data.
+
+        Returns:
+            {metric name: {"type", "help", "series": [...]}}; histogram series
+            carry count, sum, mean_seconds and cumulative buckets
+        """
+        with self._lock:
+            snapshot = {}
+            for name, series in sorted(self._histograms.items()):
+                snapshot[name] = {"type": "histogram", "help": METRIC_HELP.get(name, name), "series": [{
+                    "labels": dict(labels),
+                    "count": histogram.count,
+                    "sum": histogram.sum,
+                    "mean_seconds": histogram.sum / histogram.count if histogram.count else 0.0,
+                    "buckets": {_format_bound(bound): count for bound, count in histogram.cumulative()}
+                } for labels, histogram in sorted(series.items())]}
+            for name, series in sorted(self._counters.items()):
+                snapshot[name] = {"type": "counter", "help": METRIC_HELP.get(name, name), "series": [
+                    {"labels": dict(labels), "value": value} for labels, value in sorted(series.items())
+                ]}
+        return snapshot
+
+    def render_prometheus(self) -> str:
+        """Measurements in the Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for name, metric in self.snapshot().items():
+            lines.append(f"# HELP {name} {metric['help']}")
+            lines.append(f"# TYPE {name} {metric['type']}")
+            for series in metric["series"]:
+                labels = series["labels"]
+                if metric["type"] == "counter":
+                    lines.append(f"{name}{_format_labels(labels)} {series['value']}")
+                    continue
+                for bound, count in series["buckets"].items():
+                    lines.append(f"{name}_bucket{_format_labels({**labels, 'le': bound})} {count}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {series['sum']}")
+                lines.append(f"{name}_count{_format_labels(labels)} {series['count']}")
+        return "\n".join(lines) + "\n"
+
+    def dump_json(self, path: str) -> None:
+        """Write the snapshot to a JSON file."""
+        with open(path, 'w') as f:
+            json.dump(self.snapshot(), f, indent=2)
+
+
+def _format_bound(bound: float) -> str:
+    """Bucket bound as Prometheus writes it."""
+    return "+Inf" if bound == float("inf") else repr(bound)
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    """{key="value",...} with Prometheus escaping, or nothing when there are no labels."""
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _escape(value: Any) -> str:
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_metrics = None
+_metrics_lock = threading.Lock()
+
+
+def get_metrics() -> Metrics:
+    """Process-wide metrics registry, enabled by metrics.enabled in config.json (hot-reloadable)."""
+    global _metrics
+    if _metrics is None:
+        with _metrics_lock:
+            if _metrics is None:
+                from src.config_service import get_config_service
+                service = get_config_service()
+                metrics = Metrics(service.config.get('metrics', {}).get('enabled', False))
+
+                def on_reload(config, settings):
+                    metrics.enabled = config.get('metrics', {}).get('enabled', False)
+
+                service.subscribe(on_reload)
+                _metrics = metrics
+    return _metrics
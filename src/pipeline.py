@@ -0,0 +1,205 @@
+"""
+Retrieval-augmented answer pipeline for the AI Onboarding System.
+
+Everything around the LLM call lives here (query embedding, cache lookups,
+retrieval, prompt assembly and cache updates) so the blocking and async
+agents share one implementation and only differ in how they call the model.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List
+
+from src.answer_cache import AnswerCache
+from src.context import ContextBuilder
+from src.metrics import get_metrics
+from src.semantic_cache import SemanticCache
+from src.vector_db import OnboardingVectorDB
+
+# Per-request prompt size, returned with LLM answers and kept in the interaction history
+PROMPT_USAGE_FIELDS = ("prompt_tokens", "context_tokens", "retrieved_context_tokens")
+
+logger = logging.getLogger(__name__)
+
+
+class AnswerPipeline:
+    """Prepares LLM requests for questions and records generated answers."""
+
+    def __init__(self, config: Dict[str, Any], db: OnboardingVectorDB):
+        """
+        Set up the answer caches.
+
+        Args:
+            config: Parsed config.json
+            db: Vector database used for retrieval
+        """
+        self.config = config
+        self.db = db
+        self._context_builder = None
+        self._context_config = None
+
+        # Initialize answer cache shared across sessions and processes
+        self.answer_cache = None
+        answer_cache_config = config.get('cache', {}).get('answers', {})
+        if answer_cache_config.get('enabled', False):
+            self.answer_cache = AnswerCache(answer_cache_config['path'], answer_cache_config['ttl_seconds'])
+            self.answer_cache.invalidate(db.corpus_version)
+
+        # Initialize in-memory cache of semantically similar questions
+        self.semantic_cache = None
+        semantic_cache_config = config.get('cache', {}).get('semantic', {})
+        if semantic_cache_config.get('enabled', False):
+            self.semantic_cache = SemanticCache(
+                semantic_cache_config['similarity_threshold'],
+                semantic_cache_config['max_entries']
+            )
+
+    def prepare(self, question: str) -> Dict[str, Any]:
+        """
+        Resolve a question from the caches or build the LLM request for it.
+
+        Args:
+            question: User's question
+
+        Returns:
+            Either {"answer", "source"} for a cache hit, or a request dictionary
+            with "messages" plus the state needed by record()
+        """
+        rag_config = self.config['rag']
+        doc_type = rag_config['default_document_type']
+        corpus_version = self.db.corpus_version
+        metrics = get_metrics()
+
+        builder = self.context_builder
+        settings = self.answer_settings(builder)
+
+        # The query embedding is computed once and shared by the semantic cache and retrieval
+        with metrics.timer("onboarding_ask_stage_seconds", stage="query_embedding"):
+            query_embedding = self.db.embed_query(question)
+        if self.semantic_cache is not None:
+            with metrics.timer("onboarding_ask_stage_seconds", stage="semantic_cache"):
+                cached = self.semantic_cache.lookup(query_embedding, doc_type, corpus_version, settings)
+            if cached is not None:
+                return {"answer": cached, "source": "semantic_cache"}
+
+        # Query vector database (vector_search and lexical_search are timed inside)
+        with metrics.timer("onboarding_ask_stage_seconds", stage="retrieval"):
+            results = self.db.query_documents(
+                query_text=question,
+                doc_type=doc_type,
+                n_results=rag_config['query_results'],
+                query_embedding=query_embedding
+            )
+
+        # Same question, same retrieved chunks packed the same way and same model settings give the same answer
+        cache_key = None
+        if self.answer_cache is not None:
+            with metrics.timer("onboarding_ask_stage_seconds", stage="answer_cache"):
+                chunk_ids = results['ids'][0] if results['ids'] else []
+                cache_key = self.answer_cache.make_key(question, doc_type, chunk_ids, self.config['llm'],
+                                                       builder.signature)
+                cached = self.answer_cache.get(cache_key, corpus_version)
+            if cached is not None:
+                return {"answer": cached, "source": "answer_cache"}
+
+        # Pack the retrieved chunks into the context budget
+        with metrics.timer("onboarding_ask_stage_seconds", stage="prompt_assembly"):
+            context = builder.build(results)
+            messages = self.build_messages(question, context['text'])
+            usage = {
+                "prompt_tokens": sum(builder.count_tokens([message['content'] for message in messages])),
+                "context_tokens": context['tokens'],
+                "retrieved_context_tokens": context['retrieved_tokens']
+            }
+        metrics.inc("onboarding_prompt_tokens_total", usage['prompt_tokens'])
+        metrics.inc("onboarding_context_tokens_total", usage['retrieved_context_tokens'], stage="retrieved")
+        metrics.inc("onboarding_context_tokens_total", usage['context_tokens'], stage="packed")
+        logger.info("LLM prompt: prompt_tokens=%d context_tokens=%d retrieved_context_tokens=%d "
+                    "dropped_sentences=%d duplicate_sentences=%d", usage['prompt_tokens'], usage['context_tokens'],
+                    usage['retrieved_context_tokens'], context['dropped_sentences'], context['duplicate_sentences'])
+
+        return {
+            "question": question,
+            "messages": messages,
+            "doc_type": doc_type,
+            "corpus_version": corpus_version,
+            "query_embedding": query_embedding,
+            "cache_key": cache_key,
+            "settings": settings,
+            "usage": usage
+        }
+
+    @property
+    def context_builder(self) -> ContextBuilder:
+        """Context builder for the current configuration, rebuilt after a config reload."""
+        if self._context_config is not self.config:
+            self._context_builder = ContextBuilder.from_config(self.config)
+            self._context_config = self.config
+        return self._context_builder
+
+    def answer_settings(self, builder: ContextBuilder) -> str:
+        """Signature of the settings an answer depends on besides the question and the corpus."""
+        llm_config = self.config['llm']
+        return json.dumps([llm_config.get('model'), llm_config.get('temperature'),
+                           self.config['rag']['query_results'], builder.signature])
+
+    @staticmethod
+    def build_messages(question: str, context: str) -> List[Dict[str, str]]:
+        """
+        Assemble the chat messages sent to the LLM.
+
+        Args:
+            question: User's question
+            context: Retrieved document text
+
+        Returns:
+            Chat messages
+        """
+        return [{
+            "role": "system",
+            "content": f"""Answer as HR assistant for a new employee.
+                Context: {context}
+                Be concise and professional."""
+        }, {
+            "role": "user",
+            "content": question
+        }]
+
+    def record(self, request: Dict[str, Any], answer: str, generation_seconds: float) -> Dict[str, Any]:
+        """
+        Store a generated answer in the caches.
+
+        Args:
+            request: The dictionary returned by prepare()
+            answer: Generated answer text
+            generation_seconds: Time spent in the LLM call
+
+        Returns:
+            Dictionary with the answer, its source and the prompt size (PROMPT_USAGE_FIELDS)
+        """
+        metrics = get_metrics()
+        metrics.observe("onboarding_ask_stage_seconds", generation_seconds, stage="llm")
+        with metrics.timer("onboarding_ask_stage_seconds", stage="cache_update"):
+            if request['cache_key'] is not None:
+                self.answer_cache.put(request['cache_key'], answer, request['corpus_version'])
+            if self.semantic_cache is not None:
+                self.semantic_cache.store(request['query_embedding'], request['question'], answer,
+                                          request['doc_type'], request['corpus_version'], generation_seconds,
+                                          request['settings'])
+        return {"answer": answer, "source": "llm", **request['usage']}
+
+    @staticmethod
+    def observe(source: str, total_seconds: float, first_token_seconds: float = None) -> None:
+        """
+        Export the end-to-end latency of an answered question.
+
+        Args:
+            source: Where the answer came from (llm, answer_cache or semantic_cache)
+            total_seconds: Time from question to complete answer
+            first_token_seconds: Time to the first streamed token, if the answer was streamed
+        """
+        metrics = get_metrics()
+        metrics.observe("onboarding_ask_seconds", total_seconds, source=source)
+        metrics.inc("onboarding_answers_total", source=source)
+        if first_token_seconds is not None:
+            metrics.observe("onboarding_ask_first_token_seconds", first_token_seconds)
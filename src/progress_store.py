@@ -0,0 +1,334 @@
+"""
+Checklist progress store for the AI Onboarding System.
+
+Each hire's copy of the onboarding checklist is kept in SQLite, so progress
+survives restarts and is shared by the terminal agent, the server and any
+reporting job. Per-cohort totals are maintained by triggers, and pending tasks
+are indexed by due date. This keeps completion-rate and overdue queries in the
+millisecond range at 100k+ hires.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+STATUS_PENDING = "pending"
+STATUS_COMPLETED = "completed"
+
+SCHEMA = """
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+
+    CREATE TABLE IF NOT EXISTS hires (
+        hire_id TEXT PRIMARY KEY,
+        name TEXT NOT NULL,
+        role TEXT NOT NULL,
+        cohort TEXT NOT NULL,
+        start_date TEXT NOT NULL
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS tasks (
+        hire_id TEXT NOT NULL,
+        task TEXT NOT NULL,
+        position INTEGER NOT NULL,
+        cohort TEXT NOT NULL,
+        status TEXT NOT NULL,
+        due_date TEXT,
+        completed_at TEXT,
+        PRIMARY KEY (hire_id, task)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_tasks_task_status ON tasks (task, status);
+    -- Partial indexes over pending tasks only; status is included so overdue counts never touch the table
+    CREATE INDEX IF NOT EXISTS idx_tasks_pending_due ON tasks (due_date, status) WHERE status = 'pending';
+    CREATE INDEX IF NOT EXISTS idx_tasks_pending_cohort_due ON tasks (cohort, due_date, status)
+        WHERE status = 'pending';
+
+    -- Running totals per cohort, so completion rates never scan the tasks table
+    CREATE TABLE IF NOT EXISTS cohort_progress (
+        cohort TEXT PRIMARY KEY,
+        hires INTEGER NOT NULL DEFAULT 0,
+        tasks_total INTEGER NOT NULL DEFAULT 0,
+        tasks_completed INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID;
+
+    CREATE TRIGGER IF NOT EXISTS trg_hires_insert AFTER INSERT ON hires BEGIN
+        INSERT INTO cohort_progress (cohort, hires) VALUES (NEW.cohort, 1)
+        ON CONFLICT (cohort) DO UPDATE SET hires = hires + 1;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_hires_delete AFTER DELETE ON hires BEGIN
+        UPDATE cohort_progress SET hires = hires - 1 WHERE cohort = OLD.cohort;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_insert AFTER INSERT ON tasks BEGIN
+        INSERT INTO cohort_progress (cohort, tasks_total, tasks_completed)
+        VALUES (NEW.cohort, 1, NEW.status = 'completed')
+        ON CONFLICT (cohort) DO UPDATE SET tasks_total = tasks_total + 1,
+                                           tasks_completed = tasks_completed + excluded.tasks_completed;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_status AFTER UPDATE OF status ON tasks
+    WHEN (OLD.status = 'completed') != (NEW.status = 'completed') BEGIN
+        UPDATE cohort_progress
+        SET tasks_completed = tasks_completed + (CASE WHEN NEW.status = 'completed' THEN 1 ELSE -1 END)
+        WHERE cohort = NEW.cohort;
+    END;
+    CREATE TRIGGER IF NOT EXISTS trg_tasks_delete AFTER DELETE ON tasks BEGIN
+        UPDATE cohort_progress
+        SET tasks_total = tasks_total - 1, tasks_completed = tasks_completed - (OLD.status = 'completed')
+        WHERE cohort = OLD.cohort;
+    END;
+"""
+
+
+def default_hire_id(name: str, start_date: str) -> str:
+    """
+    Identify a hire by normalized name and start date when no employee id or email is available.
+
+    Two hires with the same name who start on the same day still share an id (and a checklist),
+    so callers should prefer a real employee id or email.
+    """
+    normalized = re.sub(r"\s+", " ", name.strip().lower())
+    return f"{normalized}:{start_date}"
+
+
+def cohort_for(start_date: str) -> str:
+    """Hires starting in the same ISO week form a cohort, e.g. "2026-W42"."""
+    year, week, _ = date.fromisoformat(start_date).isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+class ProgressStore:
+    """Persistent per-hire checklist progress."""
+
+    def __init__(self, path: str):
+        """
+        Open (or create) the progress database.
+
+        Args:
+            path: SQLite database file
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.executescript(SCHEMA)
+
+    def enroll(self, hire_id: str, name: str, role: str, start_date: str,
+               checklist: List[Dict[str, Any]], cohort: str = None) -> bool:
+        """
+        Give a hire their copy of the checklist.
+
+        Re-enrolling is safe: existing progress is kept and only tasks added to
+        the template since the last enrollment are inserted.
+
+        Args:
+            hire_id: Unique id of the hire
+            name: The hire's full name
+            role: The hire's job role
+            start_date: First day (YYYY-MM-DD)
+            checklist: Checklist template from settings.yaml
+            cohort: Cohort label (defaults to the ISO week of start_date)
+
+        Returns:
+            Whether the hire was newly enrolled
+        """
+        return self.enroll_many([{
+            "hire_id": hire_id, "name": name, "role": role, "start_date": start_date, "cohort": cohort
+        }], checklist) == 1
+
+    def enroll_many(self, hires: Iterable[Dict[str, Any]], checklist: List[Dict[str, Any]]) -> int:
+        """
+        Enroll many hires in one transaction.
+
+        Args:
+            hires: Dicts with hire_id, name, role, start_date and optionally cohort
+            checklist: Checklist template from settings.yaml
+
+        Returns:
+            Number of hires that were newly enrolled
+        """
+        hire_rows = []
+        task_rows = []
+        for hire in hires:
+            cohort = hire.get('cohort') or cohort_for(hire['start_date'])
+            start = date.fromisoformat(hire['start_date'])
+            hire_rows.append((hire['hire_id'], hire['name'], hire['role'], cohort, hire['start_date']))
+            for position, item in enumerate(checklist):
+                due_day = item.get('due_day')
+                due_date = (start + timedelta(days=due_day)).isoformat() if due_day is not None else None
+                status = STATUS_COMPLETED if item.get('status') == STATUS_COMPLETED else STATUS_PENDING
+                task_rows.append((hire['hire_id'], item['task'], position, cohort, status, due_date))
+
+        with self._lock, self._conn:
+            # rowcount excludes rows written by the cohort triggers
+            enrolled = self._conn.executemany(
+                "INSERT OR IGNORE INTO hires (hire_id, name, role, cohort, start_date) VALUES (?, ?, ?, ?, ?)",
+                hire_rows
+            ).rowcount
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tasks (hire_id, task, position, cohort, status, due_date) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                task_rows
+            )
+        return enrolled
+
+    def checklist(self, hire_id: str) -> List[Dict[str, Any]]:
+        """
+        A hire's checklist in template order.
+
+        Args:
+            hire_id: Unique id of the hire
+
+        Returns:
+            Dicts with task, status, due_date and completed_at (empty if not enrolled)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT task, status, due_date, completed_at FROM tasks WHERE hire_id = ? ORDER BY position",
+                (hire_id,)
+            ).fetchall()
+        return [{"task": task, "status": status, "due_date": due_date, "completed_at": completed_at}
+                for task, status, due_date, completed_at in rows]
+
+    def mark_complete(self, hire_id: str, task: str) -> bool:
+        """
+        Mark a task complete.
+
+        Args:
+            hire_id: Unique id of the hire
+            task: Task name as in the checklist template
+
+        Returns:
+            Whether the task was pending (False if already complete or unknown)
+        """
+        return self.mark_complete_many([(hire_id, task)]) == 1
+
+    def mark_complete_many(self, tasks: Iterable[Tuple[str, str]]) -> int:
+        """
+        Mark many tasks complete in one transaction, e.g. when importing from an HR system.
+
+        Args:
+            tasks: (hire_id, task) pairs
+
+        Returns:
+            Number of tasks that were pending
+        """
+        completed_at = datetime.now().isoformat(timespec="seconds")
+        return self._set_status(((STATUS_COMPLETED, completed_at, hire_id, task, STATUS_COMPLETED)
+                                 for hire_id, task in tasks))
+
+    def mark_pending(self, hire_id: str, task: str) -> bool:
+        """
+        Reopen a completed task.
+
+        Args:
+            hire_id: Unique id of the hire
+            task: Task name as in the checklist template
+
+        Returns:
+            Whether the task was complete (False if already pending or unknown)
+        """
+        return self._set_status([(STATUS_PENDING, None, hire_id, task, STATUS_PENDING)]) == 1
+
+    def _set_status(self, rows: Iterable[Tuple[str, Optional[str], str, str, str]]) -> int:
+        """Apply (status, completed_at, hire_id, task, status) updates; returns how many tasks changed."""
+        with self._lock, self._conn:
+            return self._conn.executemany(
+                "UPDATE tasks SET status = ?, completed_at = ? WHERE hire_id = ? AND task = ? AND status != ?", rows
+            ).rowcount
+
+    def completion_by_cohort(self, cohorts: List[str] = None) -> List[Dict[str, Any]]:
+        """
+        Task completion rate per cohort.
+
+        Args:
+            cohorts: Cohorts to report (defaults to all)
+
+        Returns:
+            Dicts with cohort, hires, tasks_total, tasks_completed and completion_rate
+        """
+        query = "SELECT cohort, hires, tasks_total, tasks_completed FROM cohort_progress"
+        params = ()
+        if cohorts:
+            query += f" WHERE cohort IN ({', '.join('?' * len(cohorts))})"
+            params = tuple(cohorts)
+        with self._lock:
+            rows = self._conn.execute(query + " ORDER BY cohort", params).fetchall()
+        return [{
+            "cohort": cohort,
+            "hires": hires,
+            "tasks_total": total,
+            "tasks_completed": completed,
+            "completion_rate": completed / total if total else 0.0
+        } for cohort, hires, total, completed in rows]
+
+    def overdue_tasks(self, as_of: str = None, cohort: str = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Pending tasks past their due date, most overdue first.
+
+        Args:
+            as_of: Reference date (defaults to today)
+            cohort: Only report this cohort (optional)
+            limit: Maximum number of tasks to return
+
+        Returns:
+            Dicts with hire_id, name, cohort, task and due_date
+        """
+        where, params = self._overdue_filter(as_of, cohort)
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT t.hire_id, h.name, t.cohort, t.task, t.due_date "
+                "FROM tasks AS t JOIN hires AS h ON h.hire_id = t.hire_id "
+                f"WHERE {where} ORDER BY t.due_date LIMIT ?",
+                params + (limit,)
+            ).fetchall()
+        return [{"hire_id": hire_id, "name": name, "cohort": task_cohort, "task": task, "due_date": due_date}
+                for hire_id, name, task_cohort, task, due_date in rows]
+
+    def count_overdue(self, as_of: str = None, cohort: str = None) -> int:
+        """
+        Number of pending tasks past their due date.
+
+        Args:
+            as_of: Reference date (defaults to today)
+            cohort: Only count this cohort (optional)
+
+        Returns:
+            Overdue task count
+        """
+        where, params = self._overdue_filter(as_of, cohort)
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM tasks AS t WHERE {where}", params).fetchone()[0]
+
+    @staticmethod
+    def _overdue_filter(as_of: Optional[str], cohort: Optional[str]):
+        """WHERE clause matching the partial indexes on pending tasks."""
+        where = "t.status = 'pending' AND t.due_date < ?"
+        params = (as_of or date.today().isoformat(),)
+        if cohort:
+            where += " AND t.cohort = ?"
+            params += (cohort,)
+        return where, params
+
+    def pending_hires(self, task: str, limit: int = 100) -> List[str]:
+        """
+        Hires who have not completed a task.
+
+        Args:
+            task: Task name as in the checklist template
+            limit: Maximum number of hire ids to return
+
+        Returns:
+            Hire ids
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT hire_id FROM tasks WHERE task = ? AND status = 'pending' LIMIT ?", (task, limit)
+            ).fetchall()
+        return [hire_id for (hire_id,) in rows]
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,243 @@
+"""
+Cohort schedule solver for the AI Onboarding System.
+
+The schedule template in settings.yaml lists sessions per day ("day1",
+"day2", ... in any number). The same activity may be offered several times,
+and each offering can have a seat capacity, a duration, a role filter and
+prerequisite activities. Hires are placed one at a time into the earliest
+offering of each activity that still has seats, starts after their
+prerequisites end and does not clash with their other sessions.
+
+Finding that offering uses a bisect on start times plus a union-find "next
+offering with free seats" table per activity. Full offerings are skipped in
+near-constant time, so placing a hire stays cheap even when a large cohort
+has filled most of the early sessions.
+"""
+
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+MINUTES_PER_DAY = 24 * 60
+DEFAULT_DURATION_MINUTES = 60
+DAY_KEY = re.compile(r"^day(\d+)$")
+
+
+@dataclass
+class Offering:
+    """One scheduled occurrence of an activity."""
+
+    activity: str
+    day: int
+    time: str
+    start: int
+    duration: int = DEFAULT_DURATION_MINUTES
+    capacity: Optional[int] = None
+    roles: Tuple[str, ...] = ()
+    requires: Tuple[str, ...] = ()
+    booked: int = 0
+
+    @property
+    def end(self) -> int:
+        """Minutes from the start of day 1 at which the session ends."""
+        return self.start + self.duration
+
+    @property
+    def full(self) -> bool:
+        """Whether every seat is taken."""
+        return self.capacity is not None and self.booked >= self.capacity
+
+    def to_dict(self, start_date: str = None) -> Dict[str, Any]:
+        """Plain view of the offering, with its calendar date when start_date is given."""
+        entry = {"day": self.day, "time": self.time, "activity": self.activity}
+        if start_date:
+            entry["date"] = (date.fromisoformat(start_date) + timedelta(days=self.day - 1)).isoformat()
+        return entry
+
+
+def schedule_days(template: Dict[str, Any]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    """
+    Days of a schedule template in order.
+
+    Args:
+        template: A schedule from settings.yaml, e.g. settings['schedules']['default']
+
+    Returns:
+        List of (day number, entries) sorted by day
+    """
+    days = []
+    for key, entries in template.items():
+        match = DAY_KEY.match(str(key))
+        if not match:
+            raise ValueError(f"Schedule keys must look like 'day1', 'day2', ...; got '{key}'")
+        days.append((int(match.group(1)), list(entries or [])))
+    return sorted(days, key=lambda day: day[0])
+
+
+def parse_offerings(template: Dict[str, Any]) -> List[Offering]:
+    """
+    Turn a schedule template into offerings.
+
+    Args:
+        template: A schedule from settings.yaml
+
+    Returns:
+        Offerings sorted by start time
+    """
+    offerings = []
+    for day, entries in schedule_days(template):
+        for entry in entries:
+            clock = datetime.strptime(entry['time'].strip().upper(), "%I:%M %p")
+            offerings.append(Offering(
+                activity=entry['activity'],
+                day=day,
+                time=entry['time'],
+                start=(day - 1) * MINUTES_PER_DAY + clock.hour * 60 + clock.minute,
+                duration=entry.get('duration_minutes', DEFAULT_DURATION_MINUTES),
+                capacity=entry.get('capacity'),
+                roles=tuple(role.lower() for role in entry.get('roles', ())),
+                requires=tuple(entry.get('requires', ()))
+            ))
+    return sorted(offerings, key=lambda offering: offering.start)
+
+
+class _NextFree:
+    """Union-find over an activity's offerings: find(i) is the first offering at or after i with free seats."""
+
+    def __init__(self, size: int):
+        # Index size is a sentinel meaning "no offering left"
+        self.parent = list(range(size + 1))
+
+    def find(self, index: int) -> int:
+        parent = self.parent
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    def close(self, index: int) -> None:
+        """Mark an offering full so searches skip past it."""
+        self.parent[index] = index + 1
+
+
+@dataclass
+class Placement:
+    """A hire's sessions, plus the activities that could not be scheduled."""
+
+    sessions: List[Offering] = field(default_factory=list)
+    waitlisted: List[str] = field(default_factory=list)
+
+
+class CohortScheduler:
+    """Assigns the hires of one cohort to capacity-limited sessions."""
+
+    def __init__(self, template: Dict[str, Any]):
+        """
+        Parse the template and prepare the per-activity indexes.
+
+        Args:
+            template: A schedule from settings.yaml, e.g. settings['schedules']['default']
+        """
+        self.offerings = parse_offerings(template)
+
+        # Offerings of each activity in start order, with their start times for bisect
+        self._by_activity: Dict[str, List[Offering]] = {}
+        for offering in self.offerings:
+            self._by_activity.setdefault(offering.activity, []).append(offering)
+        self._starts = {activity: [o.start for o in items] for activity, items in self._by_activity.items()}
+        self._free = {activity: _NextFree(len(items)) for activity, items in self._by_activity.items()}
+
+        # Requirements and role filters apply to the activity, taken from any offering that sets them
+        self._requires = {activity: tuple(sorted({r for o in items for r in o.requires}))
+                          for activity, items in self._by_activity.items()}
+        self._roles = {activity: tuple(sorted({r for o in items for r in o.roles}))
+                       for activity, items in self._by_activity.items()}
+        self.order = self._topological_order()
+        self.waitlisted: Dict[str, int] = {activity: 0 for activity in self.order}
+
+    def _topological_order(self) -> List[str]:
+        """Activities ordered so prerequisites come first; ties keep template order."""
+        for activity, requires in self._requires.items():
+            unknown = [r for r in requires if r not in self._by_activity]
+            if unknown:
+                raise ValueError(f"'{activity}' requires unknown activities: {', '.join(unknown)}")
+
+        order, placed = [], set()
+        remaining = list(self._by_activity)  # Insertion order follows the first offering's start
+        while remaining:
+            ready = [a for a in remaining if all(r in placed for r in self._requires[a])]
+            if not ready:
+                raise ValueError(f"Circular prerequisites between: {', '.join(remaining)}")
+            order.append(ready[0])
+            placed.add(ready[0])
+            remaining.remove(ready[0])
+        return order
+
+    def applies_to(self, activity: str, role: str) -> bool:
+        """Whether a hire with this role attends the activity."""
+        roles = self._roles[activity]
+        return not roles or role.lower() in roles
+
+    def assign(self, role: str) -> Placement:
+        """
+        Place one hire in the earliest feasible offering of every activity for their role.
+
+        Args:
+            role: The hire's job role
+
+        Returns:
+            The hire's sessions in time order and any waitlisted activities
+        """
+        placement = Placement()
+        booked: Dict[str, Offering] = {}
+        for activity in self.order:
+            if not self.applies_to(activity, role):
+                continue
+
+            # A prerequisite the hire could not get a seat for blocks its dependants as well
+            requires = [r for r in self._requires[activity] if self.applies_to(r, role)]
+            if any(r not in booked for r in requires):
+                placement.waitlisted.append(activity)
+                self.waitlisted[activity] += 1
+                continue
+
+            offering = self._first_available(activity, max((booked[r].end for r in requires), default=0),
+                                             booked.values())
+            if offering is None:
+                placement.waitlisted.append(activity)
+                self.waitlisted[activity] += 1
+                continue
+            booked[activity] = offering
+
+        placement.sessions = sorted(booked.values(), key=lambda offering: offering.start)
+        return placement
+
+    def _first_available(self, activity: str, earliest: int, booked) -> Optional[Offering]:
+        """Book the first offering starting at or after earliest with a free seat and no clash."""
+        items = self._by_activity[activity]
+        free = self._free[activity]
+        index = free.find(bisect_left(self._starts[activity], earliest))
+        while index < len(items):
+            offering = items[index]
+            if not any(offering.start < other.end and other.start < offering.end for other in booked):
+                offering.booked += 1
+                if offering.full:
+                    free.close(index)
+                return offering
+            index = free.find(index + 1)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Seats booked per activity and how many hires were waitlisted for each."""
+        activities = {}
+        for activity, items in self._by_activity.items():
+            capacity = [o.capacity for o in items]
+            activities[activity] = {
+                "offerings": len(items),
+                "booked": sum(o.booked for o in items),
+                "capacity": None if None in capacity else sum(capacity),
+                "waitlisted": self.waitlisted[activity]
+            }
+        return activities
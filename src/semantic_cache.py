@@ -0,0 +1,139 @@
+"""
+Semantic question cache for the AI Onboarding System.
+
+Paraphrased questions ("how many vacation days", "PTO allowance?") are matched
+against previously answered ones by embedding similarity, so the LLM call can
+be skipped. Entries live in an in-memory matrix with LRU eviction. The cache
+empties itself when the corpus, the answer settings or the embedding size
+change.
+"""
+
+import threading
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence
+
+
+class SemanticCache:
+    """In-memory nearest-question cache with LRU eviction and hit statistics."""
+
+    def __init__(self, similarity_threshold: float, max_entries: int):
+        """
+        Create an empty cache.
+
+        Args:
+            similarity_threshold: Minimum cosine similarity for a cached question to count as a match
+            max_entries: Maximum number of cached questions
+        """
+        self.similarity_threshold = similarity_threshold
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        self._matrix = None
+        self._doc_types = np.empty(max_entries, dtype=object)
+        self._active = np.zeros(max_entries, dtype=bool)
+        self._entries: "OrderedDict[int, Dict[str, Any]]" = OrderedDict()
+        self._version = None
+
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    def lookup(self, embedding: Sequence[float], doc_type: Optional[str], corpus_version: str,
+               settings: str = None) -> Optional[str]:
+        """
+        Find the answer to the most similar cached question.
+
+        Args:
+            embedding: Query embedding already computed for retrieval
+            doc_type: Document type filter of the question
+            corpus_version: Current corpus version; a change empties the cache
+            settings: Signature of the model and prompt settings answers depend on; a change empties the cache
+
+        Returns:
+            The cached answer, or None if no cached question is similar enough
+        """
+        with self._lock:
+            self._check_version(corpus_version, settings)
+            query = self._normalize(embedding)
+            if self._matrix is not None and self._matrix.shape[1] != query.shape[0]:
+                # Another embedding model; its vectors cannot be compared with the cached ones
+                self._matrix = None
+                self._clear()
+            if not self._entries:
+                self.misses += 1
+                return None
+
+            scores = self._matrix @ query
+            scores[~(self._active & (self._doc_types == doc_type))] = -np.inf
+            row = int(np.argmax(scores))
+
+            if scores[row] < self.similarity_threshold:
+                self.misses += 1
+                return None
+
+            entry = self._entries[row]
+            self._entries.move_to_end(row)
+            self.hits += 1
+            self.latency_saved += entry["generation_seconds"]
+            return entry["answer"]
+
+    def store(self, embedding: Sequence[float], question: str, answer: str, doc_type: Optional[str],
+              corpus_version: str, generation_seconds: float, settings: str = None) -> None:
+        """
+        Cache an answered question, evicting the least recently used entry when full.
+
+        Args:
+            embedding: Query embedding of the question
+            question: The question text
+            answer: The generated answer
+            doc_type: Document type filter of the question
+            corpus_version: Corpus version the answer was generated from
+            generation_seconds: Time the LLM took, credited as saved on each hit
+            settings: Signature of the model and prompt settings the answer was generated with
+        """
+        with self._lock:
+            self._check_version(corpus_version, settings)
+            vector = self._normalize(embedding)
+            if self._matrix is None or self._matrix.shape[1] != vector.shape[0]:
+                self._matrix = np.zeros((self.max_entries, vector.shape[0]), dtype=np.float32)
+                self._clear()
+
+            if len(self._entries) < self.max_entries:
+                row = int(np.argmin(self._active))
+            else:
+                row, _ = self._entries.popitem(last=False)
+
+            self._matrix[row] = vector
+            self._doc_types[row] = doc_type
+            self._active[row] = True
+            self._entries[row] = {"question": question, "answer": answer, "generation_seconds": generation_seconds}
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit-rate and latency-saved counters."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "latency_saved_seconds": self.latency_saved
+        }
+
+    def _check_version(self, corpus_version: str, settings: Optional[str]) -> None:
+        """Forget every cached answer once the corpus or the answer settings change."""
+        if (corpus_version, settings) != self._version:
+            self._version = (corpus_version, settings)
+            self._clear()
+
+    def _clear(self) -> None:
+        """Drop all entries while keeping the counters."""
+        self._entries.clear()
+        self._active[:] = False
+        self._doc_types[:] = None
+
+    @staticmethod
+    def _normalize(embedding: Sequence[float]) -> np.ndarray:
+        """Return the embedding as a unit-length float32 vector."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
@@ -0,0 +1,333 @@
+"""
+HTTP/WebSocket server for the AI Onboarding System.
+
+One process serves many new hires. Every session shares the same
+AsyncOnboardingAgent, and with it one warm embedder and one vector store.
+Admission control caps the number of commands running at once and rejects
+work beyond a bounded queue with 503 instead of letting latency grow.
+"""
+
+import time
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from aiohttp import WSMsgType, web
+
+from src.async_agent import AsyncOnboardingAgent, OnboardingSession
+from src.metrics import get_metrics
+from src.utils import strip_colors
+
+# REPL commands that map directly onto a rendered section
+SECTION_COMMANDS = ("checklist", "resources", "schedule", "email", "help")
+
+
+class Overloaded(Exception):
+    """Raised when admission control turns a request away."""
+
+
+class AdmissionController:
+    """Caps concurrently running commands, with a bounded wait queue."""
+
+    def __init__(self, max_concurrent: int, max_queued: int):
+        """
+        Args:
+            max_concurrent: Commands allowed to run at the same time
+            max_queued: Commands allowed to wait for a slot; further ones are rejected
+        """
+        self.max_concurrent = max_concurrent
+        self.max_queued = max_queued
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queued = 0
+        self.rejected = 0
+
+    @asynccontextmanager
+    async def slot(self):
+        """Hold a slot for the duration of a command, or raise Overloaded."""
+        if self.queued >= self.max_queued and self._semaphore.locked():
+            self.rejected += 1
+            raise Overloaded()
+
+        self.queued += 1
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queued -= 1
+
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self._semaphore.release()
+
+
+class SessionRegistry:
+    """In-memory onboarding sessions with idle expiry and a size cap."""
+
+    def __init__(self, max_sessions: int, ttl_seconds: float):
+        """
+        Args:
+            max_sessions: Maximum number of live sessions
+            ttl_seconds: Idle time after which a session is dropped
+        """
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._sessions: Dict[str, OnboardingSession] = {}
+        self._last_seen: Dict[str, float] = {}
+
+    def __len__(self) -> int:
+        """Number of live sessions."""
+        return len(self._sessions)
+
+    def add(self, session: OnboardingSession) -> bool:
+        """Register a session; returns False if the registry is full."""
+        self.expire()
+        if len(self._sessions) >= self.max_sessions:
+            return False
+        self._sessions[session.session_id] = session
+        self._last_seen[session.session_id] = time.monotonic()
+        return True
+
+    def get(self, session_id: str) -> Optional[OnboardingSession]:
+        """Look up a live session and refresh its idle timer."""
+        session = self._sessions.get(session_id)
+        if session is not None:
+            self._last_seen[session_id] = time.monotonic()
+        return session
+
+    def remove(self, session_id: str) -> bool:
+        """Drop a session; returns False if it did not exist."""
+        self._last_seen.pop(session_id, None)
+        return self._sessions.pop(session_id, None) is not None
+
+    def expire(self) -> int:
+        """Drop idle sessions and return how many were removed."""
+        cutoff = time.monotonic() - self.ttl_seconds
+        expired = [session_id for session_id, seen in self._last_seen.items() if seen < cutoff]
+        for session_id in expired:
+            self.remove(session_id)
+        return len(expired)
+
+
+def _session_info(session: OnboardingSession) -> Dict[str, Any]:
+    """Public view of a session."""
+    return {**session.user_context, "session_id": session.session_id,
+            "questions": len(session.interaction_history)}
+
+
+def _text_field(body: Dict[str, Any], key: str) -> Optional[str]:
+    """A stripped string field of a JSON body, None if absent or null; any other type answers 400."""
+    value = body.get(key)
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise web.HTTPBadRequest(text=f"'{key}' must be a string.")
+    return value.strip()
+
+
+class OnboardingServer:
+    """aiohttp application exposing the onboarding commands per session."""
+
+    def __init__(self, agent: AsyncOnboardingAgent = None):
+        """
+        Args:
+            agent: Shared agent; one is created from config.json if omitted
+        """
+        self.agent = agent if agent is not None else AsyncOnboardingAgent()
+        server_config = self.agent.config.get('server', {})
+        self.admission = AdmissionController(
+            server_config.get('max_concurrent_requests', 16),
+            server_config.get('max_queued_requests', 64)
+        )
+        self.sessions = SessionRegistry(
+            server_config.get('max_sessions', 1000),
+            server_config.get('session_ttl_seconds', 3600)
+        )
+
+    def build_app(self) -> web.Application:
+        """Create the aiohttp application."""
+        app = web.Application(middlewares=[self._admission_middleware])
+        app.add_routes([
+            web.get("/health", self.health),
+            web.get("/metrics", self.metrics),
+            web.post("/sessions", self.create_session),
+            web.get("/sessions/{session_id}", self.get_session),
+            web.delete("/sessions/{session_id}", self.delete_session),
+            web.post("/sessions/{session_id}/ask", self.ask),
+            web.post("/sessions/{session_id}/checklist/{number}", self.complete_task),
+            web.get("/sessions/{session_id}/ws", self.websocket),
+            web.get("/sessions/{session_id}/{command}", self.section),
+        ])
+        app.on_cleanup.append(self._close_agent)
+        return app
+
+    @web.middleware
+    async def _admission_middleware(self, request: web.Request, handler):
+        """Run command endpoints under admission control."""
+        if (request.method == "GET" and request.path.endswith("/ws")) or request.path in ("/health", "/metrics"):
+            return await handler(request)
+        try:
+            async with self.admission.slot():
+                return await handler(request)
+        except Overloaded:
+            return web.json_response({"error": "Server is busy, retry shortly."}, status=503,
+                                     headers={"Retry-After": "1"})
+
+    async def health(self, request: web.Request) -> web.Response:
+        """Liveness and load counters."""
+        return web.json_response({
+            "status": "ok",
+            "sessions": len(self.sessions),
+            "in_flight": self.admission.in_flight,
+            "queued": self.admission.queued,
+            "rejected": self.admission.rejected
+        })
+
+    async def metrics(self, request: web.Request) -> web.Response:
+        """Stage latency metrics in the Prometheus text format, or as JSON with ?format=json."""
+        metrics = get_metrics()
+        if request.query.get('format') == "json":
+            return web.json_response({"enabled": metrics.enabled, "metrics": metrics.snapshot()})
+        return web.Response(body=metrics.render_prometheus().encode("utf-8"),
+                            headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"})
+
+    async def create_session(self, request: web.Request) -> web.Response:
+        """Start a session from {"name", "role", "start_date"?, "hire_id"?}."""
+        body = await self._json_body(request)
+        name, role, start_date, hire_id = (_text_field(body, key) for key in ("name", "role", "start_date", "hire_id"))
+        if not name or not role:
+            raise web.HTTPBadRequest(text="Both 'name' and 'role' are required.")
+
+        session = self.agent.create_session(name, role, start_date, hire_id)
+        if not self.sessions.add(session):
+            return web.json_response({"error": "Session limit reached."}, status=503, headers={"Retry-After": "5"})
+        return web.json_response(_session_info(session), status=201)
+
+    async def get_session(self, request: web.Request) -> web.Response:
+        """Return a session's details."""
+        return web.json_response(_session_info(self._session(request)))
+
+    async def delete_session(self, request: web.Request) -> web.Response:
+        """End a session."""
+        if not self.sessions.remove(request.match_info['session_id']):
+            raise web.HTTPNotFound(text="Unknown session.")
+        return web.Response(status=204)
+
+    async def ask(self, request: web.Request) -> web.Response:
+        """Answer {"question"} for a session."""
+        session = self._session(request)
+        question = _text_field(await self._json_body(request), 'question')
+        if not question:
+            raise web.HTTPBadRequest(text="'question' is required.")
+
+        result = await self.agent.ask(session, question)
+        return web.json_response({**result, **{
+            key: session.interaction_history[-1][key] for key in ("ttft_seconds", "total_seconds")
+        }})
+
+    async def complete_task(self, request: web.Request) -> web.Response:
+        """Mark the numbered checklist task complete and return the checklist; 400/404 for bad numbers."""
+        session = self._session(request)
+        number = request.match_info['number']
+        if not number.isdigit():
+            return web.json_response({"error": "Task number must be a positive integer."}, status=400)
+        checklist = await self.agent.checklist(session)
+        if not 1 <= int(number) <= len(checklist):
+            return web.json_response({"error": f"No task {number}; choose a number between 1 and {len(checklist)}."},
+                                     status=404)
+
+        output = await self.agent.handle_command(session, f"done {number}")
+        return web.json_response({"command": "done", "output": strip_colors(output)})
+
+    async def section(self, request: web.Request) -> web.Response:
+        """Render the checklist, resources, schedule, email or help section."""
+        session = self._session(request)
+        command = request.match_info['command']
+        if command not in SECTION_COMMANDS:
+            raise web.HTTPNotFound(text=f"Unknown command. Available: {', '.join(SECTION_COMMANDS)}.")
+
+        output = await self.agent.handle_command(session, command)
+        return web.json_response({"command": command, "output": strip_colors(output)})
+
+    async def websocket(self, request: web.Request) -> web.WebSocketResponse:
+        """
+        Interactive session over a WebSocket.
+
+        Each text message is a REPL command ("ask ...", "checklist", ...). Answers
+        are streamed as {"type": "token"} messages; every command ends with an
+        {"type": "output"} or {"type": "error"} message.
+        """
+        session = self._session(request)
+        ws = web.WebSocketResponse(heartbeat=30)
+        await ws.prepare(request)
+
+        async def send_token(token: str):
+            await ws.send_json({"type": "token", "text": token})
+
+        async for message in ws:
+            if message.type != WSMsgType.TEXT:
+                continue
+            command = message.data.strip()
+            if command.lower() in ("exit", "quit"):
+                break
+
+            try:
+                async with self.admission.slot():
+                    self.sessions.get(session.session_id)
+                    if command.lower().startswith("ask "):
+                        result = await self.agent.ask(session, command[4:].strip(), send_token)
+                        await ws.send_json({"type": "output", "command": "ask", **result})
+                    else:
+                        output = await self.agent.handle_command(session, command)
+                        await ws.send_json({"type": "output", "command": command.lower(), "output": strip_colors(output)})
+            except Overloaded:
+                await ws.send_json({"type": "error", "error": "Server is busy, retry shortly."})
+            except Exception as e:
+                await ws.send_json({"type": "error", "error": str(e)})
+
+        await ws.close()
+        return ws
+
+    def _session(self, request: web.Request) -> OnboardingSession:
+        """Resolve the session named in the URL or answer 404."""
+        session = self.sessions.get(request.match_info['session_id'])
+        if session is None:
+            raise web.HTTPNotFound(text="Unknown session.")
+        return session
+
+    @staticmethod
+    async def _json_body(request: web.Request) -> Dict[str, Any]:
+        """Parse a JSON object body or answer 400."""
+        try:
+            body = await request.json()
+        except ValueError:
+            raise web.HTTPBadRequest(text="Request body must be JSON.")
+        if not isinstance(body, dict):
+            raise web.HTTPBadRequest(text="Request body must be a JSON object.")
+        return body
+
+    async def _close_agent(self, app: web.Application):
+        """Release the agent's clients on shutdown."""
+        await self.agent.close()
+
+
+def run_server(host: str = None, port: int = None):
+    """
+    Serve the onboarding agent until interrupted.
+
+    Args:
+        host: Interface to bind (defaults to server.host)
+        port: Port to bind (defaults to server.port)
+    """
+    # Show per-request log lines, such as the prompt size of every LLM call and aiohttp's access log
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(levelname)s %(message)s")
+
+    server = OnboardingServer()
+    server_config = server.agent.config.get('server', {})
+    web.run_app(
+        server.build_app(),
+        host=host or server_config.get('host', '127.0.0.1'),
+        port=port or server_config.get('port', 8080)
+    )
@@ -0,0 +1,82 @@
+"""Tests for the terminal agent's handling of question-answering failures."""
+
+import builtins
+import logging
+
+import pytest
+
+from src.agent import OnboardingAgent
+
+
+@pytest.fixture
+def agent(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # progress.path is relative
+    agent = OnboardingAgent()
+    agent.user_context = {"name": "Ada Lovelace", "role": "Software Engineer", "start_date": "2026-10-19",
+                          "hire_id": "ada"}
+
+    def missing_key():
+        raise RuntimeError("GROQ_API_KEY is not set")
+
+    monkeypatch.setattr(agent, "_ensure_rag", missing_key)
+    return agent
+
+
+def test_setup_failure_is_reported_and_the_session_continues(agent, monkeypatch, capsys):
+    commands = iter(["ask how many vacation days?", "help", "exit"])
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(commands))
+
+    agent._main_interaction_loop()
+
+    output = capsys.readouterr().out
+    assert "Could not answer the question: GROQ_API_KEY is not set" in output
+    assert "Goodbye!" in output
+    assert agent.interaction_history == []
+
+
+def test_failure_mid_stream_closes_the_answer_box(agent, monkeypatch, capsys):
+    def broken_stream(question, on_token=None):
+        on_token("Twenty ")
+        raise ConnectionError("stream dropped")
+
+    monkeypatch.setattr(agent, "_answer_question", broken_stream)
+    agent.config = {**agent.config, "llm": {**agent.config["llm"], "stream": True}}
+
+    agent._handle_question("How many vacation days?")
+
+    output = capsys.readouterr().out
+    assert output.index("Twenty") < output.index("╯") < output.index("stream dropped")
+
+
+def test_warm_up_failure_is_logged(agent, caplog):
+    with caplog.at_level(logging.WARNING, logger="src.agent"):
+        agent._warm_up()
+    assert "Warm-up failed, the first question will retry: GROQ_API_KEY is not set" in caplog.text
+
+
+@pytest.mark.parametrize("employee_id, start_date, hire_id", [
+    ("A-1042", "2026-10-19", "a-1042"),
+    ("", "2026-10-19", "ada lovelace:2026-10-19"),
+])
+def test_hire_id_prefers_the_employee_id(agent, monkeypatch, employee_id, start_date, hire_id):
+    answers = iter(["Ada Lovelace", "Software Engineer", employee_id, "19/10/2026", start_date])
+    monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+
+    agent._collect_initial_info()
+
+    assert agent.user_context["start_date"] == "2026-10-19"
+    assert agent.user_context["hire_id"] == hire_id
+    assert agent.progress.checklist(hire_id)
+
+
+def test_same_name_hires_on_different_start_dates_keep_separate_checklists(agent, monkeypatch):
+    hire_ids = []
+    for start_date in ("2026-10-19", "2026-11-02"):
+        answers = iter(["Ada Lovelace", "Software Engineer", "", start_date])
+        monkeypatch.setattr(builtins, "input", lambda prompt="": next(answers))
+        agent._collect_initial_info()
+        hire_ids.append(agent.user_context["hire_id"])
+
+    assert agent.progress.mark_complete(hire_ids[0], "Attend orientation session")
+    statuses = {item["task"]: item["status"] for item in agent.progress.checklist(hire_ids[1])}
+    assert statuses["Attend orientation session"] == "pending"
@@ -0,0 +1,41 @@
+"""Tests for the persistent answer cache and its keys."""
+
+import time
+
+from src.answer_cache import AnswerCache
+from src.chunking import Chunker
+from src.context import ContextBuilder
+
+LLM = {"model": "llama", "temperature": 0.2}
+
+
+def test_keys_ignore_question_formatting_but_not_retrieval():
+    key = AnswerCache.make_key("How many vacation days?", "hr", ["a", "b"], LLM)
+    assert AnswerCache.make_key("  how many VACATION days ", "hr", ["a", "b"], LLM) == key
+    assert AnswerCache.make_key("How many vacation days?", "hr", ["b", "a"], LLM) != key
+    assert AnswerCache.make_key("How many vacation days?", None, ["a", "b"], LLM) != key
+    assert AnswerCache.make_key("How many vacation days?", "hr", ["a", "b"], {**LLM, "temperature": 0}) != key
+
+
+def test_keys_depend_on_how_the_context_is_packed():
+    def key(builder):
+        return AnswerCache.make_key("How many vacation days?", "hr", ["a", "b"], LLM, builder.signature)
+
+    default = key(ContextBuilder(1024))
+    assert key(ContextBuilder(1024)) == default
+    assert key(ContextBuilder(256)) != default
+    assert key(ContextBuilder(1024, Chunker(splitter="punkt"))) != default
+
+
+def test_answers_are_scoped_to_the_corpus_version_and_expire(tmp_path):
+    cache = AnswerCache(str(tmp_path / "answers.sqlite"), ttl_seconds=0.2)
+    cache.put("key", "Twenty days.", "v1")
+
+    assert cache.get("key", "v1") == "Twenty days."
+    assert cache.get("key", "v2") is None
+    assert cache.invalidate("v2") == 1
+    assert cache.get("key", "v1") is None
+
+    cache.put("key", "Twenty days.", "v2")
+    time.sleep(0.25)
+    assert cache.get("key", "v2") is None
@@ -0,0 +1,55 @@
+"""Tests for batch onboarding pack generation."""
+
+import json
+
+from src.batch_packs import generate_packs, read_hires
+
+
+def write_lines(path, lines):
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    return str(path)
+
+
+def test_jsonl_rows_are_validated_per_line(tmp_path):
+    hires = write_lines(tmp_path / "hires.jsonl", [
+        json.dumps({"name": "Ada Lovelace", "role": "Software Engineer", "start_date": "2026-11-02"}),
+        json.dumps({"hire_id": 12345, "name": "Alan Turing", "role": "Data Scientist", "start_date": "2026-11-02"}),
+        json.dumps({"name": ["not", "a", "name"], "role": "Designer"}),
+        json.dumps({"name": "Grace Hopper", "role": True}),
+        "{not json",
+        json.dumps(["a", "list"]),
+        json.dumps({"name": "No Role"}),
+    ])
+    output = tmp_path / "packs.jsonl"
+
+    stats = generate_packs(hires, str(output), "json", workers=1)
+
+    assert (stats["hires"], stats["packs"], stats["errors"]) == (7, 2, 5)
+    assert [error["line"] for error in stats["error_samples"]] == [3, 4, 5, 6, 7]
+    assert stats["error_samples"][0]["error"] == "'name' must be a string"
+    assert stats["error_samples"][1]["error"] == "'role' must be a string"
+
+    packs = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+    assert [pack["hire_id"] for pack in packs] == [None, "12345"]
+    assert set(packs[0]["sections"]) == {"email", "schedule", "resources"}
+
+
+def test_bad_rows_do_not_stop_a_multi_process_batch(tmp_path):
+    rows = [json.dumps({"name": f"Hire {i}", "role": "Software Engineer", "start_date": "2026-11-02"})
+            for i in range(20)]
+    rows[7] = json.dumps({"name": {"first": "Bad"}, "role": "Software Engineer"})
+    hires = write_lines(tmp_path / "hires.jsonl", rows)
+    output = tmp_path / "packs"
+
+    stats = generate_packs(hires, str(output), "text", sections=("email",), workers=2, chunk_size=3)
+
+    assert (stats["hires"], stats["packs"], stats["errors"]) == (20, 19, 1)
+    assert stats["error_samples"][0]["line"] == 8
+    assert len(list(output.iterdir())) == 19
+
+
+def test_csv_headers_are_case_insensitive(tmp_path):
+    hires = write_lines(tmp_path / "hires.csv", ["Name,Role,Start_Date", "Ada Lovelace,Software Engineer,2026-11-02"])
+    assert list(read_hires(hires)) == [
+        (2, {"name": "Ada Lovelace", "role": "Software Engineer", "start_date": "2026-11-02"})
+    ]
@@ -0,0 +1,111 @@
+"""Tests for sentence splitting and chunking."""
+
+import pytest
+
+from src.chunking import Chunker, split_sentences_fast
+
+
+def sentence(i, words=5):
+    """A sentence of `words` words plus a period, i.e. words + 1 estimated tokens."""
+    return " ".join([f"S{i}"] + ["word"] * (words - 1)) + "."
+
+
+def chunk_texts(chunker, pages):
+    return [text for text, _, _, _ in chunker.iter_chunks(iter(pages))]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Leave starts today. It lasts two weeks.", ["Leave starts today.", "It lasts two weeks."]),
+    ("Ask Dr. Smith about it. Then e.g. Mr. Jones.", ["Ask Dr. Smith about it.", "Then e.g. Mr. Jones."]),
+    ("Signed by J. R. Tolkien on Monday. Done.", ["Signed by J. R. Tolkien on Monday.", "Done."]),
+    ("Meet at 9 a.m. Bring your badge.", ["Meet at 9 a.m. Bring your badge."]),
+    ("Pay rose 3.5 percent. Great!", ["Pay rose 3.5 percent.", "Great!"]),
+    ('He said "Stop." Then left. (Really.) Yes?', ['He said "Stop."', "Then left.", "(Really.)", "Yes?"]),
+    ("Heading\n\nBody text without a period", ["Heading", "Body text without a period"]),
+    ("lowercase after. a period is not a boundary", ["lowercase after. a period is not a boundary"]),
+    ("", []),
+])
+def test_fast_splitter(text, expected):
+    assert split_sentences_fast(text) == expected
+
+
+def test_token_estimate_counts_words_and_punctuation():
+    assert Chunker().count_tokens(["Hello, world!", "", "e.g. fine"]) == [4, 0, 5]
+
+
+def test_chunks_stay_under_budget_and_overlap():
+    chunker = Chunker(max_tokens=20, overlap_tokens=6)
+    chunks = list(chunker.iter_chunks(iter([(1, " ".join(sentence(i) for i in range(8)))])))
+
+    # Three 6-token sentences fit in 20 tokens; the last one is repeated in the next chunk
+    assert [text.split(".")[0][:2] for text, _, _, _ in chunks] == ["S0", "S2", "S4", "S6"]
+    assert all(tokens <= 20 for _, _, _, tokens in chunks)
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current[0].startswith(previous[0].split(". ")[-1])
+    assert chunks[-1][0].endswith(sentence(7))
+
+
+def test_without_overlap_every_sentence_appears_once():
+    chunker = Chunker(max_tokens=20, overlap_tokens=0)
+    text = " ".join(sentence(i) for i in range(8))
+    assert " ".join(chunk_texts(chunker, [(1, text)])) == text
+
+
+def test_overlap_gives_way_to_a_sentence_that_would_not_fit():
+    chunker = Chunker(max_tokens=12, overlap_tokens=6)
+    chunks = chunk_texts(chunker, [(1, f"{sentence(0)} {sentence(1)} {sentence(2, words=10)}")])
+    assert chunks == [f"{sentence(0)} {sentence(1)}", sentence(2, words=10)]
+
+
+def test_sentences_over_budget_are_cut_into_word_windows():
+    chunker = Chunker(max_tokens=10, overlap_tokens=0)
+    chunks = list(chunker.iter_chunks(iter([(1, " ".join(["word"] * 25) + ".")])))
+    assert [tokens for _, _, _, tokens in chunks] == [10, 10, 6]
+    assert " ".join(text for text, _, _, _ in chunks) == " ".join(["word"] * 25) + "."
+
+
+def test_sentences_strategy_groups_a_fixed_count():
+    chunker = Chunker(strategy="sentences", sentences_per_chunk=3)
+    chunks = chunk_texts(chunker, [(1, " ".join(sentence(i) for i in range(7)))])
+    assert [len(chunk.split(". ")) for chunk in chunks] == [3, 3, 1]
+
+
+def test_sentences_spanning_pages_keep_their_page_range():
+    chunker = Chunker(strategy="sentences", sentences_per_chunk=1)
+    pages = [(1, "First sentence. The second one continues"), (2, "on the next page. Third.")]
+    assert [(text, first, last) for text, first, last, _ in chunker.iter_chunks(iter(pages))] == [
+        ("First sentence.", 1, 1),
+        ("The second one continues on the next page.", 1, 2),
+        ("Third.", 2, 2),
+    ]
+
+
+def test_signature_and_validation():
+    assert Chunker(max_tokens=100, overlap_tokens=10).signature == "tokens:100:10:fast:estimate"
+    assert Chunker(strategy="sentences", sentences_per_chunk=4).signature == "sentences:4:fast"
+    with pytest.raises(ValueError, match="overlap_tokens"):
+        Chunker(max_tokens=10, overlap_tokens=10)
+    with pytest.raises(ValueError, match="Unknown chunking strategy"):
+        Chunker(strategy="paragraphs")
+    with pytest.raises(ValueError, match="Unknown sentence splitter"):
+        Chunker(splitter="spacy")
+
+
+def test_pages_without_sentence_boundaries_do_not_accumulate():
+    chunker = Chunker(max_tokens=50, overlap_tokens=0)
+    split_lengths = []
+
+    def split(text):
+        split_lengths.append(len(text))
+        return split_sentences_fast(text)
+
+    chunker.split_sentences = split
+    pages = [(page, " ".join(f"cell{page}x{i}" for i in range(30))) for page in range(1, 401)]
+    chunks = list(chunker.iter_chunks(iter(pages)))
+
+    # Each split sees at most one page plus a carry under the budget
+    longest_page = max(len(text) for _, text in pages)
+    assert max(split_lengths) <= longest_page + 50 * len("cell400x29 ")
+    assert all(tokens <= 50 for _, _, _, tokens in chunks)
+    assert " ".join(text for text, _, _, _ in chunks).split() == " ".join(text for _, text in pages).split()
+    assert chunks[-1][2] == 400
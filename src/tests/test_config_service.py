@@ -0,0 +1,112 @@
+"""Tests for the hot-reloadable configuration service."""
+
+import gc
+import json
+import os
+
+import pytest
+
+from src.config_service import ConfigService, FrozenDict, thaw
+
+
+@pytest.fixture
+def files(tmp_path):
+    config_path = tmp_path / "config.json"
+    settings_path = tmp_path / "settings.yaml"
+    config_path.write_text(json.dumps({"rag": {"query_results": 3}}))
+    settings_path.write_text("company:\n  name: Acme\n")
+    return config_path, settings_path
+
+
+def edit(path, text):
+    """Rewrite a file and move its mtime forward, so the change is seen even within one mtime tick."""
+    stat = os.stat(path)
+    path.write_text(text)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def make_service(files):
+    config_path, settings_path = files
+    return ConfigService(str(config_path), str(settings_path), check_interval=0)
+
+
+def test_snapshots_are_read_only_and_thaw_to_plain_data(files):
+    service = make_service(files)
+    config = service.config
+
+    assert isinstance(config, FrozenDict)
+    with pytest.raises(TypeError):
+        config["rag"]["query_results"] = 5
+    plain = thaw(config)
+    plain["rag"]["query_results"] = 5
+    assert service.config["rag"]["query_results"] == 3
+
+
+def test_unchanged_files_are_not_reparsed(files):
+    service = make_service(files)
+    first = service.config
+    assert service.reload_if_changed() is False
+    assert service.config is first
+
+
+def test_subscribers_receive_reloaded_snapshots(files):
+    service = make_service(files)
+    seen = []
+
+    def on_reload(config, settings):
+        seen.append((config["rag"]["query_results"], settings["company"]["name"]))
+
+    service.subscribe(on_reload)
+
+    edit(files[0], json.dumps({"rag": {"query_results": 5}}))
+    assert service.config["rag"]["query_results"] == 5
+    edit(files[1], "company:\n  name: Globex\n")
+    assert service.settings["company"]["name"] == "Globex"
+
+    assert seen == [(5, "Acme"), (5, "Globex")]
+
+
+def test_invalid_edit_keeps_the_previous_snapshot(files, capsys):
+    service = make_service(files)
+    calls = []
+    service.subscribe(lambda config, settings: calls.append(config))
+
+    edit(files[0], '{"rag": {"query_results": ')
+    assert service.config["rag"]["query_results"] == 3
+    assert calls == []
+    assert "Keeping previous config.json" in capsys.readouterr().out
+
+
+def test_failing_subscriber_does_not_break_readers_or_other_subscribers(files, capsys):
+    service = make_service(files)
+    seen = []
+
+    def reject(config, settings):
+        raise ValueError("Unknown chunking strategy 'paragraphs'")
+
+    service.subscribe(reject)
+    service.subscribe(lambda config, settings: seen.append(config["rag"]["query_results"]))
+
+    edit(files[0], json.dumps({"rag": {"query_results": 7}}))
+    assert service.config["rag"]["query_results"] == 7
+    assert seen == [7]
+    assert "reject failed: Unknown chunking strategy 'paragraphs'" in capsys.readouterr().out
+
+
+def test_bound_method_subscribers_are_held_weakly(files):
+    service = make_service(files)
+
+    class Listener:
+        calls = 0
+
+        def on_reload(self, config, settings):
+            Listener.calls += 1
+
+    listener = Listener()
+    service.subscribe(listener.on_reload)
+    del listener
+    gc.collect()
+
+    edit(files[0], json.dumps({"rag": {"query_results": 4}}))
+    assert service.reload_if_changed() is True
+    assert Listener.calls == 0
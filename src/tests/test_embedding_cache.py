@@ -0,0 +1,124 @@
+"""Tests for the persistent embedding cache."""
+
+import hashlib
+import multiprocessing
+import sqlite3
+
+import numpy as np
+import pytest
+
+from src.embedding_cache import CachedEmbeddingFunction, EmbeddingCache, cache_key
+
+DIM = 8
+
+
+def vector_for(key: str) -> np.ndarray:
+    """Deterministic vector for a key, so stored rows can be checked against their keys."""
+    seed = int(hashlib.sha256(key.encode("utf-8")).hexdigest()[:8], 16)
+    return np.random.default_rng(seed).random(DIM, dtype=np.float32)
+
+
+def stored_entries(path):
+    """{key: vector} read straight from the cache files."""
+    conn = sqlite3.connect(f"{path}/index.sqlite")
+    rows = conn.execute("SELECT key, slot FROM entries").fetchall()
+    capacity = dict(conn.execute("SELECT name, value FROM meta"))["capacity"]
+    conn.close()
+    vectors = np.memmap(f"{path}/vectors.f32", dtype=np.float32, mode="r", shape=(capacity, DIM))
+    return {key: np.array(vectors[slot]) for key, slot in rows}
+
+
+class CountingEmbedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.append(list(input))
+        return [vector_for(text) for text in input]
+
+
+def test_keys_normalize_whitespace_and_separate_models():
+    assert cache_key("model-a", "Vacation  policy\n") == cache_key("model-a", "Vacation policy")
+    assert cache_key("model-a", "Vacation policy") != cache_key("model-b", "Vacation policy")
+
+
+def test_round_trip_and_persistence(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), 10)
+    cache.put_many(["a", "b"], np.stack([vector_for("a"), vector_for("b")]))
+
+    reopened = EmbeddingCache(str(tmp_path), 10)
+    found = reopened.get_many(["a", "b", "c"])
+    assert set(found) == {"a", "b"}
+    np.testing.assert_array_equal(found["a"], vector_for("a"))
+    assert len(reopened) == 2
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = EmbeddingCache(str(tmp_path), 3)
+    for key in ["a", "b", "c"]:
+        cache.put_many([key], vector_for(key)[None, :])
+    cache.get_many(["a"])  # "b" is now the least recently used
+    cache.put_many(["d"], vector_for("d")[None, :])
+
+    assert set(cache.get_many(["a", "b", "c", "d"])) == {"a", "c", "d"}
+    np.testing.assert_array_equal(cache.get_many(["d"])["d"], vector_for("d"))
+    assert len(cache) == 3
+
+
+def test_capacity_change_starts_over(tmp_path):
+    EmbeddingCache(str(tmp_path), 5).put_many(["a"], vector_for("a")[None, :])
+    assert EmbeddingCache(str(tmp_path), 6).get_many(["a"]) == {}
+
+
+def test_cached_embedding_function_embeds_each_text_once(tmp_path):
+    embedder = CountingEmbedder()
+    cached = CachedEmbeddingFunction(embedder, EmbeddingCache(str(tmp_path), 100), "model")
+
+    first = cached(["leave", "leave", "travel"])
+    second = cached(["travel", "badge"])
+
+    assert embedder.calls == [["leave", "travel"], ["badge"]]
+    np.testing.assert_array_equal(first[0], vector_for("leave"))
+    np.testing.assert_array_equal(second[0], vector_for("travel"))
+    assert (cached.hits, cached.misses) == (2, 3)
+
+
+def _writer(path, worker, rounds, errors):
+    try:
+        cache = EmbeddingCache(path, 64)
+        for i in range(rounds):
+            keys = [f"{worker}-{i}-{j}" for j in range(5)] + [f"shared-{i % 7}"]
+            cache.put_many(keys, np.stack([vector_for(key) for key in keys]))
+            for key, vector in cache.get_many(keys + [f"{(worker + 1) % 4}-{i}-0"]).items():
+                if not np.array_equal(vector, vector_for(key)):
+                    errors.put(f"{key} read back a different vector")
+    except Exception as e:
+        errors.put(repr(e))
+
+
+def test_processes_sharing_a_cache_directory(tmp_path):
+    context = multiprocessing.get_context("fork")
+    errors = context.Queue()
+    workers = [context.Process(target=_writer, args=(str(tmp_path), worker, 50, errors)) for worker in range(4)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=120)
+
+    failures = []
+    while not errors.empty():
+        failures.append(errors.get())
+    assert failures == []
+
+    entries = stored_entries(str(tmp_path))
+    assert len(entries) == 64
+    for key, vector in entries.items():
+        np.testing.assert_array_equal(vector, vector_for(key))
+
+
+@pytest.mark.parametrize("max_entries", [1, 4])
+def test_batches_larger_than_capacity_keep_the_newest(tmp_path, max_entries):
+    cache = EmbeddingCache(str(tmp_path), max_entries)
+    keys = [f"k{i}" for i in range(6)]
+    cache.put_many(keys, np.stack([vector_for(key) for key in keys]))
+    assert set(cache.get_many(keys)) == set(keys[-max_entries:])
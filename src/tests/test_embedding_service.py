@@ -0,0 +1,127 @@
+"""Tests for the shared embedding service and its socket client."""
+
+import asyncio
+import os
+import threading
+import time
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pytest
+
+import src.embedding_service as embedding_service
+from src.embedding_service import EmbeddingService, RemoteEmbeddingFunction
+
+
+class RecordingEmbedder:
+    """Embeds a text as [length, vowels, 1] and records every batch it is given."""
+
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, input):
+        self.batches.append(list(input))
+        return [np.array([len(text), sum(text.count(v) for v in "aeiou"), 1.0], dtype=np.float32) for text in input]
+
+
+class RunningService:
+    """Serves an EmbeddingService on its own event loop thread."""
+
+    def __init__(self, service):
+        self.service = service
+        self._started = threading.Event()
+        self._thread = threading.Thread(target=asyncio.run, args=(self._main(),), daemon=True)
+        self._thread.start()
+        self._started.wait(5)
+        deadline = time.monotonic() + 5
+        while not os.path.exists(service.socket_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    async def _main(self):
+        self._loop, self._task = asyncio.get_running_loop(), asyncio.current_task()
+        self._started.set()
+        try:
+            await self.service.serve_forever()
+        except asyncio.CancelledError:
+            pass
+
+    def stop(self):
+        """Shut the service down, dropping its client connections."""
+        if self._thread.is_alive():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+            self._thread.join(5)
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    embedder = RecordingEmbedder()
+    monkeypatch.setattr(embedding_service, "build_embedding_function", lambda db_config: embedder)
+    # Service and clients share this process, so the service must not drop the clients' tracker registrations
+    monkeypatch.setattr(embedding_service, "_attach_shared_memory", lambda name: SharedMemory(name=name))
+    return embedder
+
+
+@pytest.fixture
+def start_service(tmp_path, embedder):
+    db_config = {"embedding_model": "stub-model", "embedding_backend": "numpy",
+                 "embedding_service": {"socket_path": str(tmp_path / "e.sock"), "max_wait_ms": 200}}
+    running = []
+
+    def start():
+        running.append(RunningService(EmbeddingService(db_config)))
+        return running[-1]
+
+    yield start
+    for service in running:
+        service.stop()
+
+
+def test_requests_from_two_clients_share_a_batch(start_service, embedder):
+    service = start_service().service
+    clients = [RemoteEmbeddingFunction(service.socket_path, "stub-model@numpy") for _ in range(2)]
+    results = {}
+
+    def embed(client, texts):
+        results[texts[0]] = client(texts)
+
+    threads = [threading.Thread(target=embed, args=(client, texts))
+               for client, texts in zip(clients, (["vacation", "badge"], ["parking"]))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert service.stats["batches"] == 1
+    assert sorted(embedder.batches[-1]) == ["badge", "parking", "vacation"]
+    assert [list(vector) for vector in results["vacation"]] == [[8, 4, 1], [5, 2, 1]]
+    assert [list(vector) for vector in results["parking"]] == [[7, 2, 1]]
+    for client in clients:
+        client.close()
+
+
+def test_namespace_mismatch_is_refused(start_service):
+    service = start_service().service
+    client = RemoteEmbeddingFunction(service.socket_path, expected_namespace="other-model@torch")
+
+    with pytest.raises(ValueError, match="serves stub-model@numpy, but other-model@torch is configured"):
+        client(["vacation"])
+    client.close()
+
+
+def test_missing_service_names_the_start_command(tmp_path):
+    client = RemoteEmbeddingFunction(str(tmp_path / "e.sock"))
+    with pytest.raises(ConnectionError, match="--embedding-service"):
+        client(["vacation"])
+
+
+def test_client_reconnects_after_the_service_restarts(start_service):
+    first = start_service()
+    client = RemoteEmbeddingFunction(first.service.socket_path, "stub-model@numpy", timeout=5)
+    assert [list(vector) for vector in client(["badge"])] == [[5, 2, 1]]
+
+    first.stop()
+    second = start_service()
+
+    assert [list(vector) for vector in client(["parking"])] == [[7, 2, 1]]
+    assert second.service.stats["connections"] == 1
+    client.close()
@@ -0,0 +1,64 @@
+"""Tests for BM25 retrieval and reciprocal-rank fusion."""
+
+import pytest
+
+from src.lexical_index import BM25Index, reciprocal_rank_fusion, tokenize
+
+CHUNKS = {
+    "leave-1": ("Parental leave is sixteen weeks at full pay.", "hr"),
+    "leave-2": ("Annual leave requests go to your manager; parental duties are respected.", "hr"),
+    "vpc-1": ("Every service runs with VPC isolation and private subnets.", "technical"),
+    "desk-1": ("Desks are assigned on the first day.", "general"),
+}
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = BM25Index(str(tmp_path / "docs.bm25.json"))
+    index.add(list(CHUNKS), [text for text, _ in CHUNKS.values()], [{"type": kind} for _, kind in CHUNKS.values()])
+    return index
+
+
+def test_tokenize_drops_stopwords_and_adds_bigrams():
+    assert tokenize("How is the Parental Leave?") == ["parental", "leave", "parental leave"]
+
+
+def test_exact_phrase_ranks_first(index):
+    hits = index.search("parental leave", 10)
+    assert [doc_id for doc_id, _ in hits][:2] == ["leave-1", "leave-2"]
+    assert hits[0][1] > hits[1][1] > 0
+
+
+def test_search_filters_by_type_and_limits_hits(index):
+    assert [doc_id for doc_id, _ in index.search("leave isolation", 10, doc_type="technical")] == ["vpc-1"]
+    assert len(index.search("leave", 1)) == 1
+    assert index.search("holiday", 10) == []
+
+
+def test_readding_and_removing_chunks(index):
+    index.add(["desk-1"], ["Parental leave forms are at the front desk."], [{"type": "general"}])
+    assert "desk-1" in dict(index.search("forms", 10))
+    assert "desk-1" not in dict(index.search("assigned", 10))
+
+    index.remove(["leave-1", "unknown"])
+    assert "leave-1" not in dict(index.search("parental leave", 10))
+    assert len(index) == 3
+
+
+def test_saved_index_reloads(index):
+    index.save()
+    reloaded = BM25Index(index.path)
+    assert reloaded.exists and len(reloaded) == len(CHUNKS)
+    assert reloaded.search("vpc isolation", 2) == index.search("vpc isolation", 2)
+
+
+def test_rrf_rewards_ids_ranked_by_both_retrievers():
+    fused = reciprocal_rank_fusion([["a", "b", "c"], ["c", "d", "b"]], k=60)
+    assert [doc_id for doc_id, _ in fused] == ["c", "b", "a", "d"]
+    assert fused[0][1] == pytest.approx(1 / 63 + 1 / 61)
+
+
+def test_rrf_k_flattens_top_ranks():
+    sharp = dict(reciprocal_rank_fusion([["a", "b"]], k=1))
+    flat = dict(reciprocal_rank_fusion([["a", "b"]], k=1000))
+    assert sharp["a"] / sharp["b"] > flat["a"] / flat["b"]
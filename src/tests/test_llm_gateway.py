@@ -0,0 +1,179 @@
+"""Tests for the LLM gateway: coalescing, per-caller isolation, cancellation and retries."""
+
+import asyncio
+from types import SimpleNamespace
+
+import groq
+import httpx
+import pytest
+
+from src.llm_gateway import LLMGateway
+
+MESSAGES = [{"role": "user", "content": "How many vacation days do I get?"}]
+
+
+class FakeCompletions:
+    """Stands in for client.chat.completions; streams `tokens` with a delay between them."""
+
+    def __init__(self, tokens, delay=0.01, errors=()):
+        self.tokens = tokens
+        self.delay = delay
+        self.errors = list(errors)
+        self.calls = 0
+
+    async def create(self, model, messages, temperature, stream):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        if not stream:
+            await asyncio.sleep(self.delay * len(self.tokens))
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content="".join(self.tokens)))])
+        return self._stream()
+
+    async def _stream(self):
+        for token in self.tokens:
+            await asyncio.sleep(self.delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=token))])
+
+
+def make_gateway(completions, **gateway):
+    settings = {"requests_per_minute": 60000, "burst": 1000, "backoff_base_seconds": 0.001, **gateway}
+    gateway = LLMGateway({"model": "test", "temperature": 0, "base_url": "http://127.0.0.1:9", "gateway": settings})
+    gateway.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return gateway
+
+
+def rate_limit_error():
+    response = httpx.Response(429, request=httpx.Request("POST", "http://127.0.0.1:9"))
+    return groq.RateLimitError("rate limited", response=response, body=None)
+
+
+def test_identical_requests_share_one_upstream_call():
+    completions = FakeCompletions(["Twenty ", "days."])
+    gateway = make_gateway(completions)
+
+    async def scenario():
+        return await asyncio.gather(gateway.complete(MESSAGES), gateway.complete(MESSAGES))
+
+    assert asyncio.run(scenario()) == ["Twenty days.", "Twenty days."]
+    assert completions.calls == 1
+    assert gateway.stats["coalesced"] == 1
+    assert not gateway._in_flight
+
+
+def test_late_streaming_follower_receives_replayed_tokens():
+    completions = FakeCompletions(["a", "b", "c", "d"])
+    gateway = make_gateway(completions)
+    leader_tokens, follower_tokens = [], []
+
+    async def scenario():
+        leader = asyncio.ensure_future(gateway.complete(MESSAGES, leader_tokens.append))
+        await asyncio.sleep(0.025)
+        follower = await gateway.complete(MESSAGES, follower_tokens.append)
+        return await leader, follower
+
+    assert asyncio.run(scenario()) == ("abcd", "abcd")
+    assert leader_tokens == follower_tokens == ["a", "b", "c", "d"]
+    assert completions.calls == 1
+
+
+def test_failing_follower_callback_does_not_break_the_leader():
+    completions = FakeCompletions(["a", "b", "c"])
+    gateway = make_gateway(completions)
+    leader_tokens = []
+
+    def broken(token):
+        raise ConnectionResetError("client went away")
+
+    async def scenario():
+        leader = asyncio.ensure_future(gateway.complete(MESSAGES, leader_tokens.append))
+        await asyncio.sleep(0)
+        with pytest.raises(ConnectionResetError):
+            await gateway.complete(MESSAGES, broken)
+        return await leader
+
+    assert asyncio.run(scenario()) == "abc"
+    assert leader_tokens == ["a", "b", "c"]
+
+
+def test_slow_follower_does_not_stall_the_leader():
+    completions = FakeCompletions(["a", "b", "c"], delay=0.005)
+    gateway = make_gateway(completions)
+
+    async def slow(token):
+        await asyncio.sleep(0.2)
+
+    async def scenario():
+        leader = asyncio.ensure_future(gateway.complete(MESSAGES, lambda token: None))
+        follower = asyncio.ensure_future(gateway.complete(MESSAGES, slow))
+        answer = await asyncio.wait_for(leader, timeout=0.15)
+        assert not follower.done()
+        return answer, await follower
+
+    assert asyncio.run(scenario()) == ("abc", "abc")
+
+
+def test_cancelling_the_leader_does_not_cancel_followers():
+    completions = FakeCompletions(["a", "b", "c"])
+    gateway = make_gateway(completions)
+
+    async def scenario():
+        leader = asyncio.ensure_future(gateway.complete(MESSAGES, lambda token: None))
+        follower = asyncio.ensure_future(gateway.complete(MESSAGES, lambda token: None))
+        await asyncio.sleep(0.015)
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await follower
+
+    assert asyncio.run(scenario()) == "abc"
+    assert completions.calls == 1
+
+
+def test_upstream_call_is_cancelled_when_every_caller_leaves():
+    completions = FakeCompletions(["a", "b", "c", "d", "e"], delay=0.05)
+    gateway = make_gateway(completions)
+
+    async def scenario():
+        callers = [asyncio.ensure_future(gateway.complete(MESSAGES, lambda token: None)) for _ in range(2)]
+        await asyncio.sleep(0.01)
+        pending = next(iter(gateway._in_flight.values()))
+        for caller in callers:
+            caller.cancel()
+        await asyncio.gather(*callers, return_exceptions=True)
+        await asyncio.sleep(0)
+        return pending.task
+
+    task = asyncio.run(scenario())
+    assert task.cancelled()
+    assert not gateway._in_flight
+
+
+def test_retryable_errors_are_retried():
+    completions = FakeCompletions(["ok"], errors=[rate_limit_error(), rate_limit_error()])
+    gateway = make_gateway(completions)
+
+    assert asyncio.run(gateway.complete(MESSAGES)) == "ok"
+    assert completions.calls == 3
+    assert gateway.stats["retries"] == 2
+
+
+def test_retries_stop_at_max_retries():
+    completions = FakeCompletions(["ok"], errors=[rate_limit_error() for _ in range(3)])
+    gateway = make_gateway(completions, max_retries=1)
+
+    with pytest.raises(groq.RateLimitError):
+        asyncio.run(gateway.complete(MESSAGES))
+    assert completions.calls == 2
+    assert not gateway._in_flight
+
+
+def test_without_coalescing_every_request_goes_upstream():
+    completions = FakeCompletions(["x"])
+    gateway = make_gateway(completions, coalesce=False)
+
+    async def scenario():
+        return await asyncio.gather(gateway.complete(MESSAGES), gateway.complete(MESSAGES))
+
+    assert asyncio.run(scenario()) == ["x", "x"]
+    assert completions.calls == 2
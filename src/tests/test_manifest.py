@@ -0,0 +1,64 @@
+"""Tests for the ingestion manifest and chunk ids."""
+
+import os
+
+from src.manifest import IngestManifest, chunk_id, file_sha256, source_key
+
+
+def test_chunk_ids_are_stable_and_scoped_to_the_source():
+    assert chunk_id("/docs/hr.txt", "Twenty vacation days.") == chunk_id("/docs/hr.txt", "Twenty vacation days.")
+    assert chunk_id("/docs/hr.txt", "Twenty vacation days.") != chunk_id("/docs/hr.txt", "Thirty vacation days.")
+    assert chunk_id("/docs/hr.txt", "Twenty vacation days.") != chunk_id("/docs/it.txt", "Twenty vacation days.")
+    assert len(chunk_id("/docs/hr.txt", "")) == 32
+
+
+def test_source_keys_are_absolute(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert source_key("docs/hr.txt") == str(tmp_path / "docs" / "hr.txt")
+
+
+def test_file_hash_streams_in_blocks(tmp_path):
+    path = tmp_path / "hr.txt"
+    path.write_bytes(b"x" * 10_000)
+    assert file_sha256(str(path), block_size=7) == file_sha256(str(path))
+
+
+def test_unchanged_check_uses_metadata_and_chunker(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    manifest.record("/docs/hr.txt", "abc", 100.0, 42, ["a", "b"], "tokens:200:32:fast:estimate")
+
+    assert manifest.is_unchanged("/docs/hr.txt", 100.0, 42)
+    assert manifest.is_unchanged("/docs/hr.txt", 100.0, 42, "tokens:200:32:fast:estimate")
+    assert not manifest.is_unchanged("/docs/hr.txt", 100.0, 42, "sentences:3:fast")
+    assert not manifest.is_unchanged("/docs/hr.txt", 101.0, 42)
+    assert not manifest.is_unchanged("/docs/hr.txt", 100.0, 43)
+    assert not manifest.is_unchanged("/docs/it.txt", 100.0, 42)
+
+
+def test_version_changes_only_with_the_chunk_set(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "manifest.json"))
+    assert manifest.version == "empty"
+
+    manifest.record("/docs/hr.txt", "abc", 100.0, 42, ["a", "b"])
+    recorded = manifest.version
+    manifest.record("/docs/hr.txt", "abc", 200.0, 42, ["a", "b"])  # touched, same chunks
+    assert manifest.version == recorded
+    manifest.record("/docs/hr.txt", "def", 300.0, 42, ["a", "c"])
+    assert manifest.version != recorded
+
+    changed = manifest.version
+    assert manifest.remove("/docs/it.txt") is None
+    assert manifest.version == changed
+    assert manifest.remove("/docs/hr.txt")["chunk_ids"] == ["a", "c"]
+    assert manifest.version != changed
+
+
+def test_saved_manifest_reloads(tmp_path):
+    manifest = IngestManifest(str(tmp_path / "db" / "manifest.json"))
+    manifest.record("/docs/hr.txt", "abc", 100.0, 42, ["a"], "sentences:3:fast")
+    manifest.save()
+
+    reloaded = IngestManifest(manifest.path)
+    assert reloaded.get("/docs/hr.txt") == manifest.get("/docs/hr.txt")
+    assert reloaded.version == manifest.version
+    assert not os.path.exists(f"{manifest.path}.tmp")
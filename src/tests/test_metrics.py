@@ -0,0 +1,71 @@
+"""Tests for the latency metrics registry and its exporters."""
+
+import json
+
+from src.metrics import Metrics
+
+
+def make_metrics():
+    metrics = Metrics(enabled=True, buckets=(0.1, 0.5, 1.0))
+    for seconds in (0.05, 0.1, 0.3, 2.0):
+        metrics.observe("onboarding_ask_seconds", seconds, source="llm")
+    metrics.observe("onboarding_ask_seconds", 0.01, source="answer_cache")
+    metrics.inc("onboarding_answers_total", source="llm")
+    metrics.inc("onboarding_answers_total", 2, source="llm")
+    return metrics
+
+
+def test_histograms_render_cumulative_buckets_count_and_sum():
+    lines = make_metrics().render_prometheus().splitlines()
+
+    assert lines[:2] == ["# HELP onboarding_ask_seconds End-to-end time to answer a question, by answer source",
+                         "# TYPE onboarding_ask_seconds histogram"]
+    llm = [line for line in lines if line.startswith("onboarding_ask_seconds") and 'source="llm"' in line]
+    assert llm == [
+        'onboarding_ask_seconds_bucket{source="llm",le="0.1"} 2',
+        'onboarding_ask_seconds_bucket{source="llm",le="0.5"} 3',
+        'onboarding_ask_seconds_bucket{source="llm",le="1.0"} 3',
+        'onboarding_ask_seconds_bucket{source="llm",le="+Inf"} 4',
+        'onboarding_ask_seconds_sum{source="llm"} 2.45',
+        'onboarding_ask_seconds_count{source="llm"} 4',
+    ]
+    assert 'onboarding_ask_seconds_count{source="answer_cache"} 1' in lines
+    assert "# TYPE onboarding_answers_total counter" in lines
+    assert 'onboarding_answers_total{source="llm"} 3' in lines
+
+
+def test_label_values_are_escaped():
+    metrics = Metrics(enabled=True)
+    metrics.inc("onboarding_ingested_chunks_total", source='C:\\docs\\"HR"\nhandbook.pdf', stage="write")
+
+    [line] = [line for line in metrics.render_prometheus().splitlines() if not line.startswith("#")]
+    assert line == ('onboarding_ingested_chunks_total'
+                    '{source="C:\\\\docs\\\\\\"HR\\"\\nhandbook.pdf",stage="write"} 1')
+
+
+def test_unknown_metrics_use_their_name_as_help_and_unlabelled_series_have_no_braces():
+    metrics = Metrics(enabled=True)
+    metrics.inc("custom_total")
+    assert metrics.render_prometheus() == "# HELP custom_total custom_total\n# TYPE custom_total counter\ncustom_total 1\n"
+
+
+def test_dump_json_round_trips_the_snapshot(tmp_path):
+    metrics = make_metrics()
+    path = tmp_path / "metrics.json"
+    metrics.dump_json(str(path))
+
+    dumped = json.loads(path.read_text())
+    assert dumped == metrics.snapshot()
+    [llm] = [series for series in dumped["onboarding_ask_seconds"]["series"] if series["labels"] == {"source": "llm"}]
+    assert llm["buckets"] == {"0.1": 2, "0.5": 3, "1.0": 3, "+Inf": 4}
+    assert llm["mean_seconds"] == 2.45 / 4
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics(enabled=False)
+    with metrics.timer("onboarding_ask_stage_seconds", stage="retrieval"):
+        pass
+    metrics.observe("onboarding_ask_seconds", 1.0, source="llm")
+    metrics.inc("onboarding_answers_total", source="llm")
+
+    assert metrics.snapshot() == {}
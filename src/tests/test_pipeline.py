@@ -0,0 +1,71 @@
+"""Tests for the answer pipeline around the LLM call."""
+
+import logging
+from types import SimpleNamespace
+
+from src.pipeline import PROMPT_USAGE_FIELDS, AnswerPipeline
+
+CHUNKS = {
+    "a": "New hires get twenty vacation days. Unused days roll over once.",
+    "b": "Unused days roll over once. Parental leave is sixteen weeks.",
+    "c": "Badges are collected at reception on the first morning of work.",
+}
+
+
+class FakeDB:
+    """Returns the CHUNKS in order for every query."""
+
+    corpus_version = "v1"
+
+    def embed_query(self, question):
+        return [1.0, 0.0]
+
+    def query_documents(self, query_text, doc_type=None, n_results=3, query_embedding=None):
+        ids = list(CHUNKS)[:n_results]
+        return {"ids": [ids], "documents": [[CHUNKS[cid] for cid in ids]],
+                "metadatas": [[{"type": "hr"} for _ in ids]], "distances": [[0.1 * i for i in range(len(ids))]]}
+
+
+def make_pipeline(tmp_path, max_tokens=1024, answers=False, semantic=False):
+    config = {
+        "rag": {"default_document_type": "hr", "query_results": 3, "context": {"max_tokens": max_tokens}},
+        "llm": {"model": "llama", "temperature": 0},
+        "cache": {"answers": {"enabled": answers, "path": str(tmp_path / "answers.sqlite"), "ttl_seconds": 60},
+                  "semantic": {"enabled": semantic, "similarity_threshold": 0.9, "max_entries": 10}},
+    }
+    return AnswerPipeline(config, FakeDB())
+
+
+def test_prompt_size_is_returned_and_logged(tmp_path, caplog):
+    pipeline = make_pipeline(tmp_path, max_tokens=15)
+    with caplog.at_level(logging.INFO, logger="src.pipeline"):
+        request = pipeline.prepare("How many vacation days?")
+    result = pipeline.record(request, "Twenty.", 0.5)
+
+    assert result["source"] == "llm"
+    assert set(PROMPT_USAGE_FIELDS) <= set(result)
+    assert result["context_tokens"] <= 15 < result["retrieved_context_tokens"]
+    assert result["prompt_tokens"] > result["context_tokens"]
+
+    [line] = [record.getMessage() for record in caplog.records if record.name == "src.pipeline"]
+    assert f"prompt_tokens={result['prompt_tokens']}" in line
+    assert "duplicate_sentences=1" in line
+    assert "dropped_sentences=0" not in line
+
+
+def test_cached_answers_are_keyed_on_the_context_budget(tmp_path):
+    pipeline = make_pipeline(tmp_path, answers=True)
+    pipeline.record(pipeline.prepare("How many vacation days?"), "Twenty.", 0.5)
+    assert pipeline.prepare("how many vacation days") == {"answer": "Twenty.", "source": "answer_cache"}
+
+    smaller = make_pipeline(tmp_path, max_tokens=10, answers=True)
+    assert "messages" in smaller.prepare("How many vacation days?")
+
+
+def test_semantic_hits_are_dropped_when_the_model_changes(tmp_path):
+    pipeline = make_pipeline(tmp_path, semantic=True)
+    pipeline.record(pipeline.prepare("How many vacation days?"), "Twenty.", 0.5)
+    assert pipeline.prepare("How many vacation days?")["source"] == "semantic_cache"
+
+    pipeline.config = {**pipeline.config, "llm": {"model": "llama-large", "temperature": 0}}
+    assert "messages" in pipeline.prepare("How many vacation days?")
@@ -0,0 +1,104 @@
+"""Tests for the SQLite checklist progress store."""
+
+import pytest
+
+from src.progress_store import ProgressStore, cohort_for, default_hire_id
+
+CHECKLIST = [
+    {"task": "Sign contract", "status": "completed"},
+    {"task": "Set up laptop", "due_day": 1},
+    {"task": "Security training", "due_day": 7},
+]
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ProgressStore(str(tmp_path / "progress.sqlite"))
+    yield store
+    store.close()
+
+
+def enroll(store, hire_id, start_date, checklist=CHECKLIST):
+    return store.enroll(hire_id, hire_id.title(), "Software Engineer", start_date, checklist)
+
+
+def cohort_totals(store):
+    return {row["cohort"]: (row["hires"], row["tasks_total"], row["tasks_completed"])
+            for row in store.completion_by_cohort()}
+
+
+def recount(store):
+    """Cohort totals computed from scratch, to check the trigger-maintained ones against."""
+    hires = dict(store._conn.execute("SELECT cohort, COUNT(*) FROM hires GROUP BY cohort"))
+    rows = store._conn.execute(
+        "SELECT cohort, COUNT(*), SUM(status = 'completed') FROM tasks GROUP BY cohort"
+    ).fetchall()
+    return {cohort: (hires.get(cohort, 0), total, completed) for cohort, total, completed in rows}
+
+
+def test_cohorts_are_iso_weeks_and_ids_normalized_names_with_start_dates():
+    assert cohort_for("2026-10-12") == cohort_for("2026-10-18") == "2026-W42"
+    assert cohort_for("2026-10-19") == "2026-W43"
+    assert default_hire_id("  Ada   Lovelace ", "2026-10-19") == "ada lovelace:2026-10-19"
+    assert default_hire_id("Ada Lovelace", "2026-10-19") != default_hire_id("Ada Lovelace", "2026-11-02")
+
+
+def test_triggers_keep_cohort_totals_in_step(store):
+    assert enroll(store, "ada", "2026-10-12")
+    enroll(store, "alan", "2026-10-14")
+    enroll(store, "grace", "2026-10-19")
+    assert cohort_totals(store) == {"2026-W42": (2, 6, 2), "2026-W43": (1, 3, 1)}
+
+    assert store.mark_complete("ada", "Set up laptop")
+    assert not store.mark_complete("ada", "Set up laptop")
+    assert not store.mark_complete("ada", "Unknown task")
+    assert store.mark_complete_many([("alan", "Set up laptop"), ("grace", "Security training")]) == 2
+    assert store.mark_pending("ada", "Sign contract")
+    assert not store.mark_pending("ada", "Sign contract")
+    assert cohort_totals(store) == {"2026-W42": (2, 6, 3), "2026-W43": (1, 3, 2)} == recount(store)
+
+    with store._conn:
+        store._conn.execute("DELETE FROM tasks WHERE hire_id = 'alan'")
+        store._conn.execute("DELETE FROM hires WHERE hire_id = 'alan'")
+    assert cohort_totals(store)["2026-W42"] == (1, 3, 1) == recount(store)["2026-W42"]
+
+    [row] = store.completion_by_cohort(["2026-W43"])
+    assert row["completion_rate"] == pytest.approx(2 / 3)
+
+
+def test_re_enrolling_keeps_progress_and_adds_new_tasks(store):
+    enroll(store, "ada", "2026-10-12")
+    store.mark_complete("ada", "Set up laptop")
+
+    assert not enroll(store, "ada", "2026-10-12", CHECKLIST + [{"task": "Meet your buddy", "due_day": 2}])
+    assert [(item["task"], item["status"]) for item in store.checklist("ada")] == [
+        ("Sign contract", "completed"), ("Set up laptop", "completed"),
+        ("Security training", "pending"), ("Meet your buddy", "pending"),
+    ]
+    assert cohort_totals(store) == {"2026-W42": (1, 4, 2)} == recount(store)
+
+
+def test_enroll_many_counts_only_new_hires(store):
+    hires = [{"hire_id": f"hire-{i}", "name": f"Hire {i}", "role": "Designer", "start_date": "2026-10-12"}
+             for i in range(5)]
+    assert store.enroll_many(hires[:3], CHECKLIST) == 3
+    assert store.enroll_many(hires, CHECKLIST) == 2
+    assert cohort_totals(store) == {"2026-W42": (5, 15, 5)}
+
+
+def test_overdue_and_pending_queries(store):
+    enroll(store, "ada", "2026-10-12")
+    enroll(store, "grace", "2026-10-19")
+    store.mark_complete("grace", "Set up laptop")
+
+    overdue = store.overdue_tasks(as_of="2026-10-21")
+    assert [(task["hire_id"], task["task"], task["due_date"]) for task in overdue] == [
+        ("ada", "Set up laptop", "2026-10-13"), ("ada", "Security training", "2026-10-19"),
+    ]
+    assert overdue[0]["name"] == "Ada"
+    assert store.count_overdue(as_of="2026-10-21") == 2
+    assert store.count_overdue(as_of="2026-10-21", cohort="2026-W43") == 0
+    assert store.count_overdue(as_of="2026-10-30") == 3
+    assert store.overdue_tasks(as_of="2026-10-30", limit=1)[0]["due_date"] == "2026-10-13"
+    assert sorted(store.pending_hires("Set up laptop")) == ["ada"]
+    assert store.checklist("nobody") == []
@@ -0,0 +1,84 @@
+"""Tests for the cohort schedule solver."""
+
+import pytest
+
+from src.scheduler import CohortScheduler, parse_offerings, schedule_days
+
+TEMPLATE = {
+    "day1": [
+        {"time": "9:00 AM", "activity": "Orientation", "capacity": 2},
+        {"time": "9:00 AM", "activity": "Laptop setup", "capacity": 1, "requires": ["Orientation"]},
+        {"time": "10:00 AM", "activity": "Laptop setup", "capacity": 1},
+        {"time": "2:00 PM", "activity": "Orientation", "capacity": 1},
+        {"time": "3:00 PM", "activity": "Codebase tour", "roles": ["Software Engineer"], "duration_minutes": 90},
+    ],
+    "day2": [
+        {"time": "9:00 AM", "activity": "Laptop setup", "capacity": 1},
+        {"time": "9:30 AM", "activity": "Benefits Q&A", "capacity": 10},
+    ],
+}
+
+
+def activities(placement):
+    return [(offering.day, offering.time, offering.activity) for offering in placement.sessions]
+
+
+def test_days_are_ordered_numerically_and_validated():
+    assert [day for day, _ in schedule_days({"day10": [], "day2": [], "day1": None})] == [1, 2, 10]
+    with pytest.raises(ValueError, match="'monday'"):
+        schedule_days({"monday": []})
+
+
+def test_offerings_are_parsed_into_minutes_from_day_one():
+    offerings = parse_offerings(TEMPLATE)
+    assert [o.start for o in offerings][:3] == [540, 540, 600]
+    codebase = next(o for o in offerings if o.activity == "Codebase tour")
+    assert (codebase.start, codebase.end, codebase.roles) == (900, 990, ("software engineer",))
+    assert offerings[-1].start == 24 * 60 + 570
+
+
+def test_prerequisites_come_first_and_block_clashes():
+    scheduler = CohortScheduler(TEMPLATE)
+    assert scheduler.order.index("Orientation") < scheduler.order.index("Laptop setup")
+
+    # Laptop setup waits for orientation to end, so the 9:00 AM offering is never used
+    assert activities(scheduler.assign("Software Engineer")) == [
+        (1, "9:00 AM", "Orientation"), (1, "10:00 AM", "Laptop setup"), (1, "3:00 PM", "Codebase tour"),
+        (2, "9:30 AM", "Benefits Q&A"),
+    ]
+
+
+def test_capacity_moves_hires_to_later_offerings_then_waitlists():
+    scheduler = CohortScheduler(TEMPLATE)
+    placements = [scheduler.assign("Designer") for _ in range(4)]
+
+    assert activities(placements[1])[:2] == [(1, "9:00 AM", "Orientation"), (2, "9:00 AM", "Laptop setup")]
+    # The only Benefits Q&A overlaps that laptop setup
+    assert placements[1].waitlisted == ["Benefits Q&A"]
+    assert activities(placements[2])[:1] == [(1, "2:00 PM", "Orientation")]
+    assert placements[2].waitlisted == ["Laptop setup"]
+    # Without a seat in the prerequisite, the dependent activity is waitlisted as well
+    assert placements[3].waitlisted == ["Orientation", "Laptop setup"]
+
+    stats = scheduler.stats()
+    assert stats["Orientation"] == {"offerings": 2, "booked": 3, "capacity": 3, "waitlisted": 1}
+    assert stats["Laptop setup"]["booked"] == 2 and stats["Laptop setup"]["waitlisted"] == 2
+    assert stats["Benefits Q&A"] == {"offerings": 1, "booked": 3, "capacity": 10, "waitlisted": 1}
+    assert stats["Codebase tour"] == {"offerings": 1, "booked": 0, "capacity": None, "waitlisted": 0}
+
+
+def test_role_filters_are_case_insensitive():
+    scheduler = CohortScheduler(TEMPLATE)
+    assert scheduler.applies_to("Codebase tour", "software ENGINEER")
+    assert not scheduler.applies_to("Codebase tour", "Designer")
+    assert scheduler.applies_to("Orientation", "Designer")
+
+
+def test_invalid_prerequisites_are_rejected():
+    with pytest.raises(ValueError, match="unknown activities: Badge pickup"):
+        CohortScheduler({"day1": [{"time": "9:00 AM", "activity": "Tour", "requires": ["Badge pickup"]}]})
+    with pytest.raises(ValueError, match="Circular prerequisites"):
+        CohortScheduler({"day1": [
+            {"time": "9:00 AM", "activity": "A", "requires": ["B"]},
+            {"time": "10:00 AM", "activity": "B", "requires": ["A"]},
+        ]})
@@ -0,0 +1,78 @@
+"""Tests for the in-memory semantic question cache."""
+
+import numpy as np
+import pytest
+
+from src.semantic_cache import SemanticCache
+
+
+def unit(*values):
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def with_similarity(similarity):
+    """A 2-d unit vector whose cosine similarity with (1, 0) is `similarity`."""
+    return [similarity, float(np.sqrt(1.0 - similarity ** 2))]
+
+
+def store(cache, embedding, answer, doc_type="hr", corpus_version="v1", settings="s1"):
+    cache.store(embedding, f"question for {answer}", answer, doc_type, corpus_version, 2.0, settings)
+
+
+def test_threshold_is_inclusive():
+    cache = SemanticCache(similarity_threshold=0.9, max_entries=4)
+    store(cache, [1.0, 0.0], "Twenty days.")
+
+    assert cache.lookup(with_similarity(0.9), "hr", "v1", "s1") == "Twenty days."
+    assert cache.lookup(with_similarity(0.89), "hr", "v1", "s1") is None
+    assert cache.stats() == {"entries": 1, "hits": 1, "misses": 1, "hit_rate": 0.5, "latency_saved_seconds": 2.0}
+
+
+def test_embeddings_are_compared_by_direction():
+    cache = SemanticCache(similarity_threshold=0.99, max_entries=4)
+    store(cache, [3.0, 0.0], "Twenty days.")
+    assert cache.lookup([0.5, 0.0], "hr", "v1", "s1") == "Twenty days."
+
+
+def test_doc_types_are_isolated():
+    cache = SemanticCache(similarity_threshold=0.9, max_entries=4)
+    store(cache, [1.0, 0.0], "HR answer", doc_type="hr")
+    store(cache, unit(1.0, 0.01), "Tech answer", doc_type="technical")
+
+    assert cache.lookup([1.0, 0.0], "hr", "v1", "s1") == "HR answer"
+    assert cache.lookup([1.0, 0.0], "technical", "v1", "s1") == "Tech answer"
+    assert cache.lookup([1.0, 0.0], None, "v1", "s1") is None
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = SemanticCache(similarity_threshold=0.99, max_entries=2)
+    store(cache, [1.0, 0.0, 0.0], "a")
+    store(cache, [0.0, 1.0, 0.0], "b")
+    assert cache.lookup([1.0, 0.0, 0.0], "hr", "v1", "s1") == "a"  # "b" is now the least recently used
+    store(cache, [0.0, 0.0, 1.0], "c")
+
+    assert cache.lookup([0.0, 1.0, 0.0], "hr", "v1", "s1") is None
+    assert cache.lookup([1.0, 0.0, 0.0], "hr", "v1", "s1") == "a"
+    assert cache.lookup([0.0, 0.0, 1.0], "hr", "v1", "s1") == "c"
+    assert cache.stats()["entries"] == 2
+
+
+@pytest.mark.parametrize("corpus_version, settings", [("v2", "s1"), ("v1", "s2")])
+def test_corpus_or_settings_change_empties_the_cache(corpus_version, settings):
+    cache = SemanticCache(similarity_threshold=0.9, max_entries=4)
+    store(cache, [1.0, 0.0], "Twenty days.")
+
+    assert cache.lookup([1.0, 0.0], "hr", corpus_version, settings) is None
+    assert cache.stats()["entries"] == 0
+    assert cache.lookup([1.0, 0.0], "hr", "v1", "s1") is None
+
+
+def test_embedding_size_change_resets_instead_of_raising():
+    cache = SemanticCache(similarity_threshold=0.9, max_entries=4)
+    store(cache, [1.0, 0.0], "Twenty days.")
+
+    assert cache.lookup([1.0, 0.0, 0.0], "hr", "v1", "s1") is None
+    assert cache.stats()["entries"] == 0
+    store(cache, [1.0, 0.0, 0.0], "Twenty days.")
+    assert cache.lookup([1.0, 0.0, 0.0], "hr", "v1", "s1") == "Twenty days."
@@ -0,0 +1,157 @@
+"""Tests for the aiohttp server: sessions, input validation, admission control and streaming."""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from aiohttp.test_utils import TestClient, TestServer
+
+import src.vector_db as vector_db
+from src.async_agent import AsyncOnboardingAgent
+from src.config_service import thaw
+from src.server import OnboardingServer
+from src.tests.test_llm_gateway import FakeCompletions
+from src.tests.test_pipeline import FakeDB
+from src.tests.test_vector_db import HashingEmbedder
+from src.utils import load_config
+
+SESSION = {"name": "Ada Lovelace", "role": "Software Engineer", "start_date": "2026-10-19"}
+
+
+async def no_op():
+    pass
+
+
+@pytest.fixture
+def make_server(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # cache and progress paths are relative
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+
+    def make(tokens=("Twenty ", "days."), delay=0.01, **server):
+        config = thaw(load_config())
+        config['server'] = {**config.get('server', {}), **server}
+        config['cache']['answers']['enabled'] = False
+        config['cache'].get('semantic', {})['enabled'] = False
+        agent = AsyncOnboardingAgent(db=FakeDB(), config=config)
+        agent.llm.client = SimpleNamespace(chat=SimpleNamespace(completions=FakeCompletions(list(tokens), delay)),
+                                           close=no_op)
+        return OnboardingServer(agent)
+
+    return make
+
+
+def run(server, scenario):
+    async def main():
+        async with TestClient(TestServer(server.build_app())) as client:
+            return await scenario(client)
+
+    return asyncio.run(main())
+
+
+async def start_session(client):
+    response = await client.post("/sessions", json=SESSION)
+    assert response.status == 201
+    return (await response.json())['session_id']
+
+
+def test_created_session_can_be_fetched(make_server):
+    async def scenario(client):
+        session_id = await start_session(client)
+        response = await client.get(f"/sessions/{session_id}")
+        return response.status, await response.json()
+
+    status, session = run(make_server(), scenario)
+    assert status == 200
+    assert {key: session[key] for key in SESSION} == SESSION
+
+
+@pytest.mark.parametrize("body", [{"question": 5}, {"question": ["vacation?"]}, {"question": " "}, {}])
+def test_ask_rejects_missing_or_non_string_questions(make_server, body):
+    async def scenario(client):
+        session_id = await start_session(client)
+        return (await client.post(f"/sessions/{session_id}/ask", json=body)).status
+
+    assert run(make_server(), scenario) == 400
+
+
+def test_ask_answers_with_timings(make_server):
+    async def scenario(client):
+        session_id = await start_session(client)
+        response = await client.post(f"/sessions/{session_id}/ask", json={"question": "How many vacation days?"})
+        return response.status, await response.json()
+
+    status, result = run(make_server(), scenario)
+    assert status == 200
+    assert result['answer'] == "Twenty days."
+    assert result['source'] == "llm"
+    assert result['total_seconds'] >= result['ttft_seconds'] > 0
+
+
+def test_requests_beyond_the_queue_are_rejected_with_503(make_server):
+    server = make_server(delay=0.2, max_concurrent_requests=1, max_queued_requests=0)
+
+    async def scenario(client):
+        session_id = await start_session(client)
+        slow = asyncio.ensure_future(client.post(f"/sessions/{session_id}/ask", json={"question": "Vacation?"}))
+        while server.admission.in_flight == 0:
+            await asyncio.sleep(0.01)
+        rejected = await client.get(f"/sessions/{session_id}/help")
+        return (await slow).status, rejected.status, rejected.headers.get("Retry-After"), await rejected.json()
+
+    slow_status, status, retry_after, body = run(server, scenario)
+    assert slow_status == 200
+    assert status == 503
+    assert retry_after == "1"
+    assert body == {"error": "Server is busy, retry shortly."}
+    assert server.admission.rejected == 1
+
+
+def test_unknown_command_and_session_are_404(make_server):
+    async def scenario(client):
+        session_id = await start_session(client)
+        return ((await client.get(f"/sessions/{session_id}/payroll")).status,
+                (await client.get("/sessions/unknown/help")).status)
+
+    assert run(make_server(), scenario) == (404, 404)
+
+
+@pytest.mark.parametrize("number, status", [("x", 400), ("0", 404), ("999", 404), ("1", 200)])
+def test_checklist_task_numbers_are_validated(make_server, number, status):
+    async def scenario(client):
+        session_id = await start_session(client)
+        response = await client.post(f"/sessions/{session_id}/checklist/{number}")
+        return response.status, await response.json()
+
+    actual, body = run(make_server(), scenario)
+    assert actual == status
+    assert ("error" in body) == (status != 200)
+
+
+def test_websocket_streams_tokens_before_the_answer(make_server):
+    async def scenario(client):
+        session_id = await start_session(client)
+        messages = []
+        async with client.ws_connect(f"/sessions/{session_id}/ws") as ws:
+            await ws.send_str("ask How many vacation days?")
+            while not messages or messages[-1]['type'] == "token":
+                messages.append(await ws.receive_json(timeout=5))
+            await ws.send_str("exit")
+        return messages
+
+    messages = run(make_server(), scenario)
+    assert [message['text'] for message in messages[:-1]] == ["Twenty ", "days."]
+    assert messages[-1]['type'] == "output"
+    assert messages[-1]['answer'] == "Twenty days."
+
+
+def test_agent_opens_the_database_named_in_its_config(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("GROQ_API_KEY", "test")
+    monkeypatch.setattr(vector_db, "build_embedding_function", lambda db_config: HashingEmbedder())
+    config = thaw(load_config())
+    config['database'].update(path=str(tmp_path / "agent_db"), backend="numpy")
+    config['database'].get('embedding_cache', {})['enabled'] = False
+
+    agent = AsyncOnboardingAgent(config=config)
+    assert agent.db.store.path.startswith(str(tmp_path / "agent_db"))
+    asyncio.run(agent.close())
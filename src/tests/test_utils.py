@@ -0,0 +1,57 @@
+"""Tests for the incrementally rendered answer box."""
+
+import pytest
+from colorama import Fore, Style
+
+from src.utils import StreamingSection, strip_colors
+
+
+def render(capsys, tokens, width=20):
+    section = StreamingSection("Answer", Fore.GREEN, width)
+    for token in tokens:
+        section.write(token)
+    section.finish()
+    return strip_colors(capsys.readouterr().out).splitlines()
+
+
+def content(lines):
+    return [line[3:-3].rstrip() for line in lines[2:-1]]
+
+
+def test_words_wrap_at_the_width_inside_a_closed_box(capsys):
+    lines = render(capsys, ["New hires get twenty vacation days per year."])
+
+    assert content(lines) == ["New hires get twenty", "vacation days per", "year."]
+    assert {len(line) for line in lines} == {20 + 6}
+    assert lines[0] == "╭" + "─" * 24 + "╮"
+    assert lines[-1] == "╰" + "─" * 24 + "╯"
+
+
+def test_tokens_split_mid_word_render_like_one_write(capsys):
+    whole = render(capsys, ["Unused vacation days roll over once.\nParental leave is sixteen weeks."])
+    streamed = render(capsys, ["Un", "used vac", "ation days roll o", "ver once.", "\nParen", "tal leave is six",
+                               "teen weeks", "."])
+    assert streamed == whole
+    assert content(whole) == ["Unused vacation days", "roll over once.", "Parental leave is", "sixteen weeks."]
+
+
+def test_overlong_words_are_split_at_the_width(capsys):
+    lines = render(capsys, ["See https://intranet.example.com/benefits"], width=16)
+    assert content(lines) == ["See", "https://intranet", ".example.com/ben", "efits"]
+
+
+@pytest.mark.parametrize("tokens", [
+    [f"Badges are {Fore.RED}collected{Style.RESET_ALL} at reception on day one."],
+    ["Badges are ", "\x1b[3", "1mcollec", "ted\x1b[0", "m at reception on day one."],
+])
+def test_colour_codes_take_no_width(capsys, tokens):
+    lines = render(capsys, tokens)
+    assert content(lines) == ["Badges are collected", "at reception on day", "one."]
+    assert {len(line) for line in lines} == {20 + 6}
+
+
+def test_finish_closes_an_empty_box(capsys):
+    lines = render(capsys, [])
+    assert lines[1].strip("│ ") == "ANSWER"
+    assert content(lines) == [""]
+    assert lines[-1] == "╰" + "─" * 24 + "╯"
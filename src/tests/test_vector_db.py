@@ -0,0 +1,131 @@
+"""Tests for incremental ingestion into the vector database."""
+
+import hashlib
+
+import numpy as np
+import pytest
+
+import src.vector_db as vector_db
+from src.chunking import Chunker
+from src.manifest import chunk_id, source_key
+
+
+class HashingEmbedder:
+    """Bag-of-words vectors from hashed words; counts the texts it embeds."""
+
+    def __init__(self):
+        self.texts = 0
+
+    def __call__(self, input):
+        self.texts += len(input)
+        vectors = []
+        for text in input:
+            vector = np.zeros(32, dtype=np.float32)
+            for word in text.lower().split():
+                vector[int(hashlib.md5(word.encode("utf-8")).hexdigest(), 16) % 32] += 1.0
+            vectors.append(vector)
+        return vectors
+
+
+@pytest.fixture
+def embedder(monkeypatch):
+    embedder = HashingEmbedder()
+    monkeypatch.setattr(vector_db, "build_embedding_function", lambda db_config: embedder)
+    return embedder
+
+
+@pytest.fixture
+def config(tmp_path):
+    return {
+        "database": {"path": str(tmp_path / "db"), "backend": "numpy", "collection": "docs",
+                     "embedding_model": "test", "similarity_metric": "cosine", "ingest_workers": 1,
+                     "save_interval_seconds": 3600},
+        "rag": {"hybrid": {"enabled": True}},
+        "chunking": {"strategy": "sentences", "sentences_per_chunk": 2, "splitter": "fast"},
+    }
+
+
+@pytest.fixture
+def docs(tmp_path):
+    directory = tmp_path / "docs"
+    directory.mkdir()
+    for name, topic in [("hr_leave.txt", "parental leave"), ("hr_travel.txt", "travel expenses"),
+                        ("it_vpn.txt", "the VPN client")]:
+        (directory / name).write_text(" ".join(f"Rule {i} covers {topic}." for i in range(6)))
+    return directory
+
+
+def stored_ids(db):
+    return {cid for batch in db.store.scan() for cid in batch["ids"]}
+
+
+def test_chunk_ids_are_content_hashes(embedder, config, docs):
+    db = vector_db.OnboardingVectorDB(config)
+    path = str(docs / "hr_leave.txt")
+    assert db.ingest_document(path) == 3
+
+    source = source_key(path)
+    expected = [chunk_id(source, f"Rule {i} covers parental leave. Rule {i + 1} covers parental leave.")
+                for i in (0, 2, 4)]
+    assert db.manifest.get(source)["chunk_ids"] == expected
+    assert stored_ids(db) == set(expected)
+
+
+def test_unchanged_files_are_skipped(embedder, config, docs):
+    db = vector_db.OnboardingVectorDB(config)
+    stats = db.ingest_directory(str(docs), show_progress=False)
+    assert (stats["documents"], stats["skipped"], stats["chunks"]) == (3, 0, 9)
+    embedded = embedder.texts
+
+    again = vector_db.OnboardingVectorDB(config).ingest_directory(str(docs), show_progress=False)
+    assert (again["documents"], again["skipped"]) == (0, 3)
+    assert embedder.texts == embedded
+
+
+def test_changed_files_only_embed_new_chunks(embedder, config, docs):
+    db = vector_db.OnboardingVectorDB(config)
+    path = docs / "hr_leave.txt"
+    db.ingest_document(str(path))
+    before = stored_ids(db)
+    embedded = embedder.texts
+
+    path.write_text(path.read_text() + " Rule 6 covers parental leave. Rule 7 covers parental leave.")
+    assert db.ingest_document(str(path)) == 1
+    assert embedder.texts == embedded + 1
+    assert before < stored_ids(db)
+
+
+def test_rechunking_replaces_the_old_chunks(embedder, config, docs):
+    db = vector_db.OnboardingVectorDB(config)
+    path = str(docs / "hr_leave.txt")
+    db.ingest_document(path)
+    old = stored_ids(db)
+
+    assert db.ingest_document(path, Chunker(strategy="sentences", sentences_per_chunk=3)) == 2
+    assert stored_ids(db).isdisjoint(old)
+    assert db.manifest.get(source_key(path))["chunker"] == "sentences:3:fast"
+
+
+def test_deleted_files_are_purged(embedder, config, docs):
+    db = vector_db.OnboardingVectorDB(config)
+    db.ingest_directory(str(docs), show_progress=False)
+    removed = db.manifest.get(source_key(str(docs / "it_vpn.txt")))["chunk_ids"]
+    (docs / "it_vpn.txt").unlink()
+
+    stats = db.ingest_directory(str(docs), show_progress=False)
+    assert stats["purged"] == 1
+    assert stored_ids(db).isdisjoint(removed) and len(stored_ids(db)) == 6
+    assert db.lexical_index.search("vpn client", 5) == []
+
+    reopened = vector_db.OnboardingVectorDB(config)
+    assert source_key(str(docs / "it_vpn.txt")) not in reopened.manifest.sources
+    assert reopened.store.count() == 6
+
+
+def test_single_document_saves_are_deferred(embedder, config, docs):
+    db = vector_db.OnboardingVectorDB(config)
+    db.ingest_document(str(docs / "hr_leave.txt"))
+    assert vector_db.OnboardingVectorDB(config).store.count() == 0
+
+    db.save()
+    assert vector_db.OnboardingVectorDB(config).store.count() == 3
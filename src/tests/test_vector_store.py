@@ -0,0 +1,133 @@
+"""Tests for the in-process numpy vector store."""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+from src.vector_store import NumpyVectorStore
+
+RECORDS = [
+    ("hr-1", "Vacation policy", [1.0, 0.0, 0.0], {"type": "hr", "page": 1}),
+    ("hr-2", "Sick leave", [0.9, 0.1, 0.0], {"type": "hr", "page": 2}),
+    ("tech-1", "Deploy checklist", [0.0, 1.0, 0.0], {"type": "technical", "page": 1}),
+    ("gen-1", "Office map", [0.0, 0.0, 1.0], {"type": "general", "page": 3}),
+]
+
+
+@pytest.fixture
+def db_config(tmp_path):
+    return {"path": str(tmp_path), "collection": "docs", "similarity_metric": "cosine"}
+
+
+def make_store(db_config, records=RECORDS):
+    store = NumpyVectorStore(db_config)
+    ids, documents, embeddings, metadatas = zip(*records)
+    store.upsert(list(ids), list(documents), list(embeddings), list(metadatas))
+    return store
+
+
+def matching_ids(store, where):
+    return sorted(store.query([[1.0, 1.0, 1.0]], n_results=10, where=where)["ids"][0])
+
+
+def test_query_ranks_by_cosine_distance(db_config):
+    result = make_store(db_config).query([[1.0, 0.05, 0.0]], n_results=2)
+    assert result["ids"] == [["hr-1", "hr-2"]]
+    assert result["documents"] == [["Vacation policy", "Sick leave"]]
+    assert all(0 <= distance < 0.01 for distance in result["distances"][0])
+
+
+@pytest.mark.parametrize("where, expected", [
+    ({"type": "hr"}, ["hr-1", "hr-2"]),
+    ({"type": {"$eq": "technical"}}, ["tech-1"]),
+    ({"type": {"$ne": "hr"}}, ["gen-1", "tech-1"]),
+    ({"type": {"$in": ["technical", "general"]}}, ["gen-1", "tech-1"]),
+    ({"type": {"$nin": ["technical", "general"]}}, ["hr-1", "hr-2"]),
+    ({"$and": [{"type": "hr"}, {"page": 2}]}, ["hr-2"]),
+    ({"$or": [{"type": "technical"}, {"page": 3}]}, ["gen-1", "tech-1"]),
+])
+def test_where_filters(db_config, where, expected):
+    assert matching_ids(make_store(db_config), where) == expected
+
+
+def test_unsupported_operator_is_rejected(db_config):
+    with pytest.raises(ValueError, match=r"\$gt"):
+        make_store(db_config).query([[1.0, 0.0, 0.0]], n_results=1, where={"page": {"$gt": 1}})
+
+
+def test_upsert_overwrites_and_delete_compacts(db_config):
+    store = make_store(db_config)
+    store.upsert(["hr-1"], ["Vacation policy (2026)"], [[0.0, 0.0, 1.0]], [{"type": "hr", "page": 4}])
+    store.delete(["hr-2", "unknown"])
+
+    assert store.count() == 3
+    assert store.get(["hr-1", "hr-2"])["documents"] == ["Vacation policy (2026)"]
+    assert store.query([[0.0, 0.0, 1.0]], n_results=2, where={"type": "hr"})["ids"] == [["hr-1"]]
+
+
+def test_persisted_store_reloads(db_config):
+    store = make_store(db_config)
+    store.delete(["gen-1"])
+    store.persist()
+
+    reloaded = NumpyVectorStore(db_config)
+    assert reloaded.count() == 3
+    assert reloaded.get(["hr-2"])["metadatas"] == [{"type": "hr", "page": 2}]
+    assert reloaded.query([[0.0, 1.0, 0.0]], n_results=1)["ids"] == [["tech-1"]]
+
+
+def test_persist_writes_a_new_matrix_named_by_records(db_config):
+    store = make_store(db_config)
+    store.persist()
+    first = set(os.listdir(store.path))
+    store.persist()  # nothing changed, nothing is rewritten
+    assert set(os.listdir(store.path)) == first
+
+    store.upsert(["new-1"], ["Parking"], [[0.5, 0.5, 0.0]], [{"type": "general", "page": 1}])
+    store.persist()
+
+    with open(os.path.join(store.path, "records.json")) as f:
+        vectors_file = json.load(f)["vectors_file"]
+    assert sorted(os.listdir(store.path)) == sorted(["records.json", vectors_file])
+    assert vectors_file not in first
+    assert np.load(os.path.join(store.path, vectors_file)).shape == (5, 3)
+
+
+def test_stores_persisted_before_vectors_file_still_load(db_config):
+    store = make_store(db_config)
+    store.persist()
+    with open(os.path.join(store.path, "records.json")) as f:
+        records = json.load(f)
+    os.replace(os.path.join(store.path, records.pop("vectors_file")), os.path.join(store.path, "vectors.npy"))
+    with open(os.path.join(store.path, "records.json"), "w") as f:
+        json.dump(records, f)
+
+    assert NumpyVectorStore(db_config).count() == 4
+
+
+@pytest.mark.parametrize("metric", ["cosine", "l2", "ip"])
+def test_distances_match_query_distances(db_config, metric):
+    db_config["similarity_metric"] = metric
+    store = make_store(db_config)
+    query = [0.8, 0.6, 0.0]
+    result = store.query([query], n_results=4)
+
+    distances = store.distances(query, result["ids"][0] + ["unknown"])
+    assert list(distances) == result["ids"][0]
+    assert list(distances.values()) == pytest.approx(result["distances"][0])
+
+
+def test_chroma_distances_match_query_distances(tmp_path):
+    from src.vector_store import ChromaVectorStore
+
+    store = ChromaVectorStore({"path": str(tmp_path), "collection": "docs", "similarity_metric": "cosine"})
+    ids, documents, embeddings, metadatas = zip(*RECORDS)
+    store.upsert(list(ids), list(documents), list(embeddings), list(metadatas))
+    query = [0.8, 0.6, 0.0]
+    result = store.query([query], n_results=4)
+
+    distances = store.distances(query, ["gen-1", "hr-2"])
+    expected = dict(zip(result["ids"][0], result["distances"][0]))
+    assert distances == pytest.approx({"gen-1": expected["gen-1"], "hr-2": expected["hr-2"]}, abs=1e-5)
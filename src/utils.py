@@ -3,33 +3,65 @@
 Utility functions for the AI Onboarding System.
 """
 
-import os
-import yaml
-import json
-import nltk
-from typing import List, Dict, Any
+import re
+import sys
+from typing import List, Dict, Any, Tuple
 from datetime import datetime
 from colorama import Style
 
+from src.config_service import get_config_service
+
+
+_nltk_ready = False
+
+ANSI_PATTERN = re.compile(r"\x1b\[[0-9;]*m")
+
 
 # Download NLTK data if needed
-def ensure_nltk_resources():
-    """Ensure required NLTK resources are downloaded."""
-    nltk.download('punkt', quiet=True)
+def ensure_nltk_resources() -> bool:
+    """
+    Ensure the NLTK sentence tokenizer is available.
+
+    The local NLTK data directories are checked first, so nothing touches the
+    network once the tokenizer is installed. If it is missing and cannot be
+    downloaded (e.g. offline), a warning is printed instead of raising.
+
+    Returns:
+        Whether the tokenizer is available
+    """
+    global _nltk_ready
+    if _nltk_ready:
+        return True
+
+    import nltk
+    from nltk.tokenize import punkt
+
+    # NLTK 3.9+ loads sentence tokenizers from punkt_tab instead of the pickled punkt models
+    resource = 'punkt_tab' if hasattr(punkt, 'PunktTokenizer') else 'punkt'
+    try:
+        nltk.data.find(f'tokenizers/{resource}')
+        _nltk_ready = True
+    except LookupError:
+        try:
+            _nltk_ready = bool(nltk.download(resource, quiet=True, raise_on_error=True))
+        except Exception:
+            _nltk_ready = False
+
+    if not _nltk_ready:
+        from src.constants import COLORS
+        print(f"{COLORS['warning']}NLTK '{resource}' tokenizer is not installed and could not be downloaded; "
+              f"document ingestion needs it (python -m nltk.downloader {resource}).")
+    return _nltk_ready
 
 
 def load_config() -> Dict[str, Any]:
-    """Load configuration from JSON file."""
-    config_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'config.json')
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    """Current config.json as an immutable snapshot (parsed once, reloaded when the file changes)."""
+    return get_config_service().config
 
 
 def load_settings() -> Dict[str, Any]:
-    """Load settings from YAML file."""
-    settings_path = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'settings.yaml')
-    with open(settings_path, 'r') as f:
-        return yaml.safe_load(f)
+    """Current settings.yaml as an immutable snapshot (parsed once, reloaded when the file changes)."""
+    return get_config_service().settings
 
 
 def format_section(title: str, content: list, color) -> str:
@@ -57,6 +89,102 @@ def format_section(title: str, content: list, color) -> str:
     return "\n".join([border_top, title_line] + content_lines + [border_bottom])
 
 
+def strip_colors(text: str) -> str:
+    """Remove terminal colour codes, e.g. before writing a rendered section to a file or JSON."""
+    return ANSI_PATTERN.sub("", text)
+
+
+class StreamingSection:
+    """Bordered section rendered incrementally, word-wrapped to a fixed width, as text arrives."""
+
+    def __init__(self, title: str, color, width: int = 80):
+        """
+        Args:
+            title: The title of the section
+            color: Color to use for the border
+            width: Content width in characters
+        """
+        self.title = title
+        self.color = color
+        self.width = width
+        self._column = 0
+        self._word = ""
+        self._started = False
+
+    def write(self, text: str) -> None:
+        """Render a piece of streamed text, emitting each word as soon as it is complete."""
+        if not self._started:
+            self._start()
+        for char in text:
+            if char == "\n":
+                self._flush_word()
+                self._end_line()
+            elif char.isspace():
+                self._flush_word()
+                if 0 < self._column < self.width:
+                    self._emit(" ")
+            else:
+                self._word += char
+        sys.stdout.flush()
+
+    def finish(self) -> None:
+        """Flush the last word and close the box."""
+        if not self._started:
+            self._start()
+        self._flush_word()
+        self._end_line(reopen=False)
+        sys.stdout.write(f"{self.color}╰{'─' * (self.width + 4)}╯\n")
+        sys.stdout.flush()
+
+    def _start(self) -> None:
+        """Print the top border and title, then open the first content line."""
+        self._started = True
+        sys.stdout.write(f"{self.color}╭{'─' * (self.width + 4)}╮\n")
+        sys.stdout.write(f"{self.color}│ {Style.BRIGHT}{self.title.upper().center(self.width + 2)}{Style.NORMAL} {self.color}│\n")
+        self._open_line()
+
+    def _open_line(self) -> None:
+        """Print the left border of a new content line."""
+        from src.constants import COLORS
+        sys.stdout.write(f"{self.color}│{COLORS['text']}  ")
+        self._column = 0
+
+    def _end_line(self, reopen: bool = True) -> None:
+        """Pad the current line, print the right border and optionally open the next line."""
+        sys.stdout.write(f"{' ' * (self.width - self._column)}  {self.color}│\n")
+        if reopen:
+            self._open_line()
+
+    def _flush_word(self) -> None:
+        """Emit the buffered word, wrapping (and hard-splitting overlong words) at the width."""
+        word, self._word = self._word, ""
+        while word:
+            if self._column and self._column + len(strip_colors(word)) > self.width:
+                self._end_line()
+            piece, word = _split_visible(word, self.width - self._column)
+            self._emit(piece)
+
+    def _emit(self, text: str) -> None:
+        """Write text on the current line; colour codes take no width."""
+        sys.stdout.write(text)
+        self._column += len(strip_colors(text))
+
+
+def _split_visible(text: str, width: int) -> Tuple[str, str]:
+    """Split text after width visible characters, keeping colour codes whole and on the first part."""
+    visible, end = 0, 0
+    while end < len(text):
+        code = ANSI_PATTERN.match(text, end)
+        if code:
+            end = code.end()
+        elif visible < width:
+            visible += 1
+            end += 1
+        else:
+            break
+    return text[:end], text[end:]
+
+
 def get_current_date() -> str:
     """Get current date in YYYY-MM-DD format."""
     return datetime.now().strftime("%Y-%m-%d")
@@ -73,7 +201,7 @@ def get_resources_for_role(role: str) -> List[Dict[str, str]]:
         List of resource dictionaries
     """
     settings = load_settings()
-    resources = settings['resources']['common']
+    resources = list(settings['resources']['common'])
 
     # Add role-specific resources
     if 'engineer' in role.lower():
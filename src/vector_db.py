@@ -1,66 +1,666 @@
-# src/vector_db.py
 """
 Vector database functionality for the AI Onboarding System.
 """
 
-import uuid
-import chromadb
-from chromadb.utils import embedding_functions
-from nltk.tokenize import sent_tokenize
+import os
+import sys
+import time
+import atexit
+import weakref
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
 from PyPDF2 import PdfReader
-from typing import List, Dict, Any
+from typing import Iterable, Iterator, List, Dict, Any, Optional, Tuple
 
-from src.utils import load_config
+from src.chunking import Chunker
+from src.constants import COLORS, INGEST_EXTENSIONS
+from src.embedding_cache import CachedEmbeddingFunction, EmbeddingCache
+from src.embeddings import build_embedding_function, embedding_namespace
+from src.lexical_index import BM25Index, bm25_index_path, reciprocal_rank_fusion
+from src.vector_store import build_vector_store
+from src.manifest import IngestManifest, chunk_id, file_sha256, manifest_path, source_key
+from src.metrics import get_metrics
+from src.config_service import get_config_service
+from src.utils import ensure_nltk_resources, load_config
+
+
+def _iter_pages(file_path: str, block_size: int = 1 << 16) -> Iterator[Tuple[int, str]]:
+    """
+    Stream the text of a document one page at a time.
+
+    PDFs yield one item per page; plain-text files yield line-aligned blocks of
+    roughly block_size characters, all attributed to page 1.
+
+    Args:
+        file_path: Path to the document file
+        block_size: Approximate block size for plain-text files
+
+    Yields:
+        Tuples of (1-based page number, page text)
+    """
+    if file_path.endswith('.pdf'):
+        with open(file_path, 'rb') as f:
+            reader = PdfReader(f)
+            for page_number, page in enumerate(reader.pages, 1):
+                yield page_number, page.extract_text() or ""
+    else:
+        with open(file_path, 'r') as f:
+            lines, size = [], 0
+            for line in f:
+                lines.append(line)
+                size += len(line)
+                if size >= block_size:
+                    yield 1, "".join(lines)
+                    lines, size = [], 0
+            if lines:
+                yield 1, "".join(lines)
+
+
+def _extract_text(file_path: str) -> str:
+    """
+    Extract text from various file formats.
+
+    Args:
+        file_path: Path to the document file
+
+    Returns:
+        Extracted text content
+    """
+    return "\n".join(text for _, text in _iter_pages(file_path)).strip()
+
+
+def _timed_pages(pages: Iterator[Tuple[int, str]], timings: Dict[str, float]) -> Iterator[Tuple[int, str]]:
+    """Pass pages through, adding the time spent extracting them to timings["extraction"]."""
+    while True:
+        started = time.perf_counter()
+        page = next(pages, None)
+        timings["extraction"] += time.perf_counter() - started
+        if page is None:
+            return
+        yield page
+
+
+def _iter_chunks(file_path: str, chunker: Chunker,
+                 timings: Optional[Dict[str, float]] = None) -> Iterator[Tuple[str, int, int, int]]:
+    """
+    Incrementally chunk a document across page boundaries.
+
+    Only the current page and the sentences of the chunk being built are held in memory.
+
+    Args:
+        file_path: Path to the document file
+        chunker: Splits the pages into sentences and groups them into chunks
+        timings: When given, extraction and tokenization seconds are added to it (optional)
+
+    Yields:
+        Tuples of (chunk text, first page, last page, tokens)
+    """
+    pages = _iter_pages(file_path)
+    if timings is not None:
+        timings.setdefault("extraction", 0.0)
+        timings.setdefault("tokenization", 0.0)
+        pages = _timed_pages(pages, timings)
+    return chunker.iter_chunks(pages, timings)
+
+
+def _document_type(file_path: str) -> str:
+    """Determine document type based on filename."""
+    return "hr" if "hr" in file_path.lower() else "technical"
+
+
+def _chunk_metadata(file_path: str, doc_type: str, page_start: int, page_end: int,
+                    tokens: int, chunker: Chunker) -> Dict[str, Any]:
+    """Build the metadata stored alongside a chunk, including the chunking parameters."""
+    return {"source": file_path, "type": doc_type, "page_start": page_start, "page_end": page_end,
+            "tokens": tokens, **chunker.metadata}
+
+
+def _prepare_document(file_path: str, chunker: Chunker, known_sha256: str = None) -> Dict[str, Any]:
+    """
+    Hash, extract, split and chunk a single document.
+
+    Module-level so it can run inside a worker process during bulk ingestion.
+    When the file's content hash matches known_sha256, extraction is skipped.
+
+    Args:
+        file_path: Path to the document file
+        chunker: Chunker to split the document with
+        known_sha256: Content hash recorded at the previous ingestion with the same chunker (optional)
+
+    Returns:
+        Dictionary with source, sha256, mtime, size, the chunker signature, per-stage
+        timings (seconds) and, unless unchanged, ids, chunks and metadatas
+    """
+    source = source_key(file_path)
+    stat = os.stat(file_path)
+    sha256 = file_sha256(file_path)
+    prepared = {"source": source, "sha256": sha256, "mtime": stat.st_mtime, "size": stat.st_size,
+                "chunker": chunker.signature, "ids": None, "chunks": None, "metadatas": None, "timings": {}}
+    if sha256 == known_sha256:
+        return prepared
+
+    doc_type = _document_type(file_path)
+
+    # Content-addressed ids; repeated chunks within a document collapse into one
+    ids, chunks, metadatas = [], [], []
+    seen = set()
+    for chunk, page_start, page_end, tokens in _iter_chunks(file_path, chunker, prepared["timings"]):
+        cid = chunk_id(source, chunk)
+        if cid not in seen:
+            seen.add(cid)
+            ids.append(cid)
+            chunks.append(chunk)
+            metadatas.append(_chunk_metadata(file_path, doc_type, page_start, page_end, tokens, chunker))
+
+    prepared["ids"] = ids
+    prepared["chunks"] = chunks
+    prepared["metadatas"] = metadatas
+    return prepared
+
+
+def _save_at_exit(reference: "weakref.ref[OnboardingVectorDB]") -> None:
+    """Write a database's unsaved changes when the interpreter exits."""
+    db = reference()
+    if db is not None:
+        db.save()
 
 
 class OnboardingVectorDB:
     """Vector database for storing and retrieving onboarding documents."""
 
-    def __init__(self):
-        """Initialize the vector database with configuration settings."""
-        config = load_config()
+    def __init__(self, config: Dict[str, Any] = None):
+        """
+        Initialize the vector database with configuration settings.
+
+        Args:
+            config: Configuration to use instead of config.json (optional)
+        """
+        self._config_overridden = config is not None
+        config = config if config is not None else load_config()
         db_config = config['database']
 
-        # Initialize ChromaDB client
-        self.client = chromadb.PersistentClient(path=db_config['path'])
+        # Initialize embedding function for the configured backend (torch, onnx or onnx-int8),
+        # or use the node's shared embedding service so workers do not each load the model
+        service_config = db_config.get('embedding_service', {})
+        if service_config.get('enabled', False):
+            from src.embedding_service import RemoteEmbeddingFunction
+            self.embedder = RemoteEmbeddingFunction(
+                service_config['socket_path'],
+                expected_namespace=embedding_namespace(db_config),
+                timeout=service_config.get('timeout_seconds', 30)
+            )
+        else:
+            self.embedder = build_embedding_function(db_config)
 
-        # Initialize embedding function
-        self.embedder = embedding_functions.SentenceTransformerEmbeddingFunction(
-            model_name=db_config['embedding_model']
-        )
+        # Serve repeated texts (ingestion and queries alike) from the on-disk embedding cache
+        cache_config = db_config.get('embedding_cache', {})
+        if cache_config.get('enabled', False):
+            self.embedder = CachedEmbeddingFunction(
+                self.embedder,
+                EmbeddingCache(cache_config['path'], cache_config['max_entries']),
+                namespace=embedding_namespace(db_config)
+            )
 
-        # Get or create collection
-        self.collection = self.client.get_or_create_collection(
-            name=db_config['collection'],
-            embedding_function=self.embedder,
-            metadata={"hnsw:space": db_config['similarity_metric']}
-        )
+        # Storage and similarity search backend (chroma or numpy)
+        self.store = build_vector_store(db_config, self.embedder)
 
-    def ingest_document(self, file_path: str, chunk_size: int = 3) -> None:
+        # Per-source manifest used to skip unchanged files on re-ingestion
+        self.manifest = IngestManifest(manifest_path(db_config))
+
+        # Lexical BM25 index maintained alongside the vector store for hybrid retrieval
+        self.hybrid_config = config['rag'].get('hybrid', {})
+        self.lexical_index = None
+        if self.hybrid_config.get('enabled', False):
+            self.lexical_index = BM25Index(
+                bm25_index_path(db_config),
+                k1=self.hybrid_config.get('bm25_k1', 1.2),
+                b=self.hybrid_config.get('bm25_b', 0.75)
+            )
+            if not self.lexical_index.exists and self.store.count():
+                self._rebuild_lexical_index()
+
+        # Bulk ingestion settings
+        self._apply_tunables(config)
+
+        # Single-document changes are saved periodically by ingest_document, and on exit
+        self._unsaved = False
+        self._last_save = time.monotonic()
+        self._save_seconds = 0.0
+        atexit.register(_save_at_exit, weakref.ref(self))
+
+        # Pick up edits to config.json without a restart (unless config was given explicitly)
+        get_config_service().subscribe(self._on_config_reload)
+
+    def _apply_tunables(self, config: Dict[str, Any]) -> None:
+        """Read the settings that can change while running."""
+        db_config = config['database']
+        self.ingest_workers = db_config.get('ingest_workers') or os.cpu_count() or 1
+        self.ingest_batch_size = min(db_config.get('ingest_batch_size', 256), self.store.max_batch_size)
+        self.save_interval = db_config.get('save_interval_seconds', 5.0)
+        self.chunker = Chunker.from_config(config)
+
+        # Fusion parameters apply immediately; turning hybrid retrieval on or off needs a restart
+        if self.lexical_index is not None:
+            self.hybrid_config = config['rag'].get('hybrid', {})
+            self.lexical_index.k1 = self.hybrid_config.get('bm25_k1', 1.2)
+            self.lexical_index.b = self.hybrid_config.get('bm25_b', 0.75)
+
+    def _on_config_reload(self, config: Dict[str, Any], settings: Dict[str, Any]) -> None:
+        """Apply reloaded configuration. The embedder and vector store backend are fixed for the instance."""
+        if not self._config_overridden:
+            self._apply_tunables(config)
+
+    def ingest_document(self, file_path: str, chunker: Chunker = None) -> int:
         """
         Process documents into vector database.
 
+        Pages are streamed and chunked incrementally, and chunks are embedded in
+        batches as they are produced, so memory stays flat regardless of document size.
+        Re-ingesting an unchanged file is a no-op; a changed file only has its
+        new chunks embedded and its stale chunks removed. Files chunked with other
+        chunking parameters are chunked again. Changes are written to disk at most
+        every database.save_interval_seconds; call save() to write them at once.
+
         Args:
             file_path: Path to the document file
-            chunk_size: Number of sentences per chunk
+            chunker: Chunker to use (defaults to the one from the chunking config)
+
+        Returns:
+            Number of chunks added
         """
-        text = self._extract_text(file_path)
-        sentences = sent_tokenize(text)
-        chunks = [' '.join(sentences[i:i + chunk_size]) for i in range(0, len(sentences), chunk_size)]
+        chunker = chunker or self.chunker
+        source = source_key(file_path)
+        stat = os.stat(file_path)
+        if self.manifest.is_unchanged(source, stat.st_mtime, stat.st_size, chunker.signature):
+            return 0
 
-        # Determine document type based on filename
-        doc_type = "hr" if "hr" in file_path.lower() else "technical"
-        metadatas = [{"source": file_path, "type": doc_type} for _ in chunks]
+        if chunker.splitter == "punkt":
+            ensure_nltk_resources()
+        entry = self.manifest.get(source)
+        sha256 = file_sha256(file_path)
+        rechunked = entry is not None and entry.get("chunker") != chunker.signature
+        if entry and entry["sha256"] == sha256 and not rechunked:
+            self.manifest.record(source, sha256, stat.st_mtime, stat.st_size, entry["chunk_ids"], chunker.signature)
+            self._save_when_due()
+            return 0
 
-        # Add chunks to vector database
-        self.collection.add(
-            documents=chunks,
-            ids=[str(uuid.uuid4()) for _ in chunks],
-            metadatas=metadatas
-        )
+        old_ids = set(entry["chunk_ids"]) if entry else set()
+        # Chunks from another chunker are rewritten even if their text is unchanged, to update their metadata
+        written_ids = set() if rechunked else old_ids
+        doc_type = _document_type(file_path)
+        chunk_ids, seen, added = [], set(), 0
+        batch_ids, batch_chunks, batch_metadatas = [], [], []
+        metrics = get_metrics()
+        timings = {} if metrics.enabled else None
+
+        for chunk, page_start, page_end, tokens in _iter_chunks(file_path, chunker, timings):
+            cid = chunk_id(source, chunk)
+            if cid in seen:
+                continue
+            seen.add(cid)
+            chunk_ids.append(cid)
+            if cid in written_ids:
+                continue
+
+            batch_ids.append(cid)
+            batch_chunks.append(chunk)
+            batch_metadatas.append(_chunk_metadata(file_path, doc_type, page_start, page_end, tokens, chunker))
+
+            # Add chunks to vector database as soon as a batch is full
+            if len(batch_chunks) >= self.ingest_batch_size:
+                added += self._add_batch(batch_ids, batch_chunks, batch_metadatas)
+                batch_ids, batch_chunks, batch_metadatas = [], [], []
+
+        if batch_chunks:
+            added += self._add_batch(batch_ids, batch_chunks, batch_metadatas)
+        self._observe_timings(timings)
+
+        stale = [cid for cid in old_ids if cid not in seen]
+        if stale:
+            self._delete_ids(stale)
+
+        self.manifest.record(source, sha256, stat.st_mtime, stat.st_size, chunk_ids, chunker.signature)
+        self._save_when_due()
+
+        return added
+
+    def ingest_directory(self, directory: str, recursive: bool = True,
+                         purge_missing: bool = True, **kwargs) -> Dict[str, Any]:
+        """
+        Ingest every supported document found in a directory.
+
+        Args:
+            directory: Directory to scan
+            recursive: Whether to descend into subdirectories
+            purge_missing: Remove chunks of previously ingested files that no longer exist
+            **kwargs: Passed through to ingest_many
+
+        Returns:
+            Ingestion statistics (see ingest_many), plus the number of purged sources
+        """
+        file_paths = []
+        for root, dirs, files in os.walk(directory):
+            dirs.sort()
+            for name in sorted(files):
+                if name.lower().endswith(INGEST_EXTENSIONS):
+                    file_paths.append(os.path.join(root, name))
+            if not recursive:
+                break
+
+        stats = self.ingest_many(file_paths, **kwargs)
+
+        stats["purged"] = 0
+        if purge_missing:
+            prefix = os.path.join(source_key(directory), "")
+            present = {source_key(path) for path in file_paths}
+            for source in list(self.manifest.sources):
+                in_scope = source.startswith(prefix) and (recursive or os.path.dirname(source) == prefix[:-1])
+                if in_scope and source not in present:
+                    self.purge_source(source)
+                    stats["purged"] += 1
+            if stats["purged"]:
+                self._save()
+
+        return stats
+
+    def ingest_many(self, file_paths: Iterable[str], chunker: Chunker = None,
+                    workers: int = None, batch_size: int = None, show_progress: bool = True) -> Dict[str, Any]:
+        """
+        Ingest many documents with parallel extraction and batched writes.
+
+        Hashing, text extraction and sentence splitting run in a process pool, while
+        chunks from all files are pooled and embedded/written in bounded batches.
+        Files whose mtime, size or content hash are unchanged are skipped.
+
+        Args:
+            file_paths: Paths of the documents to ingest
+            chunker: Chunker to use (defaults to the one from the chunking config)
+            workers: Number of worker processes (defaults to database.ingest_workers)
+            batch_size: Maximum chunks per vector store write (defaults to database.ingest_batch_size)
+            show_progress: Whether to print progress and throughput
+
+        Returns:
+            Dictionary with documents, skipped, chunks, removed, failed, elapsed,
+            docs_per_sec and chunks_per_sec
+        """
+        chunker = chunker or self.chunker
+        workers = workers or self.ingest_workers
+        batch_size = min(batch_size or self.ingest_batch_size, self.store.max_batch_size)
+
+        stats = {"documents": 0, "skipped": 0, "chunks": 0, "removed": 0, "failed": []}
+        started = time.perf_counter()
+
+        # Cheap mtime/size check before any file is opened
+        to_process = []
+        for file_path in file_paths:
+            try:
+                stat = os.stat(file_path)
+            except OSError as e:
+                stats["failed"].append({"source": file_path, "error": str(e)})
+                continue
+            if self.manifest.is_unchanged(source_key(file_path), stat.st_mtime, stat.st_size, chunker.signature):
+                stats["skipped"] += 1
+            else:
+                to_process.append(file_path)
+        total = len(to_process) + stats["skipped"] + len(stats["failed"])
+        if to_process and chunker.splitter == "punkt":
+            ensure_nltk_resources()
+
+        pending_ids, pending_chunks, pending_metadatas = [], [], []
+        # Manifest entries are committed only once all of their chunks are written
+        queued, written, uncommitted = 0, 0, []
+
+        try:
+            for file_path, result in self._iter_prepared(to_process, chunker, workers):
+                if isinstance(result, Exception):
+                    stats["failed"].append({"source": file_path, "error": str(result)})
+                elif result["ids"] is None:
+                    self._record(result)
+                    stats["skipped"] += 1
+                else:
+                    self._observe_timings(result["timings"])
+                    ids, chunks, metadatas = self._apply_changes(result, stats)
+                    pending_ids.extend(ids)
+                    pending_chunks.extend(chunks)
+                    pending_metadatas.extend(metadatas)
+                    queued += len(chunks)
+                    uncommitted.append((queued, result))
+                    stats["documents"] += 1
+
+                # Write full batches as soon as they are available
+                while len(pending_chunks) >= batch_size:
+                    written += self._add_batch(pending_ids[:batch_size], pending_chunks[:batch_size],
+                                               pending_metadatas[:batch_size])
+                    del pending_ids[:batch_size]
+                    del pending_chunks[:batch_size]
+                    del pending_metadatas[:batch_size]
+                    uncommitted = self._commit_written(uncommitted, written)
+
+                if show_progress:
+                    stats["chunks"] = written
+                    self._report_progress(stats, total, time.perf_counter() - started)
+
+            if pending_chunks:
+                written += self._add_batch(pending_ids, pending_chunks, pending_metadatas)
+            uncommitted = self._commit_written(uncommitted, written)
+        finally:
+            self._save()
+
+        elapsed = time.perf_counter() - started
+        stats["chunks"] = written
+        stats["elapsed"] = elapsed
+        stats["docs_per_sec"] = stats["documents"] / elapsed if elapsed > 0 else 0.0
+        stats["chunks_per_sec"] = stats["chunks"] / elapsed if elapsed > 0 else 0.0
+
+        if show_progress:
+            self._report_progress(stats, total, elapsed)
+            print()
+
+        return stats
+
+    def purge_source(self, file_path: str) -> int:
+        """
+        Remove every chunk of a previously ingested file.
+
+        Args:
+            file_path: Path (or manifest key) of the file
+
+        Returns:
+            Number of chunks removed
+        """
+        entry = self.manifest.remove(source_key(file_path))
+        if not entry:
+            return 0
+        self._unsaved = True
+        self._delete_ids(entry["chunk_ids"])
+        return len(entry["chunk_ids"])
+
+    def _apply_changes(self, prepared: Dict[str, Any],
+                       stats: Dict[str, Any] = None) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """
+        Diff a prepared document against the manifest and drop stale chunks.
+
+        Args:
+            prepared: Result of _prepare_document
+            stats: Ingestion statistics to update (optional)
+
+        Returns:
+            Tuple of (ids, chunks, metadatas) that still need to be written
+        """
+        if prepared["ids"] is None:
+            return [], [], []
+
+        entry = self.manifest.get(prepared["source"])
+        old_ids = set(entry["chunk_ids"]) if entry else set()
+        new_ids = set(prepared["ids"])
+
+        stale = [cid for cid in old_ids if cid not in new_ids]
+        if stale:
+            self._delete_ids(stale)
+            if stats is not None:
+                stats["removed"] += len(stale)
+
+        # Chunks from another chunker are rewritten even if their text is unchanged, to update their metadata
+        if entry and entry.get("chunker") != prepared["chunker"]:
+            old_ids = set()
+        keep = [i for i, cid in enumerate(prepared["ids"]) if cid not in old_ids]
+        return ([prepared["ids"][i] for i in keep],
+                [prepared["chunks"][i] for i in keep],
+                [prepared["metadatas"][i] for i in keep])
+
+    def _record(self, prepared: Dict[str, Any]) -> None:
+        """Store a prepared document's hash, stat and chunk ids in the manifest."""
+        chunk_ids = prepared["ids"]
+        if chunk_ids is None:
+            entry = self.manifest.get(prepared["source"])
+            chunk_ids = entry["chunk_ids"] if entry else []
+        self.manifest.record(prepared["source"], prepared["sha256"], prepared["mtime"], prepared["size"], chunk_ids,
+                             prepared["chunker"])
+
+    def _commit_written(self, uncommitted: List[Tuple[int, Dict[str, Any]]], written: int) -> List[Tuple[int, Dict[str, Any]]]:
+        """Record manifest entries whose chunks have all been written; return the rest."""
+        while uncommitted and uncommitted[0][0] <= written:
+            self._record(uncommitted.pop(0)[1])
+        return uncommitted
+
+    def _iter_prepared(self, file_paths: List[str], chunker: Chunker,
+                       workers: int) -> Iterator[Tuple[str, Any]]:
+        """
+        Yield prepared documents as they complete, keeping in-flight work bounded.
+
+        Args:
+            file_paths: Paths of the documents to prepare
+            chunker: Chunker to split the documents with
+            workers: Number of worker processes
+
+        Yields:
+            Tuples of (file_path, result) where result is the prepared document or the raised exception
+        """
+        def known_sha256(path):
+            entry = self.manifest.get(source_key(path))
+            return entry["sha256"] if entry and entry.get("chunker") == chunker.signature else None
 
+        if workers <= 1 or len(file_paths) <= 1:
+            for file_path in file_paths:
+                try:
+                    yield file_path, _prepare_document(file_path, chunker, known_sha256(file_path))
+                except Exception as e:
+                    yield file_path, e
+            return
+
+        remaining = iter(file_paths)
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            in_flight = {}
+            for file_path in remaining:
+                in_flight[pool.submit(_prepare_document, file_path, chunker, known_sha256(file_path))] = file_path
+                if len(in_flight) >= workers * 2:
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    file_path = in_flight.pop(future)
+                    try:
+                        yield file_path, future.result()
+                    except Exception as e:
+                        yield file_path, e
+
+                    # Top up the pool with the next file
+                    next_path = next(remaining, None)
+                    if next_path is not None:
+                        in_flight[pool.submit(_prepare_document, next_path, chunker,
+                                              known_sha256(next_path))] = next_path
+
+    def _add_batch(self, ids: List[str], chunks: List[str], metadatas: List[Dict[str, Any]]) -> int:
+        """
+        Embed and write one batch of chunks to the vector store.
+
+        Args:
+            ids: Content-addressed chunk ids
+            chunks: Chunk texts
+            metadatas: Metadata for each chunk
+
+        Returns:
+            Number of chunks written
+        """
+        metrics = get_metrics()
+        with metrics.timer("onboarding_ingest_stage_seconds", stage="embedding"):
+            embeddings = self.embedder(chunks)
+
+        # Upsert keeps re-ingestion idempotent even if the manifest was lost
+        with metrics.timer("onboarding_ingest_stage_seconds", stage="add"):
+            self.store.upsert(
+                ids=ids,
+                documents=chunks,
+                embeddings=embeddings,
+                metadatas=metadatas
+            )
+            if self.lexical_index is not None:
+                self.lexical_index.add(ids, chunks, metadatas)
+        metrics.inc("onboarding_ingested_chunks_total", len(chunks))
         return len(chunks)
 
+    @staticmethod
+    def _observe_timings(timings: Optional[Dict[str, float]]) -> None:
+        """Record a document's extraction and tokenization time, which may have been measured in a worker."""
+        if not timings:
+            return
+        metrics = get_metrics()
+        for stage, seconds in timings.items():
+            metrics.observe("onboarding_ingest_stage_seconds", seconds, stage=stage)
+
+    def _delete_ids(self, ids: List[str]) -> None:
+        """Delete chunks by id."""
+        self.store.delete(ids)
+        if self.lexical_index is not None:
+            self.lexical_index.remove(ids)
+
+    def save(self) -> None:
+        """Write changes not yet saved by ingest_document or purge_source to disk."""
+        if self._unsaved:
+            self._save()
+
+    def _save(self) -> None:
+        """Persist the manifest together with the vector store and lexical index."""
+        started = time.monotonic()
+        self.store.persist()
+        if self.lexical_index is not None:
+            self.lexical_index.save()
+        self.manifest.save()
+        self._unsaved = False
+        self._last_save = time.monotonic()
+        self._save_seconds = self._last_save - started
+
+    def _save_when_due(self) -> None:
+        """
+        Save after a single-document change once enough time has passed.
+
+        A save rewrites whole files, so saving after every document would make
+        one-by-one ingestion quadratic. Saves are at least save_interval seconds
+        apart, and at least ten times as long apart as the last save took.
+        """
+        self._unsaved = True
+        if time.monotonic() - self._last_save >= max(self.save_interval, 10 * self._save_seconds):
+            self._save()
+
+    def _rebuild_lexical_index(self) -> None:
+        """Index every chunk already in the vector store, e.g. when hybrid retrieval is first enabled."""
+        for page in self.store.scan():
+            self.lexical_index.add(page["ids"], page["documents"], page["metadatas"])
+        self.lexical_index.save()
+
+    @staticmethod
+    def _report_progress(stats: Dict[str, Any], total: int, elapsed: float) -> None:
+        """Print a single-line progress update with throughput."""
+        processed = stats["documents"] + stats["skipped"] + len(stats["failed"])
+        docs_rate = stats["documents"] / elapsed if elapsed > 0 else 0.0
+        chunks_rate = stats["chunks"] / elapsed if elapsed > 0 else 0.0
+        sys.stdout.write(
+            f"\r{COLORS['border']}Ingested {processed}/{total} documents "
+            f"({stats['skipped']} unchanged, {stats['chunks']} chunks, {len(stats['failed'])} failed) "
+            f"{COLORS['success']}{docs_rate:.1f} docs/s, {chunks_rate:.1f} chunks/s"
+        )
+        sys.stdout.flush()
+
     def _extract_text(self, file_path: str) -> str:
         """
         Extract text from various file formats.
@@ -71,34 +671,92 @@ class OnboardingVectorDB:
         Returns:
             Extracted text content
         """
-        if file_path.endswith('.pdf'):
-            text = ""
-            with open(file_path, 'rb') as f:
-                reader = PdfReader(f)
-                for page in reader.pages:
-                    text += page.extract_text() + "\n"
-            return text.strip()
-        else:
-            with open(file_path, 'r') as f:
-                return f.read()
+        return _extract_text(file_path)
+
+    @property
+    def corpus_version(self) -> str:
+        """Token that changes whenever chunks are added to or removed from the corpus."""
+        return self.manifest.version
+
+    def embed_query(self, query_text: str) -> List[float]:
+        """
+        Embed a query with the same embedder used for ingestion.
+
+        Args:
+            query_text: The query text
+
+        Returns:
+            Query embedding
+        """
+        return self.embedder([query_text])[0]
 
-    def query_documents(self, query_text: str, doc_type: str = None, n_results: int = 3) -> Dict[str, Any]:
+    def query_documents(self, query_text: str, doc_type: str = None, n_results: int = 3,
+                        query_embedding: List[float] = None) -> Dict[str, Any]:
         """
         Query the vector database for relevant documents.
 
+        With rag.hybrid enabled, vector hits and BM25 hits are merged with
+        reciprocal-rank fusion before the top n_results are returned. The result
+        has the same keys either way, ordered best first; hits found only by BM25
+        get their real vector distance, so distances need not be ascending.
+
         Args:
             query_text: The query text
             doc_type: Type of document to filter by (optional)
             n_results: Number of results to return
+            query_embedding: Precomputed embedding of query_text (optional)
 
         Returns:
             Query results
         """
         where_filter = {"type": doc_type} if doc_type else None
+        if query_embedding is None:
+            query_embedding = self.embed_query(query_text)
+
+        metrics = get_metrics()
+        if self.lexical_index is None:
+            with metrics.timer("onboarding_ask_stage_seconds", stage="vector_search"):
+                return self.store.query(
+                    query_embeddings=[query_embedding],
+                    n_results=n_results,
+                    where=where_filter
+                )
+
+        # Over-fetch from both retrievers, then fuse their rankings
+        candidates = max(self.hybrid_config.get('candidates', 20), n_results)
+        with metrics.timer("onboarding_ask_stage_seconds", stage="vector_search"):
+            vector_results = self.store.query(
+                query_embeddings=[query_embedding],
+                n_results=candidates,
+                where=where_filter
+            )
+        with metrics.timer("onboarding_ask_stage_seconds", stage="lexical_search"):
+            lexical_hits = self.lexical_index.search(query_text, candidates, doc_type)
+        fused = reciprocal_rank_fusion(
+            [vector_results['ids'][0], [doc_id for doc_id, _ in lexical_hits]],
+            k=self.hybrid_config.get('rrf_k', 60)
+        )[:n_results]
+
+        # Look up lexical-only hits that the vector search did not return
+        records = {
+            doc_id: (document, metadata, distance)
+            for doc_id, document, metadata, distance in zip(
+                vector_results['ids'][0], vector_results['documents'][0],
+                vector_results['metadatas'][0], vector_results['distances'][0]
+            )
+        }
+        missing = [doc_id for doc_id, _ in fused if doc_id not in records]
+        if missing:
+            fetched = self.store.get(missing)
+            distances = self.store.distances(query_embedding, missing)
+            for doc_id, document, metadata in zip(fetched['ids'], fetched['documents'], fetched['metadatas']):
+                if doc_id in distances:
+                    records[doc_id] = (document, metadata, distances[doc_id])
 
-        return self.collection.query(
-            query_texts=[query_text],
-            n_results=n_results,
-            where=where_filter,
-            include=["documents", "metadatas"]
-        )
\ No newline at end of file
+        ranked = [doc_id for doc_id, _ in fused if doc_id in records]
+        return {
+            "ids": [ranked],
+            "documents": [[records[doc_id][0] for doc_id in ranked]],
+            "metadatas": [[records[doc_id][1] for doc_id in ranked]],
+            "distances": [[records[doc_id][2] for doc_id in ranked]]
+        }
@@ -0,0 +1,412 @@
+"""
+Vector store backends for the AI Onboarding System.
+
+OnboardingVectorDB computes embeddings itself and delegates storage and
+similarity search to one of these backends, selected by database.backend:
+
+- "chroma": ChromaDB persistent collection with an HNSW index
+- "numpy": in-process exact search over a contiguous float32 matrix
+"""
+
+import os
+import json
+import uuid
+import sqlite3
+import threading
+import numpy as np
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Iterator, List, Sequence
+
+VECTOR_STORE_BACKENDS = ("chroma", "numpy")
+
+
+class VectorStore(ABC):
+    """Storage and similarity search for embedded chunks."""
+
+    # Largest number of records accepted by a single write
+    max_batch_size: int = 5000
+
+    @abstractmethod
+    def upsert(self, ids: List[str], documents: List[str], embeddings: Sequence[Sequence[float]],
+               metadatas: List[Dict[str, Any]]) -> None:
+        """Insert records, replacing any with the same id."""
+
+    @abstractmethod
+    def delete(self, ids: List[str]) -> None:
+        """Remove records by id; unknown ids are ignored."""
+
+    @abstractmethod
+    def get(self, ids: List[str]) -> Dict[str, List[Any]]:
+        """Fetch records by id as a dictionary with ids, documents and metadatas lists."""
+
+    @abstractmethod
+    def query(self, query_embeddings: Sequence[Sequence[float]], n_results: int,
+              where: Dict[str, Any] = None) -> Dict[str, List[List[Any]]]:
+        """
+        Find the nearest records for each query embedding.
+
+        Returns:
+            Chroma-shaped result: ids, documents, metadatas and distances, each a list per query
+        """
+
+    @abstractmethod
+    def distances(self, query_embedding: Sequence[float], ids: List[str]) -> Dict[str, float]:
+        """Distances from a query embedding to stored records, in the units query() reports; unknown ids are skipped."""
+
+    @abstractmethod
+    def count(self) -> int:
+        """Number of stored records."""
+
+    @abstractmethod
+    def memory_bytes(self) -> int:
+        """Approximate bytes of index data the store keeps in memory."""
+
+    @abstractmethod
+    def scan(self, batch_size: int = 1000) -> Iterator[Dict[str, List[Any]]]:
+        """Iterate over every stored record in pages of ids, documents and metadatas."""
+
+    def persist(self) -> None:
+        """Flush in-memory state to disk, for backends that need it."""
+
+
+class ChromaVectorStore(VectorStore):
+    """ChromaDB persistent collection."""
+
+    def __init__(self, db_config: Dict[str, Any], embedder=None):
+        """
+        Open (or create) the configured collection.
+
+        Args:
+            db_config: The database section of config.json
+            embedder: Embedding function attached to the collection for direct text queries (optional)
+        """
+        import chromadb
+
+        # Initialize ChromaDB client
+        self.path = db_config['path']
+        self.metric = db_config['similarity_metric']
+        self.client = chromadb.PersistentClient(path=db_config['path'])
+
+        # Get or create collection
+        self.collection = self.client.get_or_create_collection(
+            name=db_config['collection'],
+            embedding_function=embedder,
+            metadata={"hnsw:space": db_config['similarity_metric']}
+        )
+        self.max_batch_size = self.client.get_max_batch_size()
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        """Insert records, replacing any with the same id."""
+        self.collection.upsert(ids=ids, documents=documents, embeddings=embeddings, metadatas=metadatas)
+
+    def delete(self, ids):
+        """Remove records by id in batches the client accepts."""
+        for i in range(0, len(ids), self.max_batch_size):
+            self.collection.delete(ids=ids[i:i + self.max_batch_size])
+
+    def get(self, ids):
+        """Fetch records by id."""
+        return self.collection.get(ids=ids, include=["documents", "metadatas"])
+
+    def query(self, query_embeddings, n_results, where=None):
+        """Approximate nearest-neighbour search through the HNSW index."""
+        return self.collection.query(
+            query_embeddings=query_embeddings,
+            n_results=n_results,
+            where=where,
+            include=["documents", "metadatas", "distances"]
+        )
+
+    def distances(self, query_embedding, ids):
+        """Compute distances from the stored embeddings the way the collection's hnsw:space does."""
+        records = self.collection.get(ids=ids, include=["embeddings"])
+        if not len(records['ids']):
+            return {}
+        query = np.asarray(query_embedding, dtype=np.float32)
+        vectors = np.asarray(records['embeddings'], dtype=np.float32)
+        if self.metric == "l2":
+            distances = np.sum((vectors - query) ** 2, axis=1)
+        elif self.metric == "cosine":
+            norms = np.clip(np.linalg.norm(vectors, axis=1) * np.linalg.norm(query), 1e-12, None)
+            distances = 1.0 - (vectors @ query) / norms
+        else:
+            distances = 1.0 - vectors @ query
+        return dict(zip(records['ids'], distances.tolist()))
+
+    def count(self):
+        """Number of stored records."""
+        return self.collection.count()
+
+    def memory_bytes(self):
+        """
+        Size of the collection's HNSW index, which Chroma loads into memory; documents stay in SQLite.
+
+        Records not yet flushed to the index files are held as raw vectors, so the result is at
+        least count x dimension float32 values.
+        """
+        collection_id = str(self.collection.id)
+        with sqlite3.connect(f"file:{os.path.join(self.path, 'chroma.sqlite3')}?mode=ro", uri=True) as conn:
+            segments = conn.execute("SELECT id FROM segments WHERE collection = ? AND scope = 'VECTOR'",
+                                    (collection_id,)).fetchall()
+            dimension = conn.execute("SELECT dimension FROM collections WHERE id = ?",
+                                     (collection_id,)).fetchone()
+        index_bytes = 0
+        for (segment,) in segments:
+            directory = os.path.join(self.path, segment)
+            if os.path.isdir(directory):
+                index_bytes += sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+        vector_bytes = self.count() * ((dimension and dimension[0]) or 0) * np.dtype(np.float32).itemsize
+        return max(index_bytes, vector_bytes)
+
+    def scan(self, batch_size=1000):
+        """Page through the collection."""
+        batch_size = min(batch_size, self.max_batch_size)
+        for offset in range(0, self.count(), batch_size):
+            yield self.collection.get(limit=batch_size, offset=offset, include=["documents", "metadatas"])
+
+
+class NumpyVectorStore(VectorStore):
+    """Exact in-process search over a normalized float32 matrix."""
+
+    def __init__(self, db_config: Dict[str, Any]):
+        """
+        Load the store from disk if it was persisted before.
+
+        Args:
+            db_config: The database section of config.json
+        """
+        self.metric = db_config['similarity_metric']
+        self.path = os.path.join(db_config['path'], "numpy_store", db_config['collection'])
+        self._lock = threading.RLock()
+
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._columns: Dict[str, np.ndarray] = {}
+        self._dirty = False
+
+        records_path = os.path.join(self.path, "records.json")
+        if os.path.exists(records_path):
+            with open(records_path, 'r') as f:
+                records = json.load(f)
+            self._ids, self._documents, self._metadatas = records["ids"], records["documents"], records["metadatas"]
+            vectors_path = os.path.join(self.path, records.get("vectors_file", "vectors.npy"))
+            self._matrix = np.ascontiguousarray(np.load(vectors_path), dtype=np.float32)
+            self._size = len(self._ids)
+            self._rows = {cid: row for row, cid in enumerate(self._ids)}
+
+    def upsert(self, ids, documents, embeddings, metadatas):
+        """Insert records, overwriting rows of existing ids in place."""
+        vectors = self._prepare(np.asarray(embeddings, dtype=np.float32))
+        with self._lock:
+            if self._size == 0 and self._matrix.shape[1] != vectors.shape[1]:
+                self._matrix = np.zeros((0, vectors.shape[1]), dtype=np.float32)
+
+            for cid, document, vector, metadata in zip(ids, documents, vectors, metadatas):
+                row = self._rows.get(cid)
+                if row is None:
+                    row = self._size
+                    self._reserve(row + 1)
+                    self._rows[cid] = row
+                    self._ids.append(cid)
+                    self._documents.append(document)
+                    self._metadatas.append(dict(metadata))
+                    self._size += 1
+                else:
+                    self._documents[row] = document
+                    self._metadatas[row] = dict(metadata)
+                self._matrix[row] = vector
+            self._columns = {}
+            self._dirty = True
+
+    def delete(self, ids):
+        """Remove records by id and compact the matrix."""
+        with self._lock:
+            drop = {self._rows[cid] for cid in ids if cid in self._rows}
+            if not drop:
+                return
+
+            keep = np.ones(self._size, dtype=bool)
+            keep[list(drop)] = False
+            self._matrix = np.ascontiguousarray(self._matrix[:self._size][keep])
+            self._ids = [cid for row, cid in enumerate(self._ids) if keep[row]]
+            self._documents = [doc for row, doc in enumerate(self._documents) if keep[row]]
+            self._metadatas = [meta for row, meta in enumerate(self._metadatas) if keep[row]]
+            self._size = len(self._ids)
+            self._rows = {cid: row for row, cid in enumerate(self._ids)}
+            self._columns = {}
+            self._dirty = True
+
+    def get(self, ids):
+        """Fetch records by id, skipping unknown ids."""
+        with self._lock:
+            rows = [self._rows[cid] for cid in ids if cid in self._rows]
+            return {
+                "ids": [self._ids[row] for row in rows],
+                "documents": [self._documents[row] for row in rows],
+                "metadatas": [self._metadatas[row] for row in rows]
+            }
+
+    def query(self, query_embeddings, n_results, where=None):
+        """Vectorized top-k over all stored rows, restricted by a metadata mask."""
+        queries = self._prepare(np.asarray(query_embeddings, dtype=np.float32))
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+
+        with self._lock:
+            matrix = self._matrix[:self._size]
+            mask = self._mask(where) if where else None
+            candidates = self._size if mask is None else int(mask.sum())
+            k = min(n_results, candidates)
+
+            scores = queries @ matrix.T if self._size else np.zeros((len(queries), 0), dtype=np.float32)
+            for query, row_scores in zip(queries, scores):
+                if mask is not None:
+                    row_scores = np.where(mask, row_scores, -np.inf)
+                if k == 0:
+                    top = np.array([], dtype=np.int64)
+                else:
+                    top = np.argpartition(-row_scores, k - 1)[:k]
+                    top = top[np.argsort(-row_scores[top])]
+
+                result["ids"].append([self._ids[row] for row in top])
+                result["documents"].append([self._documents[row] for row in top])
+                result["metadatas"].append([self._metadatas[row] for row in top])
+                result["distances"].append(self._distances(query, matrix[top], row_scores[top]).tolist())
+
+        return result
+
+    def distances(self, query_embedding, ids):
+        """Distances to the stored rows of the given ids."""
+        query = self._prepare(np.asarray([query_embedding], dtype=np.float32))[0]
+        with self._lock:
+            found = [cid for cid in ids if cid in self._rows]
+            rows = self._matrix[[self._rows[cid] for cid in found]]
+            return dict(zip(found, self._distances(query, rows, rows @ query).tolist()))
+
+    def count(self):
+        """Number of stored records."""
+        return self._size
+
+    def memory_bytes(self):
+        """Allocated matrix plus the UTF-8 size of ids, documents and JSON metadata."""
+        with self._lock:
+            records = sum(len(cid.encode("utf-8")) + len(document.encode("utf-8")) + len(json.dumps(metadata))
+                          for cid, document, metadata in zip(self._ids, self._documents, self._metadatas))
+            return int(self._matrix.nbytes) + records
+
+    def scan(self, batch_size=1000):
+        """Page through the stored rows."""
+        with self._lock:
+            ids, documents, metadatas = list(self._ids), list(self._documents), list(self._metadatas)
+        for offset in range(0, len(ids), batch_size):
+            yield {
+                "ids": ids[offset:offset + batch_size],
+                "documents": documents[offset:offset + batch_size],
+                "metadatas": metadatas[offset:offset + batch_size]
+            }
+
+    def persist(self):
+        """
+        Write the matrix and records next to the rest of the database, if they changed.
+
+        The matrix goes to a new file, and records.json (replaced atomically) names the matrix
+        file it belongs to. A crash at any point therefore leaves a matching pair on disk.
+        """
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.path, exist_ok=True)
+            vectors_file = f"vectors-{uuid.uuid4().hex[:12]}.npy"
+            np.save(os.path.join(self.path, vectors_file), self._matrix[:self._size])
+            tmp_path = os.path.join(self.path, "records.json.tmp")
+            with open(tmp_path, 'w') as f:
+                json.dump({"vectors_file": vectors_file, "ids": self._ids, "documents": self._documents,
+                           "metadatas": self._metadatas}, f)
+            os.replace(tmp_path, os.path.join(self.path, "records.json"))
+            for name in os.listdir(self.path):
+                if name.startswith("vectors") and name.endswith(".npy") and name != vectors_file:
+                    os.remove(os.path.join(self.path, name))
+            self._dirty = False
+
+    def _prepare(self, vectors: np.ndarray) -> np.ndarray:
+        """Normalize vectors for cosine similarity; other metrics use them as-is."""
+        if self.metric == "cosine":
+            vectors = vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        return vectors
+
+    def _distances(self, query: np.ndarray, rows: np.ndarray, scores: np.ndarray) -> np.ndarray:
+        """Convert similarity scores into Chroma-compatible distances."""
+        if self.metric == "l2":
+            return np.sum((rows - query) ** 2, axis=1)
+        return 1.0 - scores
+
+    def _reserve(self, size: int) -> None:
+        """Grow the matrix geometrically so appends stay amortized O(1)."""
+        capacity = self._matrix.shape[0]
+        if size > capacity:
+            grown = np.zeros((max(size, capacity * 2, 64), self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+
+    def _column(self, key: str) -> np.ndarray:
+        """Metadata values for one key as an array aligned with the matrix rows."""
+        column = self._columns.get(key)
+        if column is None:
+            column = np.empty(self._size, dtype=object)
+            column[:] = [metadata.get(key) for metadata in self._metadatas]
+            self._columns[key] = column
+        return column
+
+    def _mask(self, where: Dict[str, Any]) -> np.ndarray:
+        """
+        Translate a Chroma-style where filter into a boolean row mask.
+
+        Supports field equality, {"$eq": v}, {"$ne": v}, {"$in": [...]}, {"$nin": [...]},
+        and "$and"/"$or" combinations.
+        """
+        mask = np.ones(self._size, dtype=bool)
+        for key, condition in where.items():
+            if key == "$and":
+                for clause in condition:
+                    mask &= self._mask(clause)
+            elif key == "$or":
+                mask &= np.logical_or.reduce([self._mask(clause) for clause in condition])
+            else:
+                column = self._column(key)
+                if not isinstance(condition, dict):
+                    condition = {"$eq": condition}
+                for operator, value in condition.items():
+                    if operator == "$eq":
+                        mask &= column == value
+                    elif operator == "$ne":
+                        mask &= column != value
+                    elif operator in ("$in", "$nin"):
+                        values = set(value)
+                        matches = np.fromiter((item in values for item in column), dtype=bool, count=len(column))
+                        mask &= matches if operator == "$in" else ~matches
+                    else:
+                        raise ValueError(f"Unsupported filter operator '{operator}'")
+        return mask
+
+
+def build_vector_store(db_config: Dict[str, Any], embedder=None) -> VectorStore:
+    """
+    Create the vector store selected in the database configuration.
+
+    Args:
+        db_config: The database section of config.json
+        embedder: Embedding function to attach where the backend supports it (optional)
+
+    Returns:
+        Vector store for database.backend
+    """
+    backend = db_config.get('backend', 'chroma')
+    if backend == "chroma":
+        return ChromaVectorStore(db_config, embedder)
+    elif backend == "numpy":
+        return NumpyVectorStore(db_config)
+    else:
+        raise ValueError(f"Unknown vector store backend '{backend}'. Choose one of: {', '.join(VECTOR_STORE_BACKENDS)}")
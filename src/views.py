@@ -0,0 +1,167 @@
+"""
+Rendering of onboarding sections for the AI Onboarding System.
+
+Each function returns the formatted section as a string, so the same output can
+be printed by the terminal agent or returned by the async agent and server.
+"""
+
+from typing import Any, Dict, List
+
+from src.constants import COLORS, COMMANDS
+from src.scheduler import CohortScheduler, Offering
+from src.utils import format_section, get_current_date, get_resources_for_role
+
+
+def render_checklist(checklist: List[Dict[str, Any]]) -> str:
+    """
+    Render onboarding progress.
+
+    Args:
+        checklist: The hire's tasks from the progress store
+
+    Returns:
+        Formatted checklist section
+    """
+    today = get_current_date()
+
+    # Format checklist items with colors
+    formatted_checklist = []
+    completed_count = 0
+    total_count = len(checklist)
+
+    for i, item in enumerate(checklist, 1):
+        if item['status'] == 'completed':
+            formatted_checklist.append(f"{COLORS['success']}✓ {i}. {item['task']}")
+            completed_count += 1
+        elif item.get('due_date') and item['due_date'] < today:
+            formatted_checklist.append(f"{COLORS['warning']}◻ {i}. {item['task']} (overdue since {item['due_date']})")
+        elif item.get('due_date'):
+            formatted_checklist.append(f"{COLORS['input']}◻ {i}. {item['task']} (due {item['due_date']})")
+        else:
+            formatted_checklist.append(f"{COLORS['input']}◻ {i}. {item['task']}")
+
+    # Add progress information
+    progress = f"{COLORS['header']}Progress: {COLORS['success']}{completed_count}/{total_count} tasks completed"
+    hint = f"{COLORS['text']}Type 'done <number>' when you finish a task."
+
+    return format_section("Onboarding Checklist", formatted_checklist + [progress, hint], COLORS["border"])
+
+
+def render_schedule(settings: Dict[str, Any], user_context: Dict[str, Any], sessions: List[Offering] = None,
+                    waitlisted: List[str] = None) -> str:
+    """
+    Render the training schedule.
+
+    Args:
+        settings: Parsed settings.yaml
+        user_context: The hire's name, role and start date
+        sessions: The hire's sessions from a CohortScheduler; without them the hire is
+            placed in the earliest offering of each activity (optional)
+        waitlisted: Activities the hire could not get a seat for (optional)
+
+    Returns:
+        Formatted schedule section
+    """
+    if sessions is None:
+        # A single hire never runs into capacity limits
+        sessions = CohortScheduler(settings['schedules']['default']).assign(user_context.get('role', '')).sessions
+
+    # Group sessions by day
+    days = {}
+    for session in sessions:
+        days.setdefault(session.day, []).append(session)
+
+    schedule = []
+    day_colors = [COLORS['success'], COLORS['border'], COLORS['warning']]
+    for i, day in enumerate(sorted(days)):
+        if day == 1:
+            schedule.append(f"{COLORS['header']}Day 1 ({user_context['start_date']}):")
+        else:
+            schedule.append(f"{COLORS['header']}Day {day}:")
+        for session in days[day]:
+            schedule.append(f"{day_colors[i % len(day_colors)]}  {session.time} - {session.activity}")
+        schedule.append("")
+
+    if waitlisted:
+        schedule.append(f"{COLORS['warning']}Waitlisted (no free seats yet): {', '.join(waitlisted)}")
+        schedule.append("")
+
+    # Add calendar link
+    schedule.append(
+        f"{COLORS['border']}Full calendar: {COLORS['text']}https://calendar.{settings['company']['domain']}")
+
+    return format_section("Onboarding Schedule", schedule, COLORS["border"])
+
+
+def render_resources(user_context: Dict[str, Any]) -> str:
+    """
+    Render learning resources for the hire's role.
+
+    Args:
+        user_context: The hire's name, role and start date
+
+    Returns:
+        Formatted resources section
+    """
+    role = user_context.get('role', 'general').lower()
+    resources = get_resources_for_role(role)
+
+    # Format resources for display
+    formatted_resources = []
+    for i, resource in enumerate(resources, 1):
+        formatted_resources.append(f"{COLORS['success']}{i}. {resource['name']}: {COLORS['text']}{resource['url']}")
+
+    return format_section("Learning Resources", formatted_resources, COLORS["border"])
+
+
+def render_welcome_email(settings: Dict[str, Any], user_context: Dict[str, Any]) -> str:
+    """
+    Render the welcome email.
+
+    Args:
+        settings: Parsed settings.yaml
+        user_context: The hire's name, role and start date
+
+    Returns:
+        Formatted email section
+    """
+    company_name = settings['company']['name']
+
+    email_content = [
+        f"{COLORS['header']}Subject: Welcome to {company_name}, {user_context['name']}!",
+        "",
+        f"{COLORS['text']}Dear {user_context['name']},",
+        "",
+        f"{COLORS['success']}We're excited to have you join us as a {user_context['role']}!",
+        "",
+        f"{COLORS['border']}Your onboarding schedule:",
+        f"{COLORS['text']}- First day: {user_context['start_date']}",
+        f"{COLORS['text']}- Team meeting: {user_context['start_date']} 10:00 AM",
+        f"{COLORS['text']}- Equipment setup: IT Department (Floor 3)",
+        "",
+        f"{COLORS['header']}Best regards,",
+        f"{COLORS['success']}{company_name} HR Team"
+    ]
+
+    return format_section("Welcome Email", email_content, COLORS["success"])
+
+
+def render_help() -> str:
+    """Render the help menu."""
+    help_content = []
+
+    # Format commands
+    for cmd, description in COMMANDS.items():
+        if cmd in ["exit"]:
+            color = COLORS["warning"]
+        else:
+            color = COLORS["success"] if len(help_content) % 2 == 0 else COLORS["border"]
+
+        help_content.append(f"{color}{cmd.ljust(15)}: {description}")
+
+    return format_section("Available Commands", help_content, COLORS["border"])
+
+
+def render_answer(answer: str) -> str:
+    """Render an answer that was not streamed."""
+    return format_section("Answer", [answer], COLORS["success"])